@@ -2,17 +2,32 @@ from flask import Flask, send_from_directory, render_template, jsonify
 import logging
 import os
 import atexit
-import redis
+from datetime import datetime
 
 # 공용 확장 모듈과 서비스 로직을 가져옵니다.
-from extensions import redis_client, scheduler
-from services import update_news_cache, update_reports_cache
+from extensions import redis_client, redis_pool_stats, scheduler
+from services import CACHE_JOBS, CACHE_JOB_INTERVAL, CACHE_EVENT_JOBS
+import leader
+import cache_events
+import local_cache
+import metrics
 
 # 뷰(블루프린트)들을 가져옵니다.
 from views.main import main_bp
 from views.trends import trends_bp
 from report import reports_bp # reports_bp로 이름이 변경되었습니다.
 from views.home import home_bp
+from views.search import search_bp
+from views.admin import admin_bp
+
+# 캐시 작업을 웹 워커에서 실행할지 여부 (0이면 cache_worker.py가 전담)
+RUN_CACHE_JOBS = os.getenv('RUN_CACHE_JOBS', '1') != '0'
+
+def _runtime_gauges():
+    """/metrics에 워커별로 내보낼 연결 풀과 로컬 캐시 지표."""
+    gauges = [(f'redis_pool_{name}', {}, value) for name, value in redis_pool_stats().items()]
+    gauges += [(f'local_cache_{name}', {}, value) for name, value in local_cache.stats().items()]
+    return gauges
 
 def create_app():
     """
@@ -28,73 +43,67 @@ def create_app():
     app.register_blueprint(trends_bp)
     app.register_blueprint(reports_bp) # url_prefix='/reports'가 이미 설정되어 있습니다.
     app.register_blueprint(home_bp)
-
-    # 임시 진단용 라우트
-    @app.route('/debug/redis-reports')
-    def debug_redis_reports():
-        logger = app.logger
-        logger.info("Starting Redis report key debug check.")
-        
-        try:
-            redis_url = os.getenv('REDIS_URL')
-            if not redis_url:
-                return jsonify({"error": "REDIS_URL not set."}), 500
-            
-            # bytes를 직접 다루기 위해 decode_responses=False로 설정
-            client = redis.StrictRedis.from_url(redis_url, decode_responses=False)
-            client.ping()
-            logger.info("Successfully connected to Redis for debug check.")
-        except Exception as e:
-            logger.error(f"DEBUG: Could not connect to Redis: {e}")
-            return jsonify({"error": f"Could not connect to Redis: {e}"}), 500
-        
-        found_keys = {}
-        try:
-            for prefix in ["dailyreport-", "weeklyreport-", "monthlyreport-"]:
-                # 키(bytes)를 utf-8로 디코딩하여 JSON으로 반환
-                keys = [k.decode('utf-8') for k in client.keys(f"{prefix}*")]
-                found_keys[prefix] = {
-                    "count": len(keys),
-                    "keys": keys[:20] # 샘플로 20개만 표시
-                }
-            logger.info(f"DEBUG: Found keys: {found_keys}")
-            return jsonify(found_keys)
-        except Exception as e:
-            logger.error(f"DEBUG: Error while scanning keys: {e}")
-            return jsonify({"error": f"Error while scanning keys: {e}"}), 500
-
-    # 애플리케이션 컨텍스트 내에서 초기 캐시 업데이트를 직접 실행
-    with app.app_context():
-        try:
-            update_news_cache()
-            update_reports_cache()
-            app.logger.info("Initial cache updates completed successfully on startup.")
-        except Exception as e:
-            app.logger.error(f"Error during initial cache update on startup: {e}")
-
-    # 백그라운드 캐시 업데이트 작업 스케줄링
-    if redis_client:
-        if not scheduler.get_job('update_news_cache'):
-            scheduler.add_job(
-                func=update_news_cache, 
-                trigger='interval', 
-                minutes=30, 
-                id='update_news_cache',
-                name='Periodic News Cache Update',
-                replace_existing=True
-            )
-            app.logger.info("Scheduled news cache update job (every 30 minutes).")
-
-        if not scheduler.get_job('update_reports_cache'):
+    app.register_blueprint(search_bp)
+    app.register_blueprint(admin_bp) # ADMIN_TOKEN이 설정된 경우에만 동작합니다.
+
+    # METRICS_ENABLED=1이면 /metrics와 Server-Timing 헤더를 제공합니다.
+    metrics.init_app(app)
+    metrics.register_collector(_runtime_gauges)
+
+    # 백그라운드 캐시 업데이트 작업 스케줄링 (모든 워커가 등록하지만 리더만 실제로 실행)
+    # 초기 캐시 업데이트도 요청 처리를 막지 않도록 스케줄러 스레드에서 즉시 한 번 실행하며,
+    # 신선한 캐시가 이미 있으면 건너뜁니다.
+    # RUN_CACHE_JOBS=0이면 등록하지 않습니다. (cache_worker.py를 별도 프로세스로 실행하는 경우)
+    if redis_client and RUN_CACHE_JOBS:
+        if not scheduler.get_job('leader_heartbeat'):
             scheduler.add_job(
-                func=update_reports_cache,
+                func=leader.heartbeat,
                 trigger='interval',
-                minutes=30,
-                id='update_reports_cache',
-                name='Periodic Reports Cache Update',
+                seconds=leader.LEADER_RENEW_SECONDS,
+                id='leader_heartbeat',
+                name='Scheduler Leader Heartbeat',
+                next_run_time=datetime.now(),
                 replace_existing=True
             )
-            app.logger.info("Scheduled reports cache update job (every 30 minutes).")
+
+        for job_id, func, cache_key, name in CACHE_JOBS:
+            if not scheduler.get_job(job_id):
+                scheduler.add_job(
+                    func=leader.leader_job(job_id, func, CACHE_JOB_INTERVAL, cache_key),
+                    trigger='interval',
+                    minutes=30,
+                    id=job_id,
+                    name=name,
+                    next_run_time=datetime.now(),
+                    replace_existing=True
+                )
+                app.logger.info(f"Scheduled {job_id} job (every 30 minutes, leader only).")
+
+        # 원본 키 변경 이벤트로 캐시를 바로 갱신합니다. 위의 주기 작업은 이벤트를 놓쳤을 때의 안전망입니다.
+        cache_events.start(CACHE_EVENT_JOBS, CACHE_JOB_INTERVAL)
+
+    @app.route('/health')
+    def health():
+        """
+        준비 상태를 보고합니다. Redis에 연결되어 있고 주요 캐시가 채워져 있으면 200, 아니면 503을 반환합니다.
+        """
+        status = {'redis': False, 'caches': {}, 'leader': leader.is_leader(), 'instance': leader.INSTANCE_ID,
+                  'redis_pool': redis_pool_stats()}
+        if redis_client:
+            try:
+                pipe = redis_client.pipeline()
+                pipe.ping()
+                for _, _, cache_key, _ in CACHE_JOBS:
+                    pipe.exists(cache_key)
+                results = pipe.execute()
+                status['redis'] = bool(results[0])
+                status['caches'] = {cache_key: bool(exists) for (_, _, cache_key, _), exists in zip(CACHE_JOBS, results[1:])}
+            except Exception as e:
+                status['error'] = str(e)
+
+        ready = status['redis'] and bool(status['caches']) and all(status['caches'].values())
+        status['status'] = 'ready' if ready else 'starting'
+        return jsonify(status), 200 if ready else 503
 
     # 정적 파일 라우트
     @app.route('/ads.txt')
@@ -130,14 +139,17 @@ def create_app():
 
     if not scheduler.running:
         scheduler.start()
-        # 애플리케이션 종료 시 스케줄러가 안전하게 종료되도록 등록
+        # 애플리케이션 종료 시 스케줄러가 안전하게 종료되고 리더 임대가 반납되도록 등록
         atexit.register(lambda: scheduler.shutdown())
+        atexit.register(leader.release)
         app.logger.info("APScheduler started.")
 
     return app
 
 # Gunicorn이 찾을 수 있도록 전역 스코프에서 app 객체 생성
-app = create_app()
+# (키워드 집계용 프로세스 풀(spawn)의 자식이 이 파일을 __mp_main__으로 다시 실행할 때는 만들지 않음)
+if __name__ != '__mp_main__':
+    app = create_app()
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5001)
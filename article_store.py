@@ -0,0 +1,74 @@
+# article_store.py
+"""
+캐시용 기사 레코드 저장소 (기사 하나당 한 벌).
+  cache:articles (hash)   원본 키 -> 직렬화된 Article 행 (articles.ROW_FIELDS 순서의 값 목록)
+뉴스 캐시 작업이 원본 값을 디코딩/분류한 결과를 여기에 한 번만 저장하고,
+홈페이지 캐시, 홈 화면 묶음, 트렌드 facet은 원본 키 목록만 보관합니다.
+화면과 API는 필요한 키만 get_many()/hydrate()로 한 번의 HMGET으로 읽습니다.
+"""
+import logging
+from itertools import islice
+
+from extensions import redis_bytes_client
+from articles import Article
+import serialization
+
+logger = logging.getLogger(__name__)
+
+ARTICLES_KEY = 'cache:articles'
+REBUILD_KEY = 'cache:articles:rebuild'
+_BATCH_SIZE = 1000
+
+
+def _encode(article):
+    # 값이 작으므로 압축하지 않습니다. (압축 헤더/사전 비용이 더 큼)
+    return serialization.dumps(article.to_row(), compression='none')
+
+
+def _write(key, articles):
+    count = 0
+    articles = iter(articles)
+    while batch := list(islice(articles, _BATCH_SIZE)):
+        redis_bytes_client.hset(key, mapping={article.key: _encode(article) for article in batch})
+        count += len(batch)
+    return count
+
+
+def replace_all(articles):
+    """저장소 전체를 주어진 기사들로 바꿉니다. 임시 키에 쓴 뒤 RENAME하므로 읽는 쪽은 이전 또는 새 저장소만 봅니다."""
+    redis_bytes_client.delete(REBUILD_KEY)
+    count = _write(REBUILD_KEY, articles)
+    if count:
+        redis_bytes_client.rename(REBUILD_KEY, ARTICLES_KEY)
+    else:
+        redis_bytes_client.delete(ARTICLES_KEY)
+    logger.info(f"ARTICLE_STORE: Stored {count} articles.")
+    return count
+
+
+def put(articles):
+    """추가되거나 바뀐 기사만 저장합니다."""
+    return _write(ARTICLES_KEY, articles)
+
+
+def get_many(keys):
+    """원본 키 목록의 기사들을 같은 순서로 반환합니다. 저장소에 없는 키는 건너뜁니다. 반환값: (Article 목록, 읽은 바이트 수)"""
+    keys = list(keys)
+    articles, size = [], 0
+    for start in range(0, len(keys), _BATCH_SIZE):
+        batch = keys[start:start + _BATCH_SIZE]
+        for raw in redis_bytes_client.hmget(ARTICLES_KEY, batch):
+            if not raw: continue
+            articles.append(Article.from_row(serialization.loads(raw)))
+            size += len(raw)
+    return articles, size
+
+
+def hydrate(keys):
+    """원본 키 목록을 Article 목록으로 바꿉니다. (없는 키는 건너뜀)"""
+    if not keys: return []
+    return get_many(keys)[0]
+
+
+def is_built():
+    return bool(redis_bytes_client.exists(ARTICLES_KEY))
@@ -0,0 +1,83 @@
+# articles.py
+"""
+캐시 작업과 워커 로컬 캐시에서 사용하는 기사 레코드.
+기사를 dict로 다루면 항목마다 필드 이름 문자열, tz-aware datetime, 중복된 소스/카테고리/국가 문자열을 따로 들고 있게 됩니다.
+Article은 __slots__ 객체로 필드를 고정하고, 반복되는 소스/카테고리/국가 문자열은 intern하여 공유하며,
+날짜는 키(news-YYYYMMDD-NNN)에서 구한 정수 일 수(date.toordinal())로 보관합니다.
+
+- 템플릿은 속성 이름(news.title 등)으로 그대로 읽을 수 있습니다.
+- JSON 응답과 캐시 레코드는 to_dict()로 만들며, 원본 키는 이전과 같이 'redis_key'로 내보냅니다.
+- cache:homepage에는 to_row()의 튜플(필드 이름 없이 값만) 목록으로 저장합니다.
+"""
+import sys
+from datetime import date
+from functools import lru_cache
+
+# to_row()/from_row()의 값 순서. day는 key에서 다시 계산하므로 저장하지 않습니다.
+ROW_FIELDS = ('key', 'title', 'summary', 'link', 'source', 'published', 'image_url', 'category', 'country')
+# 원본 값(JSON {'value': {...}})에서 읽는 필드
+VALUE_FIELDS = ROW_FIELDS[1:]
+# 키에서 날짜를 알 수 없을 때의 일 수 (date.min)
+UNKNOWN_DAY = 1
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=4096)
+def _ordinal_for_date(yyyymmdd):
+    try:
+        return date(int(yyyymmdd[0:4]), int(yyyymmdd[4:6]), int(yyyymmdd[6:8])).toordinal()
+    except ValueError:
+        return UNKNOWN_DAY
+
+
+def day_ordinal(key):
+    """news-YYYYMMDD-NNN 키의 날짜를 date.toordinal() 값으로 반환합니다. 형식이 다르면 UNKNOWN_DAY."""
+    if not isinstance(key, str):
+        return UNKNOWN_DAY
+    return _ordinal_for_date(key[5:13])
+
+
+def day_string(day):
+    """일 수를 YYYYMMDD 문자열로 변환합니다."""
+    return date.fromordinal(day).strftime("%Y%m%d")
+
+
+class Article:
+    __slots__ = ROW_FIELDS + ('day',)
+
+    def __init__(self, key, title=None, summary=None, link=None, source=None, published=None, image_url=None,
+                 category=None, country=None):
+        self.key = key
+        self.title = title
+        self.summary = summary
+        self.link = link
+        self.source = _intern(source)
+        self.published = published
+        self.image_url = image_url
+        self.category = _intern(category)
+        self.country = _intern(country)
+        self.day = day_ordinal(key)
+
+    @classmethod
+    def from_value(cls, key, value):
+        """원본 기사 값(dict)에서 레코드를 만듭니다. 알 수 없는 필드는 버립니다."""
+        return cls(key, *(value.get(field) for field in VALUE_FIELDS))
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def to_row(self):
+        return (self.key, self.title, self.summary, self.link, self.source, self.published, self.image_url,
+                self.category, self.country)
+
+    def to_dict(self, fields=None):
+        """응답용 dict. fields를 주면 해당 필드만 포함하며, 'redis_key'는 원본 키입니다."""
+        fields = fields or ('redis_key',) + VALUE_FIELDS
+        return {field: self.key if field == 'redis_key' else getattr(self, field) for field in fields}
+
+    def __repr__(self):
+        return f"Article({self.key!r}, title={self.title!r})"
@@ -0,0 +1,128 @@
+# benchmarks/article_memory.py
+"""
+기사 표현 방식별 메모리 벤치마크.
+같은 합성 기사(benchmarks/corpus.py)를 이전 방식(dict + redis_key + tz-aware datetime)과 Article 레코드로 만들어
+기사당 파이썬 힙 사용량(tracemalloc)을 비교합니다. 원본 JSON 문자열은 측정 전에 만들어 두므로 포함되지 않습니다.
+  - decoded: 원본 값을 디코딩한 직후 (캐시 작업이 들고 있는 목록)
+  - cached:  cache:homepage blob을 읽어 만든 목록 (워커 로컬 캐시가 들고 있는 목록)
+cache:homepage blob의 크기와 디코딩 시간도 함께 기록합니다.
+
+사용 예:
+    python benchmarks/article_memory.py --articles 100000 --output article_memory.json
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serialization  # noqa: E402
+from articles import Article  # noqa: E402
+import corpus  # noqa: E402
+
+# 분류기 대신 사용할 카테고리 (두 방식 모두 같은 값을 씀)
+FALLBACK_CATEGORY = 'Others'
+
+
+def legacy_record(key, raw):
+    """이전 services._decode_news_item과 같은 모양의 dict."""
+    value = json.loads(raw).get('value', {})
+    value['redis_key'] = key
+    value['country'] = value.get('country')
+    value['category'] = value.get('category') or FALLBACK_CATEGORY
+    value['_parsed_published_date'] = datetime.strptime(key[5:13], "%Y%m%d").replace(tzinfo=timezone.utc)
+    return value
+
+
+def article_record(key, raw):
+    article = Article.from_value(key, json.loads(raw).get('value', {}))
+    article.category = article.category or FALLBACK_CATEGORY
+    return article
+
+
+def legacy_blob(records):
+    categorized = {}
+    for record in records:
+        categorized.setdefault(record['category'], []).append(record)
+    return serialization.dumps(categorized)
+
+
+def article_blob(records):
+    return serialization.dumps([record.to_row() for record in records])
+
+
+def legacy_load(blob):
+    return [record for records in serialization.loads(blob).values() for record in records]
+
+
+def article_load(blob):
+    return [Article.from_row(row) for row in serialization.loads(blob)]
+
+
+def traced(func):
+    """func()의 반환값이 차지하는 힙 크기(바이트)와 반환값."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def measure(name, build, dump, load, raw_items):
+    n = len(raw_items)
+    records, decoded_bytes = traced(lambda: [build(key, raw) for key, raw in raw_items])
+    blob = dump(records)
+    del records
+    start = time.perf_counter()
+    load(blob)
+    load_ms = (time.perf_counter() - start) * 1000
+    loaded, cached_bytes = traced(lambda: load(blob))
+    del loaded
+    return {
+        'name': name,
+        'decoded_bytes_per_article': round(decoded_bytes / n, 1),
+        'cached_bytes_per_article': round(cached_bytes / n, 1),
+        'blob_bytes': len(blob),
+        'blob_load_ms': round(load_ms, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory per article for dict records and Article records.")
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    raw_items = list(corpus.generate_news(args.articles, seed=args.seed))
+    rows = [
+        measure('dict', legacy_record, legacy_blob, legacy_load, raw_items),
+        measure('article', article_record, article_blob, article_load, raw_items),
+    ]
+    baseline = rows[0]
+    for row in rows:
+        row['decoded_ratio'] = round(row['decoded_bytes_per_article'] / baseline['decoded_bytes_per_article'], 3)
+        row['cached_ratio'] = round(row['cached_bytes_per_article'] / baseline['cached_bytes_per_article'], 3)
+
+    results = {
+        'articles': args.articles,
+        'serializer': f'{serialization.CACHE_SERIALIZER}+{serialization.CACHE_COMPRESSION}',
+        'results': rows,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
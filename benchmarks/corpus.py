@@ -0,0 +1,100 @@
+# benchmarks/corpus.py
+"""
+벤치마크용 합성 데이터 생성기.
+수집기가 쓰는 것과 같은 형식의 news-YYYYMMDD-NNN 기사(JSON {'value': {...}})와
+{daily|weekly|monthly}report-YYYYMMDD 리포트(텍스트/JSON/pickle 혼합)를 원하는 규모로 만들어 Redis에 씁니다.
+같은 seed로 만들면 항상 같은 데이터가 생성됩니다.
+"""
+import json
+import math
+import pickle
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+SOURCES = ['BBC', 'CNN', 'The Guardian', 'Reuters', 'Al Jazeera', 'NPR', 'Mongabay', 'Grist', 'Inside Climate News', 'Carbon Brief']
+COUNTRIES = ['USA', 'China', 'India', 'Germany', 'Brazil', 'UK', 'Japan', 'France', 'Canada', 'Australia', 'Kenya', 'Indonesia']
+# 카테고리 키워드와 겹치는 단어와 일반 단어를 섞어 분류기가 실제와 비슷하게 동작하도록 합니다.
+TOPIC_WORDS = ("solar wind renewable emissions carbon climate warming biodiversity species wildlife forest ocean plastic "
+               "pollution recycling sustainable policy regulation treaty electric vehicle battery hydrogen drought flood "
+               "heatwave wildfire glacier coral deforestation agriculture water air quality technology innovation").split()
+COMMON_WORDS = ("the a of in to and for on with new says report study shows could will after amid over as "
+                "record first year global local city plan project scientists officials warn experts data").split()
+# 분류기가 다시 판별하도록 카테고리를 비워 두는 기사 비율
+UNCATEGORIZED_RATIO = 0.3
+CATEGORY_NAMES = ['Climate Change', 'Biodiversity', 'Renewable Energy', 'Pollution', 'Environmental Policy', 'Sustainability']
+NEWS_BATCH = 2000
+
+
+def days_for(articles, per_day=500, min_days=30):
+    """기사 수에 맞는 날짜 범위(일). 하루 키 공간(NNN, 1000개)을 넘지 않도록 나눕니다."""
+    return max(min_days, math.ceil(articles / per_day))
+
+
+def _sentence(rng, k):
+    words = rng.choices(TOPIC_WORDS, k=k // 2) + rng.choices(COMMON_WORDS, k=k - k // 2)
+    rng.shuffle(words)
+    return ' '.join(words).capitalize()
+
+
+def make_article(rng, day, seq):
+    published = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(seconds=rng.randrange(86400))
+    value = {
+        'title': _sentence(rng, rng.randint(6, 12)),
+        'summary': _sentence(rng, rng.randint(20, 45)) + '.',
+        'link': f"https://example.com/{day:%Y/%m/%d}/{seq}",
+        'source': rng.choice(SOURCES),
+        'published': format_datetime(published),
+        'image_url': f"https://example.com/img/{day:%Y%m%d}{seq:03d}.jpg",
+    }
+    if rng.random() >= UNCATEGORIZED_RATIO:
+        value['category'] = rng.choice(CATEGORY_NAMES)
+        value['country'] = rng.choice(COUNTRIES)
+    return value
+
+
+def generate_news(articles, days=None, end=None, seed=42):
+    """(키, 값 문자열)을 생성합니다. 기사는 end(기본 오늘, UTC)부터 과거 days일에 고르게 나뉩니다."""
+    rng = random.Random(seed)
+    days = days or days_for(articles)
+    end = end or datetime.now(timezone.utc).date()
+    per_day, extra = divmod(articles, days)
+    for offset in range(days):
+        day = end - timedelta(days=offset)
+        for seq in range(per_day + (1 if offset < extra else 0)):
+            yield f"news-{day:%Y%m%d}-{seq:03d}", json.dumps({'value': make_article(rng, day, seq)})
+
+
+def make_report(rng, report_type, day):
+    lines = [f"{report_type.capitalize()} Environmental Report {day:%Y-%m-%d}", '']
+    for i in range(rng.randint(8, 20)):
+        lines.append(f"{i + 1}. {_sentence(rng, rng.randint(15, 30))}. Source: https://example.com/r/{day:%Y%m%d}/{i}")
+    return '\n'.join(lines)
+
+
+def generate_reports(days, end=None, seed=42):
+    """
+    (키, 원본 bytes)를 생성합니다. 일간은 매일, 주간은 7일, 월간은 30일마다 만들며
+    저장 형식(텍스트/JSON/pickle)을 섞어 리포트 로더의 모든 경로를 거치게 합니다.
+    """
+    rng = random.Random(seed + 1)
+    end = end or datetime.now(timezone.utc).date()
+    encoders = [lambda text: text.encode('utf-8'), lambda text: json.dumps(text).encode('utf-8'), pickle.dumps]
+    for offset in range(days):
+        day = end - timedelta(days=offset)
+        for report_type, every in (('daily', 1), ('weekly', 7), ('monthly', 30)):
+            if offset % every == 0:
+                yield f"{report_type}report-{day:%Y%m%d}", rng.choice(encoders)(make_report(rng, report_type, day))
+
+
+def load(client, items, batch=NEWS_BATCH):
+    """(키, 값)을 파이프라인으로 나누어 씁니다. 반환값: 쓴 키 수"""
+    count = 0
+    pipe = client.pipeline(transaction=False)
+    for key, value in items:
+        pipe.set(key, value)
+        count += 1
+        if count % batch == 0:
+            pipe.execute()
+    pipe.execute()
+    return count
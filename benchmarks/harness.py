@@ -0,0 +1,73 @@
+# benchmarks/harness.py
+"""
+오프라인 벤치마크 공용 도구.
+- install_fake_redis(): 애플리케이션 모듈을 import하기 전에 호출하여 extensions의 클라이언트를 fakeredis로 바꿉니다.
+  (모듈들이 `from extensions import redis_client`로 import 시점에 클라이언트를 가져가므로 순서가 중요합니다)
+- measure(): 함수 하나의 실행 시간, 파이썬 힙 최대 사용량(tracemalloc), Redis 왕복/명령 수를 측정합니다.
+  왕복 수는 소켓으로 보낸 횟수이므로 파이프라인은 명령 수와 관계없이 한 번으로 셉니다.
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+counters = {'round_trips': 0, 'commands': 0}
+
+
+def _counting_connection_class():
+    import fakeredis
+    base = getattr(fakeredis, 'FakeRedisConnection', None) or fakeredis.FakeConnection
+
+    class CountingFakeConnection(base):
+        def send_packed_command(self, command, check_health=True):
+            counters['round_trips'] += 1
+            return super().send_packed_command(command, check_health)
+
+        def pack_command(self, *args):
+            counters['commands'] += 1
+            return super().pack_command(*args)
+
+    return CountingFakeConnection
+
+
+def install_fake_redis():
+    """fakeredis 서버를 만들어 공용 클라이언트를 교체합니다. 반환값: (서버, 문자열 클라이언트)"""
+    import fakeredis
+    import redis_pool
+    import extensions
+
+    server = fakeredis.FakeServer()
+    pool = redis_pool.create_pool('redis://fakeredis:6379/0', connection_class=_counting_connection_class(), server=server)
+    extensions.redis_pool_instance = pool
+    extensions.redis_client, extensions.redis_bytes_client = redis_pool.create_clients(pool)
+    return server, extensions.redis_client
+
+
+def measure(func, memory=True):
+    """
+    func()를 실행하고 (반환값, 지표 dict)를 반환합니다.
+    지표: wall_s, peak_mb(memory=True일 때, 이 프로세스의 파이썬 할당만 포함), round_trips, commands
+    tracemalloc은 실행 시간을 늘리므로 실행 시간만 비교하려면 memory=False로 측정합니다.
+    """
+    gc.collect()
+    before = dict(counters)
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+        wall = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+    finally:
+        if memory:
+            tracemalloc.stop()
+    metrics = {'wall_s': round(wall, 6)}
+    if memory:
+        metrics['peak_mb'] = round(peak / 1024 / 1024, 3)
+    metrics.update({name: counters[name] - before[name] for name in counters})
+    return result, metrics
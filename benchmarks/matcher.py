@@ -0,0 +1,105 @@
+# benchmarks/matcher.py
+"""
+categorize_news / infer_country 마이크로 벤치마크.
+미리 만든 매처(카테고리: Aho-Corasick 오토마톤, 국가: 단어 경계가 포함된 단일 정규식)와
+이전 구현(키워드별 `in` 검사, 국가별 re.search)을 같은 코퍼스에서 비교하고, 모든 기사에 대해 결과가 동일한지 확인합니다.
+pyahocorasick이 설치되어 있지 않으면 카테고리는 이전과 같은 부분 문자열 검사로 측정됩니다.
+
+사용 예:
+    python benchmarks/matcher.py --articles 20000 --repeat 3
+"""
+import os
+import re
+import sys
+import json
+import random
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services  # noqa: E402
+from articles import Article  # noqa: E402
+from services import CATEGORIES, COUNTRY_LIST, categorize_news, infer_country, classify_news  # noqa: E402
+
+
+def legacy_infer_country(news_item):
+    text = ((news_item.title or '') + ' ' + (news_item.summary or '')).lower()
+    for country in COUNTRY_LIST:
+        if re.search(r'\b' + re.escape(country) + r'\b', text):
+            if country in ['us', 'u.s.', 'states', 'america']: return 'United States'
+            if country in ['uk', 'u.k.', 'britain', 'united kingdom']: return 'United Kingdom'
+            if country in ['south korea']: return 'Korea'
+            return country.capitalize()
+    return None
+
+
+def legacy_categorize_news(news_item):
+    title_lower = (news_item.title or '').lower()
+    summary_lower = (news_item.summary or '').lower()
+    combined_text = title_lower + " " + summary_lower
+    for category_id, category_info in CATEGORIES.items():
+        if category_id == 'others': continue
+        for keyword in category_info['keywords']:
+            if keyword in combined_text: return category_info['name']
+    return CATEGORIES['others']['name']
+
+
+FILLER = ("the report said officials were reviewing new data on the region while local groups "
+          "called for further study of long term effects on communities and markets").split()
+
+
+def make_corpus(n, seed=42):
+    """키워드, 국가명, 일반 단어를 섞은 기사(Article) n개를 만듭니다. 일부는 키워드가 전혀 없습니다."""
+    rng = random.Random(seed)
+    keywords = [k for info in CATEGORIES.values() for k in info['keywords']]
+    corpus = []
+    for i in range(n):
+        words = rng.choices(FILLER, k=rng.randint(30, 80))
+        if rng.random() < 0.8:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words)), rng.choice(COUNTRY_LIST))
+        title_len = rng.randint(6, 12)
+        corpus.append(Article(f"news-20250101-{i % 1000:03d}", title=' '.join(words[:title_len]).title(),
+                              summary=' '.join(words[title_len:])))
+    return corpus
+
+
+def bench(func, corpus, repeat):
+    return min(timeit.repeat(lambda: [func(item) for item in corpus], number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare compiled keyword matchers against the legacy loops.")
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.articles)
+    for item in corpus:
+        assert categorize_news(item) == legacy_categorize_news(item), item
+        assert infer_country(item) == legacy_infer_country(item), item
+
+    results = {
+        'articles': args.articles,
+        'category_matcher': 'aho-corasick' if services._CATEGORY_AUTOMATON is not None else 'substring',
+        'categorize_legacy_s': bench(legacy_categorize_news, corpus, args.repeat),
+        'categorize_compiled_s': bench(categorize_news, corpus, args.repeat),
+        'country_legacy_s': bench(legacy_infer_country, corpus, args.repeat),
+        'country_compiled_s': bench(infer_country, corpus, args.repeat),
+        'classify_legacy_s': bench(lambda item: (legacy_categorize_news(item), legacy_infer_country(item)), corpus, args.repeat),
+        'classify_compiled_s': bench(classify_news, corpus, args.repeat),
+    }
+    for name in ('categorize', 'country', 'classify'):
+        results[f'{name}_speedup'] = results[f'{name}_legacy_s'] / results[f'{name}_compiled_s']
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
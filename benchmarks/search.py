@@ -0,0 +1,116 @@
+# benchmarks/search.py
+"""
+전문 검색 색인/질의 벤치마크.
+Zipf 분포 어휘로 만든 합성 기사 코퍼스(기본 100,000개)를 search_index로 색인하고,
+1~3단어 질의의 지연 시간(p50/p95/p99)과 색인 시간, 색인 크기(키 수)를 측정합니다.
+
+벤치마크는 지정한 Redis DB의 search:* 키를 지우므로 운영 DB가 아닌 별도 DB를 사용하세요.
+--fake를 주면 fakeredis(설치된 경우)를 사용합니다. (네트워크 왕복이 없으므로 지연 시간은 참고용)
+
+사용 예:
+    python benchmarks/search.py --redis-url redis://localhost:6379/15 --articles 100000 --queries 500
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import redis_pool  # noqa: E402
+import search_index  # noqa: E402
+from keywords import tokenize_many  # noqa: E402
+
+TOPIC_WORDS = ("solar wind carbon emissions forest ocean plastic pollution wildlife species drought flood heatwave "
+               "battery electric vehicle hydrogen methane coal nuclear recycling biodiversity coral glacier arctic "
+               "rainforest deforestation wildfire agriculture water river policy treaty subsidy tax investment grid").split()
+
+
+def make_vocabulary(size, seed):
+    """주제 단어와 무작위 합성 단어로 어휘를 만듭니다. 앞쪽 단어일수록 자주 등장합니다(Zipf)."""
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    synthetic = {''.join(rng.choices(letters, k=rng.randint(4, 10))) for _ in range(size)}
+    vocab = TOPIC_WORDS + sorted(synthetic)
+    weights = [1 / (rank + 1) ** 1.05 for rank in range(len(vocab))]
+    return vocab, weights
+
+
+def make_corpus(n, vocab, weights, seed):
+    rng = random.Random(seed)
+    for i in range(n):
+        words = rng.choices(vocab, weights=weights, k=rng.randint(25, 70))
+        yield f"news-{20200101 + i // 1000:08d}-{i % 1000:03d}", ' '.join(words)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the full-text search index.")
+    parser.add_argument('--redis-url', default=os.getenv('BENCH_REDIS_URL', 'redis://localhost:6379/15'))
+    parser.add_argument('--fake', action='store_true', help="fakeredis를 사용합니다.")
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    if args.fake:
+        import fakeredis
+        client = fakeredis.FakeRedis(decode_responses=True)
+    else:
+        client = redis_pool.create_clients(redis_pool.create_pool(args.redis_url))[0]
+    search_index.redis_client = client
+    search_index.clear()
+
+    vocab, weights = make_vocabulary(args.vocabulary, args.seed)
+    docs = list(make_corpus(args.articles, vocab, weights, args.seed))
+
+    start = time.perf_counter()
+    tokens_list = tokenize_many(text for _, text in docs)
+    tokenize_s = time.perf_counter() - start
+    start = time.perf_counter()
+    search_index.index_documents(docs, tokens_list=tokens_list)
+    index_s = time.perf_counter() - start
+
+    rng = random.Random(args.seed + 1)
+    queries = [' '.join(rng.choices(vocab[:2000], k=rng.randint(1, 3))) for _ in range(args.queries)]
+    latencies, totals = [], []
+    for query in queries:
+        t0 = time.perf_counter()
+        _, total = search_index.search(query, page=rng.randint(1, 3), per_page=10)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        totals.append(total)
+
+    results = {
+        'articles': args.articles,
+        'backend': 'fakeredis' if args.fake else args.redis_url,
+        'tokenize_s': tokenize_s,
+        'index_s': index_s,
+        'index_docs_per_s': args.articles / index_s,
+        'term_keys': sum(1 for _ in client.scan_iter(match='search:term:*', count=1000)),
+        'queries': args.queries,
+        'query_ms': {
+            'mean': statistics.mean(latencies),
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': max(latencies),
+        },
+        'median_hits': statistics.median(totals),
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/serialization.py
+"""
+캐시 blob 직렬화 벤치마크.
+이전 방식(json.dumps(..., default=str))과 serialization 모듈의 형식 × 압축 조합을
+같은 합성 기사 묶음(cache:homepage의 categorized_news 구조)에서 인코딩/디코딩 시간과 크기로 비교합니다.
+설치되지 않은 선택 의존성(msgpack, zstandard)을 쓰는 조합은 건너뜁니다.
+
+사용 예:
+    python benchmarks/serialization.py --articles 20000 --repeat 5 --output serialization.json
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import timeit
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serialization  # noqa: E402
+
+SOURCES = ['BBC', 'CNN', 'Guardian', 'Reuters', 'Mongabay', 'Carbon Brief', 'Grist', 'Inside Climate News']
+CATEGORY_NAMES = ['기후변화', '에너지', '생물다양성', '오염', '정책', '기타']
+WORDS = ("climate energy solar wind emissions carbon forest ocean policy report region officials data "
+         "local groups study effects communities markets biodiversity species pollution water air").split()
+
+
+def make_categorized_news(n, seed=42):
+    """카테고리별 기사 목록(dict) n개를 만듭니다. 실제 캐시와 같이 tz-aware datetime 필드를 포함합니다."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    categorized = {name: [] for name in CATEGORY_NAMES}
+    for i in range(n):
+        published = now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+        day = published.strftime('%Y%m%d')
+        item = {
+            'title': ' '.join(rng.choices(WORDS, k=rng.randint(6, 12))).title(),
+            'summary': ' '.join(rng.choices(WORDS, k=rng.randint(30, 60))),
+            'link': f"https://example.com/{day}/{i}",
+            'source': rng.choice(SOURCES),
+            'published': published.strftime('%a, %d %b %Y %H:%M:%S +0000'),
+            'category': rng.choice(CATEGORY_NAMES),
+            'country': rng.choice([None, 'United States', 'United Kingdom', 'Korea', 'Brazil']),
+            'redis_key': f"news-{day}-{i % 1000:03d}",
+            '_parsed_published_date': published,
+        }
+        categorized[item['category']].append(item)
+    return categorized
+
+
+def legacy_dumps(obj):
+    return json.dumps(obj, default=str).encode('utf-8')
+
+
+def bench(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def measure(name, dumps, loads, data, repeat):
+    blob = dumps(data)
+    return {
+        'name': name,
+        'bytes': len(blob),
+        'encode_ms': bench(lambda: dumps(data), repeat) * 1000,
+        'decode_ms': bench(lambda: loads(blob), repeat) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cache blob serializers by time and size.")
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    data = make_categorized_news(args.articles)
+    rows = [measure('legacy-json', legacy_dumps, json.loads, data, args.repeat)]
+    for fmt in serialization.FORMATS:
+        for compression in serialization.COMPRESSIONS:
+            if serialization._resolve(fmt, compression) != (fmt, compression):
+                continue
+            rows.append(measure(
+                f'{fmt}+{compression}',
+                lambda obj, f=fmt, c=compression: serialization.dumps(obj, serializer=f, compression=c),
+                serialization.loads, data, args.repeat,
+            ))
+
+    baseline = rows[0]
+    for row in rows:
+        row['size_ratio'] = row['bytes'] / baseline['bytes']
+        row['decode_speedup'] = baseline['decode_ms'] / row['decode_ms']
+
+    results = {
+        'articles': args.articles,
+        'default': f'{serialization.CACHE_SERIALIZER}+{serialization.CACHE_COMPRESSION}',
+        'results': rows,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
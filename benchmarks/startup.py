@@ -0,0 +1,99 @@
+# benchmarks/startup.py
+"""
+애플리케이션 시작 시간 벤치마크.
+반복마다 새 파이썬 프로세스에서 `import app` 시간, 엔드포인트별 첫 요청/두 번째 요청 지연 시간,
+그리고 /health가 준비(200) 상태가 되기까지의 시간을 측정합니다.
+
+사용 예:
+    REDIS_URL=redis://localhost:6379/0 python benchmarks/startup.py --runs 5 --output startup.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_PATHS = ['/', '/news/', '/api/trends?period=weekly', '/reports/']
+
+# 자식 프로세스에서 실행되는 측정 코드
+CHILD_SCRIPT = r'''
+import json, sys, time
+paths, wait_ready = json.loads(sys.argv[1]), float(sys.argv[2])
+
+start = time.perf_counter()
+import app
+result = {'import_s': time.perf_counter() - start, 'paths': {}}
+client = app.app.test_client()
+
+for path in paths:
+    t0 = time.perf_counter()
+    status = client.get(path).status_code
+    t1 = time.perf_counter()
+    client.get(path)
+    t2 = time.perf_counter()
+    result['paths'][path] = {'status': status, 'first_s': t1 - t0, 'second_s': t2 - t1}
+
+if wait_ready > 0:
+    deadline = start + wait_ready
+    while client.get('/health').status_code != 200 and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    ready = client.get('/health').status_code == 200
+    result['ready_s'] = time.perf_counter() - start if ready else None
+
+print('BENCH_RESULT ' + json.dumps(result))
+'''
+
+
+def run_once(paths, wait_ready):
+    proc = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT, json.dumps(paths), str(wait_ready)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith('BENCH_RESULT '):
+            return json.loads(line[len('BENCH_RESULT '):])
+    raise RuntimeError(f"No result from child process:\n{proc.stderr[-2000:]}")
+
+
+def summarize(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return {'median_ms': statistics.median(values) * 1000, 'min_ms': min(values) * 1000, 'max_ms': max(values) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and first-request latency.")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--paths', nargs='*', default=DEFAULT_PATHS)
+    parser.add_argument('--wait-ready', type=float, default=0, help="/health가 200이 될 때까지 기다릴 최대 시간(초). 0이면 측정하지 않음")
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    runs = [run_once(args.paths, args.wait_ready) for _ in range(args.runs)]
+    summary = {
+        'runs': args.runs,
+        'import': summarize([r['import_s'] for r in runs]),
+        'paths': {
+            path: {
+                'status': sorted({r['paths'][path]['status'] for r in runs}),
+                'first_request': summarize([r['paths'][path]['first_s'] for r in runs]),
+                'second_request': summarize([r['paths'][path]['second_s'] for r in runs]),
+            }
+            for path in args.paths
+        },
+    }
+    if args.wait_ready > 0:
+        summary['ready'] = summarize([r.get('ready_s') for r in runs])
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'summary': summary, 'raw': runs}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
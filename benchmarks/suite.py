@@ -0,0 +1,203 @@
+# benchmarks/suite.py
+"""
+캐시 작업과 Flask 엔드포인트 벤치마크 (오프라인, fakeredis 사용).
+규모(기사 수)마다 빈 fakeredis에 합성 기사와 리포트를 쓰고 다음을 측정합니다.
+  - 작업: fetch_all_news_from_redis, categorize_news(전체 기사), update_news_cache(전체/증분/변경 없음), update_reports_cache
+  - 엔드포인트: 테스트 클라이언트로 각 경로의 첫 요청(워커 로컬 캐시 비움)과 반복 요청 평균
+각 항목은 실행 시간, 파이썬 힙 최대 사용량, Redis 왕복/명령 수를 기록하며 결과는 JSON으로 저장합니다.
+--compare로 이전 결과 파일을 주면 항목별 변화율을 출력하고, --threshold를 넘게 느려진 항목이 있으면 종료 코드 1을 반환합니다.
+
+fakeredis는 순수 파이썬이므로 절대 시간은 실제 Redis보다 느립니다. 같은 환경에서의 상대 비교와 왕복 수 비교에 사용하세요.
+토큰화 프로세스 풀 자식 프로세스의 메모리는 peak_mb에 포함되지 않습니다.
+
+사용 예:
+    python benchmarks/suite.py --scales 1000 10000 --output bench.json
+    python benchmarks/suite.py --scales 1000 10000 --compare bench.json
+"""
+import os
+import sys
+import json
+import platform
+import argparse
+import statistics
+from datetime import datetime, timezone
+
+# 캐시 작업은 벤치마크가 직접 실행하므로 스케줄러, 이벤트 구독, 요청 시 재실행을 끕니다.
+os.environ.setdefault('RUN_CACHE_JOBS', '0')
+os.environ.setdefault('CACHE_EVENTS', '0')
+os.environ.setdefault('CACHE_REFRESH_ON_DEMAND', '0')
+
+import harness  # noqa: E402
+import corpus  # noqa: E402
+
+_, redis_client = harness.install_fake_redis()
+
+import services  # noqa: E402
+import local_cache  # noqa: E402
+import keywords  # noqa: E402
+from app import app  # noqa: E402
+
+# 비교 시 변화율을 보는 지표 (왕복/명령 수는 증가하면 회귀로 봄)
+COMPARED_METRICS = ('wall_s', 'peak_mb', 'round_trips', 'commands')
+
+
+def endpoint_paths(today, sample_category):
+    day = today.strftime('%Y-%m-%d')
+    return [
+        '/',
+        '/news/',
+        f'/news/?category={sample_category}&sort=oldest',
+        f'/news/api?category={sample_category}&limit=30',
+        '/api/trends?period=weekly',
+        '/api/trends?period=monthly',
+        '/api/trends?days=14',
+        '/api/trends/news?period=weekly&facet=all&limit=20',
+        '/reports/',
+        f'/reports/api/daily?date={day}',
+        '/api/search?q=solar+emissions',
+        '/health',
+    ]
+
+
+def bench_jobs(args, articles, today):
+    jobs = {}
+    all_news, jobs['fetch_all_news_from_redis'] = harness.measure(services.fetch_all_news_from_redis, args.memory)
+
+    def _categorize():
+        for news in all_news:
+            services.categorize_news(news)
+    _, jobs['categorize_news'] = harness.measure(_categorize, args.memory)
+    del all_news
+
+    _, jobs['update_news_cache_full'] = harness.measure(lambda: services.update_news_cache(full=True), args.memory)
+    # 오늘 날짜의 빈 일련번호(500~999)에 새 기사를 추가한 뒤 증분 갱신 (corpus는 하루 최대 500개를 씀)
+    new_count = min(max(1, articles // 100), 500)
+    new_items = corpus.generate_news(new_count, days=1, end=today, seed=args.seed + 7)
+    corpus.load(redis_client, ((f"news-{today:%Y%m%d}-{500 + i:03d}", value) for i, (_, value) in enumerate(new_items)))
+    _, jobs['update_news_cache_incremental'] = harness.measure(services.update_news_cache, args.memory)
+    _, jobs['update_news_cache_noop'] = harness.measure(services.update_news_cache, args.memory)
+    _, jobs['update_reports_cache'] = harness.measure(services.update_reports_cache, args.memory)
+    return jobs
+
+
+def bench_endpoints(args, paths):
+    client = app.test_client()
+    results = {}
+    for path in paths:
+        local_cache.clear()
+        response, cold = harness.measure(lambda: client.get(path), args.memory)
+        warm = []
+        for _ in range(args.requests):
+            _, metrics = harness.measure(lambda: client.get(path), memory=False)
+            warm.append(metrics)
+        results[path] = {
+            'status': response.status_code,
+            'bytes': len(response.get_data()),
+            'cold': cold,
+            'warm': {
+                'wall_s': round(statistics.mean(m['wall_s'] for m in warm), 6),
+                'p95_wall_s': round(sorted(m['wall_s'] for m in warm)[max(0, int(len(warm) * 0.95) - 1)], 6),
+                'round_trips': statistics.mean(m['round_trips'] for m in warm),
+                'commands': statistics.mean(m['commands'] for m in warm),
+            } if warm else None,
+        }
+    return results
+
+
+def run_scale(args, articles):
+    redis_client.flushall()
+    local_cache.clear()
+    today = datetime.now(timezone.utc).date()
+    days = corpus.days_for(articles)
+    result = {'articles': articles, 'days': days}
+
+    def _load():
+        news = corpus.load(redis_client, corpus.generate_news(articles, days=days, end=today, seed=args.seed))
+        reports = corpus.load(redis_client, corpus.generate_reports(min(days, args.report_days), end=today, seed=args.seed))
+        return news, reports
+    (_, result['reports']), result['load'] = harness.measure(_load, memory=False)
+
+    result['jobs'] = bench_jobs(args, articles, today)
+    sample_category = next(iter(services.CATEGORIES))
+    result['endpoints'] = bench_endpoints(args, endpoint_paths(today, sample_category))
+    return result
+
+
+def _flatten(results):
+    """{(규모, 구분, 이름, 지표): 값} 형태로 펼칩니다."""
+    flat = {}
+    for scale, data in results.get('scales', {}).items():
+        for name, metrics in data.get('jobs', {}).items():
+            for metric in COMPARED_METRICS:
+                if metrics.get(metric) is not None:
+                    flat[(scale, 'job', name, metric)] = metrics[metric]
+        for path, entry in data.get('endpoints', {}).items():
+            for phase in ('cold', 'warm'):
+                for metric in COMPARED_METRICS:
+                    if entry.get(phase) and entry[phase].get(metric) is not None:
+                        flat[(scale, phase, path, metric)] = entry[phase][metric]
+    return flat
+
+
+def compare(baseline, current, threshold):
+    """이전 결과와 비교하여 변화율을 출력합니다. 반환값: threshold를 넘게 나빠진 항목 수"""
+    old, new = _flatten(baseline), _flatten(current)
+    regressions = 0
+    for key in sorted(set(old) & set(new)):
+        before, after = old[key], new[key]
+        if not before:
+            change = 0.0 if not after else float('inf')
+        else:
+            change = (after - before) / before
+        # 시간은 측정 잡음을 고려해 1ms 미만의 변화는 무시합니다.
+        regressed = change > threshold and not (key[3] == 'wall_s' and after - before < 0.001)
+        regressions += regressed
+        if regressed or change < -threshold:
+            scale, kind, name, metric = key
+            print(f"{'REGRESSION' if regressed else 'improved  '} {scale:>8} {kind:<5} {name:<50} {metric:<11} {before:>12.4f} -> {after:>12.4f} ({change:+.1%})")
+    print(f"Compared {len(set(old) & set(new))} metrics, {regressions} regressions over {threshold:.0%}.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cache jobs and endpoints against an in-memory fake Redis.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000], help="기사 수 목록 (예: 1000 10000 100000 1000000)")
+    parser.add_argument('--report-days', type=int, default=365, help="리포트를 생성할 최대 일 수")
+    parser.add_argument('--requests', type=int, default=20, help="엔드포인트별 반복 요청 수")
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help="tracemalloc 없이 실행 시간만 측정합니다.")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 파일 경로")
+    parser.add_argument('--threshold', type=float, default=0.2, help="회귀로 판단할 변화율 (기본 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'backend': 'fakeredis',
+            'tracemalloc': args.memory,
+            'tokenize_workers': keywords.TOKENIZE_WORKERS,
+            'seed': args.seed,
+            'requests': args.requests,
+        },
+        'scales': {},
+    }
+    for articles in args.scales:
+        print(f"Running scale {articles} articles...", file=sys.stderr)
+        results['scales'][str(articles)] = run_scale(args, articles)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        return 1 if compare(baseline, results, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+# cache_events.py
+"""
+원본 키 변경 이벤트를 받아 캐시 작업을 바로 실행합니다. 30분 주기 작업은 이벤트를 놓쳤을 때의 안전망으로 남습니다.
+이벤트 출처:
+  - 명시적 발행: 수집기가 publish_news()/publish_report()로 'cache:events' 채널에 변경된 키 목록을 발행
+  - keyspace 알림: Redis에 notify-keyspace-events(예: 'K$gx')가 설정되어 있으면 news-*, *report-* 키의 변경을 직접 구독
+
+연속으로 들어오는 이벤트는 CACHE_EVENT_DEBOUNCE_SECONDS 동안 조용해지거나 첫 이벤트 후 CACHE_EVENT_MAX_DELAY_SECONDS가
+지나면 한 번에 묶어 처리합니다. 리더만 작업을 실행하며, 작업에는 변경된 키 목록(changed_keys)을 넘겨 해당 부분만 갱신하게 합니다.
+작업 락을 얻지 못하면(다른 프로세스가 실행 중) 묶음을 다시 대기열에 넣어 다음 기회에 처리합니다.
+뉴스 키가 삭제/만료되면(keyspace 알림) 기사 저장소와 인덱스에서 키 단위로 지울 수 없으므로 뉴스 작업을 전체 재구성으로 실행합니다.
+"""
+import os
+import re
+import json
+import time
+import logging
+import threading
+from functools import partial
+
+import redis
+
+from extensions import redis_client
+import leader
+
+logger = logging.getLogger(__name__)
+
+EVENT_CHANNEL = 'cache:events'
+KEYSPACE_PATTERNS = ('__keyspace@{}__:news-*', '__keyspace@{}__:*report-*')
+# 이벤트 종류별 원본 키 형식
+KEY_KINDS = (
+    ('news', re.compile(r'^news-\d{8}-\d{3}$')),
+    ('reports', re.compile(r'^(daily|weekly|monthly)report-\d{8}$')),
+)
+
+# 키가 사라졌음을 뜻하는 keyspace 알림 이벤트
+REMOVAL_EVENTS = ('del', 'expired', 'evicted')
+# 키가 사라지면 변경된 키 목록 대신 전체 재구성(full=True)으로 작업을 실행할 이벤트 종류
+# (리포트 작업은 changed_keys의 삭제된 키를 카탈로그에서 직접 제거합니다)
+FULL_REBUILD_ON_REMOVAL = ('news',)
+
+CACHE_EVENTS_ENABLED = os.getenv('CACHE_EVENTS', '1') != '0'
+CACHE_EVENT_DEBOUNCE_SECONDS = float(os.getenv('CACHE_EVENT_DEBOUNCE_SECONDS', '10'))
+CACHE_EVENT_MAX_DELAY_SECONDS = float(os.getenv('CACHE_EVENT_MAX_DELAY_SECONDS', '60'))
+# 한 묶음에서 키 목록을 유지하는 최대 개수. 넘으면 키 목록 없이(일반 증분 갱신으로) 실행합니다.
+CACHE_EVENT_MAX_KEYS = int(os.getenv('CACHE_EVENT_MAX_KEYS', '5000'))
+_POLL_SECONDS = 1.0
+_RECONNECT_SECONDS = 5.0
+
+_lock = threading.Lock()
+_pending = {}  # 종류 -> {'keys': set 또는 None(너무 많음), 'removed': 삭제된 키가 있는지, 'first': 첫 이벤트 시각, 'last': 마지막 이벤트 시각}
+_running = set()
+_jobs = {}
+_interval = None
+_thread = None
+
+
+def publish_news(keys):
+    """수집기가 뉴스 키를 쓴 뒤 호출합니다."""
+    _publish('news', keys)
+
+
+def publish_report(report_type, date):
+    """리포트 생성기가 리포트 키를 쓴 뒤 호출합니다. date: 'YYYY-MM-DD' 또는 'YYYYMMDD'"""
+    _publish('reports', [f"{report_type}report-{date.replace('-', '')}"])
+
+
+def _publish(kind, keys):
+    keys = list(keys)
+    if redis_client and keys:
+        redis_client.publish(EVENT_CHANNEL, json.dumps({'kind': kind, 'keys': keys}))
+
+
+def _kind_for_key(key):
+    for kind, pattern in KEY_KINDS:
+        if pattern.match(key):
+            return kind
+    return None
+
+
+def _record(kind, keys, removed=False):
+    now = time.monotonic()
+    with _lock:
+        batch = _pending.setdefault(kind, {'keys': set(), 'removed': False, 'first': now, 'last': now})
+        batch['last'] = now
+        batch['removed'] = batch['removed'] or removed
+        if batch['keys'] is not None:
+            batch['keys'].update(keys)
+            if len(batch['keys']) > CACHE_EVENT_MAX_KEYS:
+                batch['keys'] = None
+
+
+def _handle_message(message):
+    channel, data = message.get('channel'), message.get('data')
+    if channel == EVENT_CHANNEL:
+        try:
+            event = json.loads(data)
+            kind, keys = event['kind'], event.get('keys') or []
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"CACHE_EVENTS: Ignoring malformed event: {data!r}")
+            return
+        if kind in _jobs:
+            _record(kind, keys)
+    else:
+        # keyspace 알림: 채널이 '__keyspace@0__:<키>', 데이터가 명령 이름('set', 'del' 등)
+        key = channel.split(':', 1)[1]
+        kind = _kind_for_key(key)
+        if kind in _jobs:
+            _record(kind, [key], removed=data in REMOVAL_EVENTS)
+
+
+def _due_batches():
+    now = time.monotonic()
+    due = []
+    with _lock:
+        for kind, batch in list(_pending.items()):
+            if kind in _running:
+                continue
+            if now - batch['last'] >= CACHE_EVENT_DEBOUNCE_SECONDS or now - batch['first'] >= CACHE_EVENT_MAX_DELAY_SECONDS:
+                del _pending[kind]
+                _running.add(kind)
+                due.append((kind, batch))
+    return due
+
+
+def _run(kind, batch):
+    job_id, func = _jobs[kind]
+    keys = sorted(batch['keys']) if batch['keys'] is not None else None
+    full = batch['removed'] and kind in FULL_REBUILD_ON_REMOVAL
+    try:
+        if not leader.is_leader():
+            return
+        job = partial(func, full=True) if full else partial(func, changed_keys=keys)
+        if leader.run_locked(job_id, job, _interval):
+            logger.info(f"CACHE_EVENTS: Ran '{job_id}' for {len(keys) if keys is not None else 'many'} changed keys"
+                        f"{' (full rebuild for removed keys)' if full else ''}.")
+        else:
+            # 다른 프로세스가 작업을 실행 중이면 이번 변경이 반영되지 않았을 수 있으므로 다시 대기열에 넣습니다.
+            _record(kind, keys or [], removed=batch['removed'])
+            if keys is None:
+                with _lock:
+                    _pending[kind]['keys'] = None
+    except Exception as e:
+        logger.error(f"CACHE_EVENTS: '{job_id}' failed for event batch: {e}", exc_info=True)
+    finally:
+        with _lock:
+            _running.discard(kind)
+
+
+def _subscribe():
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(EVENT_CHANNEL)
+    db = redis_client.connection_pool.connection_kwargs.get('db', 0)
+    pubsub.psubscribe(*(pattern.format(db) for pattern in KEYSPACE_PATTERNS))
+    return pubsub
+
+
+def _listen():
+    pubsub = None
+    while True:
+        try:
+            if pubsub is None:
+                pubsub = _subscribe()
+                logger.info("CACHE_EVENTS: Subscribed to cache events.")
+            message = pubsub.get_message(timeout=_POLL_SECONDS)
+            if message:
+                _handle_message(message)
+        except redis.exceptions.RedisError as e:
+            logger.warning(f"CACHE_EVENTS: Subscription lost, reconnecting in {_RECONNECT_SECONDS}s: {e}")
+            try:
+                if pubsub is not None:
+                    pubsub.close()
+            except Exception:
+                pass
+            pubsub = None
+            time.sleep(_RECONNECT_SECONDS)
+        for kind, batch in _due_batches():
+            threading.Thread(target=_run, args=(kind, batch), name=f"cache-event-{kind}", daemon=True).start()
+
+
+def _keyspace_notifications_enabled():
+    try:
+        flags = redis_client.config_get('notify-keyspace-events').get('notify-keyspace-events', '')
+    except redis.exceptions.RedisError:
+        return None  # 관리형 Redis 등에서 CONFIG가 막혀 있으면 알 수 없음
+    return 'K' in flags and any(c in flags for c in '$gA')
+
+
+def start(jobs, interval):
+    """
+    이벤트 구독 스레드를 시작합니다. 프로세스당 한 번만 시작됩니다.
+    jobs: {이벤트 종류('news', 'reports'): (작업 ID, changed_keys 인자를 받는 작업 함수)}
+    """
+    global _thread, _interval
+    if not redis_client or not CACHE_EVENTS_ENABLED or _thread is not None:
+        return
+    _jobs.update(jobs)
+    _interval = interval
+    if _keyspace_notifications_enabled() is False:
+        logger.info("CACHE_EVENTS: Keyspace notifications are disabled; only explicit events on "
+                    f"'{EVENT_CHANNEL}' will trigger cache updates.")
+    _thread = threading.Thread(target=_listen, name='cache-events', daemon=True)
+    _thread.start()
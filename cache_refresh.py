@@ -0,0 +1,230 @@
+# cache_refresh.py
+"""
+캐시가 없거나 오래되었을 때 요청 경로에서 캐시 작업을 다시 실행합니다. (stale-while-revalidate)
+  cache:meta          Hash    작업 ID -> {"built_at", "soft_expires_at", "hard_expires_at", "snapshot_at"} (JSON)
+  cache:lkg:{key}     String  캐시 키의 마지막 정상본(DUMP 페이로드). CACHE_SNAPSHOT_TTL_SECONDS 후 만료
+  cache:lkg:meta      Hash    캐시 키 -> {"job", "saved_at", "expires_at"} (JSON)
+
+- soft 만료 전: 그대로 제공합니다.
+- soft 만료 후: 오래된 데이터를 그대로 제공하면서 백그라운드 스레드에서 작업을 다시 실행합니다.
+- hard 만료 후 또는 캐시 키가 없을 때(Redis flush, 첫 배포, eviction): 없는 키는 마지막 정상본에서 복원하고,
+  작업을 실행하여 최대 CACHE_REFRESH_WAIT_SECONDS 동안 기다립니다. 시간이 지나면 있는 데이터로 응답합니다.
+작업은 leader.job_lock으로 클러스터 전체에서 한 번에 하나만 실행되고(single-flight), 워커 안에서는 요청들이
+같은 갱신 스레드를 기다립니다. 다른 프로세스가 실행 중이면 그 작업이 끝나기를 기다립니다.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from extensions import redis_client, redis_bytes_client
+import leader
+
+logger = logging.getLogger(__name__)
+
+CACHE_META_KEY = 'cache:meta'
+SNAPSHOT_KEY = 'cache:lkg:{}'
+SNAPSHOT_META_KEY = 'cache:lkg:meta'
+
+# soft 만료: 주기 작업(30분)이 한 번 늦어져도 요청이 작업을 실행하지 않도록 주기보다 길게 둡니다.
+CACHE_SOFT_TTL_SECONDS = int(os.getenv('CACHE_SOFT_TTL_SECONDS', str(45 * 60)))
+CACHE_HARD_TTL_SECONDS = int(os.getenv('CACHE_HARD_TTL_SECONDS', str(6 * 3600)))
+CACHE_SNAPSHOT_TTL_SECONDS = int(os.getenv('CACHE_SNAPSHOT_TTL_SECONDS', str(7 * 24 * 3600)))
+# 마지막 정상본을 다시 저장하는 최소 간격(초). 스냅샷은 캐시 키 전체를 DUMP하므로 이벤트로 자주 실행되는 작업마다 저장하지 않습니다.
+CACHE_SNAPSHOT_INTERVAL_SECONDS = int(os.getenv('CACHE_SNAPSHOT_INTERVAL_SECONDS', str(3600)))
+# 캐시가 없거나 hard 만료되었을 때 요청이 갱신을 기다리는 최대 시간(초)
+CACHE_REFRESH_WAIT_SECONDS = float(os.getenv('CACHE_REFRESH_WAIT_SECONDS', '3'))
+# 캐시가 있을 때 만료 여부를 확인하는 주기(초). 이 주기 안에서는 Redis를 조회하지 않습니다.
+CACHE_REFRESH_CHECK_INTERVAL = float(os.getenv('CACHE_REFRESH_CHECK_INTERVAL', '5'))
+# 요청에 의한 갱신이 끝난 뒤 같은 작업을 다시 실행하지 않는 시간(초). 원본 데이터가 없어 작업이 캐시를 만들지 못할 때
+# 모든 요청이 작업을 반복 실행하며 기다리지 않도록 합니다.
+CACHE_REFRESH_COOLDOWN_SECONDS = float(os.getenv('CACHE_REFRESH_COOLDOWN_SECONDS', '60'))
+# 0이면 웹 워커는 작업을 실행하지 않고 마지막 정상본 복원만 합니다. (cache_worker.py가 작업을 전담하는 경우)
+CACHE_REFRESH_ON_DEMAND = os.getenv('CACHE_REFRESH_ON_DEMAND', '1') != '0'
+_POLL_SECONDS = 0.25
+
+_jobs = {}  # job_id -> (func, 캐시 키 목록, 주기)
+_lock = threading.Lock()
+_inflight = {}  # job_id -> 갱신 스레드가 끝나면 set되는 Event
+_checked_at = {}
+_refreshed_at = {}
+
+
+def register(job_id, func, keys, interval):
+    """캐시 작업과 그 작업이 만드는 캐시 키(마지막 정상본 대상)를 등록합니다."""
+    _jobs[job_id] = (func, tuple(keys), interval)
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+def _snapshot_due(snapshot_at, now):
+    try:
+        return now - datetime.fromisoformat(snapshot_at) >= timedelta(seconds=CACHE_SNAPSHOT_INTERVAL_SECONDS)
+    except (TypeError, ValueError):
+        return True
+
+
+def record_build(job_id, changed=True):
+    """
+    작업이 성공한 뒤 호출합니다. 만료 시각을 기록하고 캐시 키들의 마지막 정상본을 저장합니다.
+    캐시를 다시 쓰지 않은 실행(changed=False)이거나 직전 스냅샷 후 CACHE_SNAPSHOT_INTERVAL_SECONDS가 지나지 않았으면
+    만료 시각만 갱신합니다.
+    """
+    if not redis_client or job_id not in _jobs: return
+    now = _utcnow()
+    try:
+        raw = redis_client.hget(CACHE_META_KEY, job_id)
+        snapshot_at = json.loads(raw).get('snapshot_at') if raw else None
+    except ValueError:
+        snapshot_at = None
+    take_snapshot = changed and _snapshot_due(snapshot_at, now)
+    meta = {
+        'built_at': now.isoformat(),
+        'soft_expires_at': (now + timedelta(seconds=CACHE_SOFT_TTL_SECONDS)).isoformat(),
+        'hard_expires_at': (now + timedelta(seconds=CACHE_HARD_TTL_SECONDS)).isoformat(),
+        'snapshot_at': now.isoformat() if take_snapshot else snapshot_at,
+    }
+    try:
+        if take_snapshot:
+            snapshot(job_id, now)
+        redis_client.hset(CACHE_META_KEY, job_id, json.dumps(meta))
+    except Exception as e:
+        logger.error(f"CACHE_REFRESH: Could not record build of '{job_id}': {e}")
+
+
+def snapshot(job_id, now=None):
+    """작업의 캐시 키들을 DUMP하여 마지막 정상본으로 저장합니다. 반환값: 저장한 키 수"""
+    now = now or _utcnow()
+    keys = _jobs[job_id][1]
+    pipe = redis_bytes_client.pipeline(transaction=False)
+    for key in keys:
+        pipe.dump(key)
+    payloads = pipe.execute()
+
+    meta = json.dumps({'job': job_id, 'saved_at': now.isoformat(),
+                       'expires_at': (now + timedelta(seconds=CACHE_SNAPSHOT_TTL_SECONDS)).isoformat()})
+    pipe = redis_bytes_client.pipeline(transaction=False)
+    saved = 0
+    for key, payload in zip(keys, payloads):
+        if payload is None: continue
+        pipe.set(SNAPSHOT_KEY.format(key), payload, ex=CACHE_SNAPSHOT_TTL_SECONDS)
+        pipe.hset(SNAPSHOT_META_KEY, key, meta)
+        saved += 1
+    pipe.execute()
+    return saved
+
+
+def restore(job_id):
+    """
+    없는 캐시 키를 마지막 정상본에서 복원합니다. 이미 있는 키는 덮어쓰지 않습니다. (RESTORE without REPLACE)
+    반환값: 복원한 키 수
+    """
+    keys = _jobs[job_id][1]
+    pipe = redis_bytes_client.pipeline(transaction=False)
+    for key in keys:
+        pipe.exists(key)
+        pipe.get(SNAPSHOT_KEY.format(key))
+    results = pipe.execute()
+
+    restored = 0
+    for key, exists, payload in zip(keys, results[0::2], results[1::2]):
+        if exists or not payload: continue
+        try:
+            redis_bytes_client.restore(key, 0, payload)
+            restored += 1
+        except Exception as e:
+            # 다른 요청이 먼저 복원했거나(BUSYKEY) 페이로드가 다른 Redis 버전의 것인 경우
+            logger.warning(f"CACHE_REFRESH: Could not restore '{key}' from snapshot: {e}")
+    if restored:
+        logger.warning(f"CACHE_REFRESH: Restored {restored} cache keys of '{job_id}' from last-known-good snapshots.")
+    return restored
+
+
+def build_state(job_id):
+    """작업 결과의 상태: 'fresh', 'stale'(soft 만료), 'expired'(hard 만료 또는 기록 없음)"""
+    raw = redis_client.hget(CACHE_META_KEY, job_id)
+    try:
+        meta = json.loads(raw) if raw else None
+        now = _utcnow()
+        if meta and now < datetime.fromisoformat(meta['soft_expires_at']):
+            return 'fresh'
+        if meta and now < datetime.fromisoformat(meta['hard_expires_at']):
+            return 'stale'
+    except (ValueError, KeyError) as e:
+        logger.warning(f"CACHE_REFRESH: Invalid metadata for '{job_id}': {e}")
+    return 'expired'
+
+
+def _built_at(job_id):
+    raw = redis_client.hget(CACHE_META_KEY, job_id)
+    return json.loads(raw).get('built_at') if raw else None
+
+
+def _refresh(job_id, event):
+    func, _, interval = _jobs[job_id]
+    try:
+        before = _built_at(job_id)
+        if leader.run_locked(job_id, func, interval):
+            logger.info(f"CACHE_REFRESH: Rebuilt '{job_id}' on demand.")
+        else:
+            # 다른 프로세스가 실행 중이면 그 작업이 결과를 기록할 때까지 기다립니다.
+            deadline = time.monotonic() + CACHE_REFRESH_WAIT_SECONDS
+            while time.monotonic() < deadline and _built_at(job_id) == before:
+                time.sleep(_POLL_SECONDS)
+    except Exception as e:
+        logger.error(f"CACHE_REFRESH: On-demand rebuild of '{job_id}' failed: {e}", exc_info=True)
+    finally:
+        with _lock:
+            _inflight.pop(job_id, None)
+            _refreshed_at[job_id] = time.monotonic()
+        event.set()
+
+
+def refresh(job_id):
+    """
+    작업을 백그라운드 스레드에서 다시 실행하고 끝나면 set되는 Event를 반환합니다.
+    이미 실행 중이면 그 스레드의 Event를, 직전 갱신 후 CACHE_REFRESH_COOLDOWN_SECONDS가 지나지 않았으면 None을 반환합니다.
+    """
+    with _lock:
+        event = _inflight.get(job_id)
+        if event:
+            return event
+        if time.monotonic() - _refreshed_at.get(job_id, float('-inf')) < CACHE_REFRESH_COOLDOWN_SECONDS:
+            return None
+        event = _inflight[job_id] = threading.Event()
+    threading.Thread(target=_refresh, args=(job_id, event), name=f"cache-refresh-{job_id}", daemon=True).start()
+    return event
+
+
+def ensure(job_id, missing=False):
+    """
+    캐시를 읽는 쪽에서 호출합니다. 캐시 키가 없었으면 missing=True로 호출합니다.
+    필요하면 마지막 정상본을 복원하거나 작업을 다시 실행합니다.
+    반환값: 캐시가 복원되었거나 갱신이 끝나 다시 읽어볼 만하면 True
+    """
+    if not redis_client or job_id not in _jobs: return False
+    if not missing:
+        now = time.monotonic()
+        if now - _checked_at.get(job_id, float('-inf')) < CACHE_REFRESH_CHECK_INTERVAL:
+            return False
+        _checked_at[job_id] = now
+
+    try:
+        state = build_state(job_id)
+        restored = restore(job_id) if missing else 0
+        if state == 'fresh' and not missing:
+            return False
+        if not CACHE_REFRESH_ON_DEMAND:
+            return bool(restored)
+        event = refresh(job_id)
+        if event is None or restored or (state == 'stale' and not missing):
+            # 오래된 데이터(또는 복원된 정상본)를 제공하고 갱신은 백그라운드에서 계속합니다.
+            return bool(restored)
+        return event.wait(CACHE_REFRESH_WAIT_SECONDS)
+    except Exception as e:
+        logger.error(f"CACHE_REFRESH: Could not check cache for '{job_id}': {e}")
+        return False
@@ -0,0 +1,89 @@
+# cache_worker.py
+"""
+캐시 작업(뉴스/리포트)을 웹 워커 밖의 별도 프로세스에서 실행합니다.
+웹 서비스에 RUN_CACHE_JOBS=0을 설정하면 웹 워커는 결과만 읽고, 토큰화 등 무거운 작업은 이 프로세스가 전담합니다.
+여러 개를 실행해도 리더 선출에 의해 한 프로세스만 작업을 수행합니다.
+원본 키 변경 이벤트(cache_events)를 구독하여 주기와 관계없이 변경된 부분을 바로 갱신합니다.
+
+사용 예:
+    python cache_worker.py                 # 30분 주기로 계속 실행
+    python cache_worker.py --once          # 한 번 실행 후 종료
+    python cache_worker.py --once --full   # 뉴스 캐시 전체 재구성 후 종료
+    python cache_worker.py --rebuild-news-index   # 뉴스 보조 인덱스만 다시 만든 후 종료
+    python cache_worker.py --rebuild-search-index # 검색 색인을 다시 만든 후 종료
+"""
+import atexit
+import logging
+import argparse
+from datetime import datetime
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+
+from extensions import redis_client
+from services import CACHE_JOBS, CACHE_JOB_INTERVAL, CACHE_EVENT_JOBS, update_news_cache, rebuild_news_index, rebuild_search_index
+import leader
+import cache_events
+
+logger = logging.getLogger(__name__)
+
+
+def run_once(full=False):
+    for _, func, _, _ in CACHE_JOBS:
+        if func is update_news_cache:
+            func(full=full)
+        else:
+            func()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the news/reports cache jobs outside the web workers.")
+    parser.add_argument('--once', action='store_true', help="작업을 한 번만 실행하고 종료합니다.")
+    parser.add_argument('--full', action='store_true', help="뉴스 캐시를 증분이 아닌 전체 재구성으로 실행합니다. (--once와 함께 사용)")
+    parser.add_argument('--rebuild-news-index', action='store_true', help="뉴스 보조 인덱스(idx:news:*)를 원본 키에서 다시 만들고 종료합니다.")
+    parser.add_argument('--rebuild-search-index', action='store_true', help="검색 색인(search:*)을 지우고 기사와 리포트를 다시 색인한 뒤 종료합니다.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not redis_client:
+        logger.error("CACHE_WORKER: Redis client not available.")
+        return 1
+
+    if args.rebuild_news_index:
+        # 뉴스 캐시 작업과 동시에 인덱스를 쓰지 않도록 같은 작업 잠금을 사용합니다.
+        with leader.job_lock('update_news_cache') as acquired:
+            if not acquired:
+                logger.error("CACHE_WORKER: News cache job is running. Try again later.")
+                return 1
+            logger.info(f"CACHE_WORKER: Rebuilt news index with {rebuild_news_index()} articles.")
+        return 0
+
+    if args.rebuild_search_index:
+        with leader.job_lock('update_news_cache') as acquired:
+            if not acquired:
+                logger.error("CACHE_WORKER: News cache job is running. Try again later.")
+                return 1
+            logger.info(f"CACHE_WORKER: Rebuilt search index with {rebuild_search_index()} documents.")
+        return 0
+
+    if args.once:
+        run_once(full=args.full)
+        return 0
+
+    scheduler = BlockingScheduler()
+    scheduler.add_job(leader.heartbeat, trigger='interval', seconds=leader.LEADER_RENEW_SECONDS,
+                      id='leader_heartbeat', next_run_time=datetime.now())
+    for job_id, func, cache_key, name in CACHE_JOBS:
+        scheduler.add_job(leader.leader_job(job_id, func, CACHE_JOB_INTERVAL, cache_key), trigger='interval',
+                          seconds=CACHE_JOB_INTERVAL.total_seconds(), id=job_id, name=name, next_run_time=datetime.now())
+    cache_events.start(CACHE_EVENT_JOBS, CACHE_JOB_INTERVAL)
+    atexit.register(leader.release)
+    logger.info("CACHE_WORKER: Starting cache worker scheduler.")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,24 +1,36 @@
 # extensions.py
-import os
 import redis
 import logging
+import redis_pool
 from apscheduler.schedulers.background import BackgroundScheduler
 
 logger = logging.getLogger(__name__)
 
 # Redis 연결 설정
-REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+# 프로세스당 하나의 연결 풀을 만들고, 문자열/bytes 클라이언트가 이를 공유합니다. (설정은 redis_pool 참고)
+REDIS_URL = redis_pool.REDIS_URL
+redis_pool_instance = None
 redis_client = None
+# 압축된 응답 등 바이너리 값을 다루기 위한 클라이언트 (응답을 디코딩하지 않음)
+redis_bytes_client = None
 try:
-    redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+    redis_pool_instance = redis_pool.create_pool(REDIS_URL)
+    redis_client, redis_bytes_client = redis_pool.create_clients(redis_pool_instance)
     redis_client.ping()
     logger.info(f"Successfully connected to Redis at {REDIS_URL}")
 except redis.exceptions.ConnectionError as e:
     logger.error(f"Could not connect to Redis at {REDIS_URL}: {e}")
     redis_client = None
+    redis_bytes_client = None
 except Exception as e:
     logger.error(f"Unexpected error while connecting to Redis: {e}")
     redis_client = None
+    redis_bytes_client = None
+
+
+def redis_pool_stats():
+    """공용 연결 풀의 사용량과 대기/오류 지표를 반환합니다."""
+    return redis_pool.pool_stats(redis_pool_instance)
 
 # 스케줄러 설정
 scheduler = BackgroundScheduler(daemon=True) 
\ No newline at end of file
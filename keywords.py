@@ -0,0 +1,132 @@
+# keywords.py
+"""
+트렌드 키워드 추출(토큰화 + 불용어 제거)과 집계, 검색 색인용 토큰화.
+대량 집계는 웹 요청 스레드와 GIL을 두고 경쟁하지 않도록 프로세스 풀에서 병렬로 수행합니다.
+이 모듈은 프로세스 풀의 자식 프로세스에서도 import되므로 Flask, Redis 등 무거운 모듈을 import하지 않습니다.
+"""
+import os
+import re
+import logging
+import threading
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# 토큰화에 사용할 프로세스 수. 0 또는 1이면 현재 프로세스에서 순차 처리합니다.
+TOKENIZE_WORKERS = int(os.getenv('TOKENIZE_WORKERS', str(min(4, os.cpu_count() or 1))))
+# 이보다 적은 기사는 프로세스 풀 시작 비용이 더 크므로 순차 처리합니다.
+TOKENIZE_PARALLEL_MIN_ITEMS = int(os.getenv('TOKENIZE_PARALLEL_MIN_ITEMS', '10000'))
+TOKENIZE_CHUNK_SIZE = int(os.getenv('TOKENIZE_CHUNK_SIZE', '500'))
+
+# 키워드 집계에서 제외할 일반적인 단어
+TREND_KEYWORD_EXCLUDE = {'news','report','world','global','issue','new','says','company','government','country','state','million','billion','week','year','time','people','climate','energy','environmental'}
+
+# NLTK는 import와 데이터 로딩이 느리므로 첫 트렌드 계산 시점까지 미룹니다.
+_nltk_lock = threading.Lock()
+_stop_words = None
+_word_tokenize = None
+
+
+def _load_nltk():
+    """NLTK 데이터가 로드되었는지 확인하고, 없으면 다운로드합니다. 반환값: (stop_words, word_tokenize)"""
+    global _stop_words, _word_tokenize
+    if _word_tokenize is not None:
+        return _stop_words, _word_tokenize
+    with _nltk_lock:
+        if _word_tokenize is None:
+            import nltk
+            from nltk.corpus import stopwords
+            from nltk.tokenize import word_tokenize
+            try:
+                nltk.data.find('corpora/stopwords')
+                nltk.data.find('tokenizers/punkt')
+            except LookupError:
+                logger.info("Downloading NLTK data (stopwords, punkt)...")
+                nltk.download('stopwords')
+                nltk.download('punkt')
+            _stop_words = set(stopwords.words('english'))
+            _word_tokenize = word_tokenize
+    return _stop_words, _word_tokenize
+
+
+def news_text(news):
+    """키워드 추출 대상 텍스트(기사 레코드의 제목 + 요약)를 만듭니다."""
+    return f"{news.title or ''} {news.summary or ''}"
+
+
+def tokenize(text):
+    """텍스트를 소문자 영문 토큰으로 나누고 불용어와 짧은 단어를 제거합니다. (검색 색인과 질의에 사용)"""
+    stop_words, word_tokenize = _load_nltk()
+    cleaned = re.sub(r'[^a-zA-Z\s]', '', text.lower())
+    return [w for w in word_tokenize(cleaned) if w.isalnum() and w not in stop_words and len(w) > 2]
+
+
+def extract_keywords(text):
+    """텍스트를 토큰화하여 트렌드 집계용 키워드 목록을 반환합니다."""
+    return [w for w in tokenize(text) if w not in TREND_KEYWORD_EXCLUDE]
+
+
+def _count_chunk(chunk):
+    """[(group, text), ...] 묶음의 그룹별 키워드 Counter를 계산합니다. 자식 프로세스에서 실행됩니다."""
+    counts = {}
+    for group, text in chunk:
+        counts.setdefault(group, Counter()).update(extract_keywords(text))
+    return counts
+
+
+def _tokenize_chunk(texts):
+    """텍스트 묶음을 토큰 목록들로 변환합니다. 자식 프로세스에서 실행됩니다."""
+    return [tokenize(text) for text in texts]
+
+
+def _map_chunks(func, items, workers):
+    """
+    items를 묶음으로 나누어 프로세스 풀에서 func를 실행하고 묶음별 결과를 순서대로 반환합니다.
+    병렬 처리할 필요가 없거나 실패하면 None을 반환하며, 호출하는 쪽이 현재 프로세스에서 처리합니다.
+    """
+    workers = TOKENIZE_WORKERS if workers is None else workers
+    if workers <= 1 or len(items) < TOKENIZE_PARALLEL_MIN_ITEMS:
+        return None
+
+    chunks = [items[i:i + TOKENIZE_CHUNK_SIZE] for i in range(0, len(items), TOKENIZE_CHUNK_SIZE)]
+    try:
+        # 스레드가 있는 웹 워커에서 fork하면 잠금 상태가 복제될 수 있으므로 spawn을 사용합니다.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = list(pool.map(func, chunks))
+    except Exception as e:
+        logger.error(f"KEYWORDS: Parallel tokenization failed, falling back to serial: {e}")
+        return None
+    logger.info(f"KEYWORDS: Tokenized {len(items)} texts in {len(chunks)} chunks using {workers} processes.")
+    return results
+
+
+@metrics.timed('tokenize_seconds', op='keyword_counts')
+def keyword_counts_by_group(items, workers=None):
+    """
+    [(group, text), ...]를 받아 {group: 키워드 Counter}를 반환합니다.
+    기사가 충분히 많으면 묶음으로 나누어 프로세스 풀에서 계산한 뒤 Counter를 합칩니다.
+    """
+    items = list(items)
+    results = _map_chunks(_count_chunk, items, workers)
+    if results is None:
+        return _count_chunk(items)
+
+    merged = {}
+    for counts in results:
+        for group, counter in counts.items():
+            merged.setdefault(group, Counter()).update(counter)
+    return merged
+
+
+@metrics.timed('tokenize_seconds', op='tokenize_many')
+def tokenize_many(texts, workers=None):
+    """텍스트 목록을 같은 순서의 토큰 목록들로 변환합니다. 많으면 프로세스 풀에서 병렬로 처리합니다."""
+    texts = list(texts)
+    results = _map_chunks(_tokenize_chunk, texts, workers)
+    if results is None:
+        return _tokenize_chunk(texts)
+    return [tokens for chunk in results for tokens in chunk]
@@ -0,0 +1,186 @@
+# leader.py
+"""
+여러 gunicorn 워커와 인스턴스 중 한 프로세스만 스케줄된 캐시 작업을 실행하도록
+Redis 임대(lease) 기반으로 리더를 선출합니다.
+리더는 heartbeat 작업으로 임대를 갱신하고, 리더가 사라지면 임대가 만료된 뒤 다른 워커가 이어받습니다.
+"""
+import os
+import uuid
+import socket
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from extensions import redis_client
+import metrics
+
+logger = logging.getLogger(__name__)
+
+LEADER_KEY = 'scheduler:leader'
+# 리더 임대 시간과 갱신 주기(초). 갱신 주기는 임대 시간보다 충분히 짧아야 합니다.
+LEADER_LEASE_SECONDS = int(os.getenv('LEADER_LEASE_SECONDS', '30'))
+LEADER_RENEW_SECONDS = int(os.getenv('LEADER_RENEW_SECONDS', '10'))
+# 작업 실행 중 보유하는 작업별 락의 임대 시간(초). 실행 중에는 백그라운드 스레드가 계속 갱신합니다.
+JOB_LOCK_LEASE_SECONDS = int(os.getenv('JOB_LOCK_LEASE_SECONDS', '60'))
+
+JOB_LOCK_KEY = 'lock:job:{}'
+JOB_LAST_RUN_KEY = 'job:last_run:{}'
+
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# 값이 자신의 ID일 때만 임대를 연장/해제합니다.
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_is_leader = False
+
+
+def is_leader():
+    return _is_leader
+
+
+def heartbeat():
+    """리더 임대를 획득하거나 갱신합니다. 스케줄러가 LEADER_RENEW_SECONDS마다 호출합니다."""
+    global _is_leader
+    if not redis_client:
+        return False
+    was_leader = _is_leader
+    try:
+        lease_ms = LEADER_LEASE_SECONDS * 1000
+        if redis_client.eval(_RENEW_SCRIPT, 1, LEADER_KEY, INSTANCE_ID, lease_ms):
+            _is_leader = True
+        else:
+            _is_leader = bool(redis_client.set(LEADER_KEY, INSTANCE_ID, nx=True, px=lease_ms))
+    except Exception as e:
+        # Redis와 통신할 수 없으면 다른 워커가 이어받을 수 있도록 리더가 아닌 것으로 간주합니다.
+        logger.error(f"LEADER: Heartbeat failed: {e}")
+        _is_leader = False
+
+    if _is_leader != was_leader:
+        logger.info(f"LEADER: {INSTANCE_ID} {'acquired' if _is_leader else 'lost'} scheduler leadership.")
+    return _is_leader
+
+
+def release():
+    """프로세스 종료 시 리더 임대를 반납하여 다른 워커가 즉시 이어받을 수 있게 합니다."""
+    global _is_leader
+    if not redis_client or not _is_leader:
+        return
+    try:
+        redis_client.eval(_RELEASE_SCRIPT, 1, LEADER_KEY, INSTANCE_ID)
+    except Exception as e:
+        logger.warning(f"LEADER: Could not release leadership: {e}")
+    _is_leader = False
+
+
+@contextmanager
+def job_lock(job_id):
+    """
+    작업별 락을 획득합니다. 획득하지 못하면 False를 넘겨줍니다.
+    실행 중에는 백그라운드 스레드가 임대를 갱신하므로 작업 시간이 임대 시간보다 길어도 됩니다.
+    """
+    lock = redis_client.lock(JOB_LOCK_KEY.format(job_id), timeout=JOB_LOCK_LEASE_SECONDS, thread_local=False)
+    if not lock.acquire(blocking=False):
+        yield False
+        return
+
+    done = threading.Event()
+
+    def _renew():
+        while not done.wait(JOB_LOCK_LEASE_SECONDS / 3):
+            try:
+                lock.reacquire()
+            except Exception as e:
+                logger.error(f"LEADER: Could not renew lock for job '{job_id}': {e}")
+                return
+
+    renewer = threading.Thread(target=_renew, name=f"job-lock-{job_id}", daemon=True)
+    renewer.start()
+    try:
+        yield True
+    finally:
+        done.set()
+        try:
+            lock.release()
+        except Exception as e:
+            logger.warning(f"LEADER: Lock for job '{job_id}' was lost before release: {e}")
+
+
+def last_run(job_id):
+    """작업이 마지막으로 성공한 실행의 시작 시각(UTC)을 반환합니다. 기록이 없으면 None."""
+    raw = redis_client.get(JOB_LAST_RUN_KEY.format(job_id))
+    try:
+        return datetime.fromisoformat(raw) if raw else None
+    except ValueError:
+        return None
+
+
+def is_fresh(job_id, interval, cache_key):
+    """작업이 interval 안에 성공했고 결과 캐시 키가 존재하면 True."""
+    ran_at = last_run(job_id)
+    if not ran_at or datetime.now(timezone.utc) - ran_at >= interval * 0.9:
+        return False
+    return bool(redis_client.exists(cache_key))
+
+
+def run_if_leader(job_id, func, interval, cache_key):
+    """
+    리더인 경우에만, 그리고 이번 주기에 아직 실행되지 않았을 때만 작업을 실행합니다.
+    - interval: 작업 주기(timedelta)
+    - cache_key: 작업이 만드는 캐시 키. 키가 사라졌다면 주기와 상관없이 다시 실행합니다.
+    반환값: 실제로 실행했으면 True
+    """
+    if not redis_client:
+        func()
+        return True
+    if not (_is_leader or heartbeat()):
+        logger.info(f"LEADER: Skipping '{job_id}', this worker is not the leader.")
+        return False
+    if is_fresh(job_id, interval, cache_key):
+        logger.info(f"LEADER: Skipping '{job_id}', cache is still fresh.")
+        return False
+
+    if not run_locked(job_id, func, interval):
+        logger.info(f"LEADER: Skipping '{job_id}', another process is running it.")
+        return False
+    return True
+
+
+def run_locked(job_id, func, interval):
+    """
+    작업별 락을 얻은 경우에만 작업을 실행하고 실행 시각을 기록합니다. 리더 여부는 확인하지 않습니다.
+    반환값: 실행했으면 True, 다른 프로세스가 실행 중이면 False
+    """
+    with job_lock(job_id) as acquired:
+        if not acquired:
+            return False
+        # 시작 시각을 기록하여 작업 소요 시간과 관계없이 다음 주기에 다시 실행되도록 합니다.
+        started_at = datetime.now(timezone.utc)
+        try:
+            with metrics.timer('cache_job_seconds', job=job_id):
+                func()
+        except Exception:
+            metrics.inc('cache_job_runs', job=job_id, outcome='error')
+            raise
+        metrics.inc('cache_job_runs', job=job_id, outcome='ok')
+        redis_client.set(JOB_LAST_RUN_KEY.format(job_id), started_at.isoformat(), ex=interval * 2)
+    return True
+
+
+def leader_job(job_id, func, interval, cache_key):
+    """스케줄러에 등록할 수 있도록 run_if_leader를 감싼 함수를 만듭니다."""
+    def _job():
+        run_if_leader(job_id, func, interval, cache_key)
+    _job.__name__ = f"leader_{job_id}"
+    return _job
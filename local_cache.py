@@ -0,0 +1,119 @@
+# local_cache.py
+"""
+워커 프로세스 내에 디코딩된 캐시 객체를 보관하는 저장소입니다.
+캐시 작업이 Redis의 세대(generation) 번호를 올리면 해당 네임스페이스의 항목이 무효화됩니다.
+"""
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict, Counter
+
+from extensions import redis_client
+
+logger = logging.getLogger(__name__)
+
+# 네임스페이스('news', 'reports')별 세대 번호를 저장하는 해시
+CACHE_GENERATION_KEY = 'cache:generation'
+# 메모리 상한: 원본 페이로드 크기(bytes)의 합과 항목 수로 제한합니다.
+LOCAL_CACHE_MAX_BYTES = int(os.getenv('LOCAL_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv('LOCAL_CACHE_MAX_ENTRIES', '256'))
+# 세대 번호 확인 주기(초). 이 주기 안에서는 Redis 조회 없이 dict 조회만 수행합니다.
+LOCAL_CACHE_CHECK_INTERVAL = float(os.getenv('LOCAL_CACHE_CHECK_INTERVAL', '1.0'))
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # key -> (generation, value, size)
+_total_size = 0
+_generations = {}
+_generations_checked_at = 0.0
+_stats = Counter()
+
+
+def bump_generation(*namespaces):
+    """캐시 작업이 데이터를 갱신한 뒤 호출하여 모든 워커의 해당 네임스페이스 항목을 무효화합니다."""
+    if not redis_client: return
+    try:
+        pipe = redis_client.pipeline()
+        for namespace in namespaces:
+            pipe.hincrby(CACHE_GENERATION_KEY, namespace, 1)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"LOCAL_CACHE: Could not bump generation for {namespaces}: {e}")
+
+
+def _current_generations():
+    global _generations, _generations_checked_at
+    now = time.monotonic()
+    if now - _generations_checked_at >= LOCAL_CACHE_CHECK_INTERVAL:
+        try:
+            _generations = redis_client.hgetall(CACHE_GENERATION_KEY)
+            _stats['generation_checks'] += 1
+        except Exception as e:
+            # Redis 오류 시에는 알고 있는 세대로 계속 제공합니다.
+            logger.warning(f"LOCAL_CACHE: Could not read cache generations: {e}")
+        _generations_checked_at = now
+    return _generations
+
+
+def _evict():
+    global _total_size
+    while _entries and (len(_entries) > LOCAL_CACHE_MAX_ENTRIES or _total_size > LOCAL_CACHE_MAX_BYTES):
+        _, (_, _, size) = _entries.popitem(last=False)
+        _total_size -= size
+        _stats['evictions'] += 1
+
+
+def get(namespace, key, loader):
+    """
+    캐시된 객체를 반환합니다. 없거나 세대가 바뀌었으면 loader()를 호출해 다시 채웁니다.
+    - loader: (value, size) 튜플을 반환하는 함수. value가 None이면 캐시하지 않습니다.
+    - 반환된 객체는 여러 요청이 공유하므로 호출하는 쪽에서 수정하면 안 됩니다.
+    """
+    if not redis_client:
+        return loader()[0]
+
+    generation = _current_generations().get(namespace, '0')
+    cache_key = f"{namespace}:{key}"
+    with _lock:
+        entry = _entries.get(cache_key)
+        if entry and entry[0] == generation:
+            _entries.move_to_end(cache_key)
+            _stats['hits'] += 1
+            return entry[1]
+        _stats['refreshes' if entry else 'misses'] += 1
+
+    value, size = loader()
+    if value is None or size > LOCAL_CACHE_MAX_BYTES:
+        return value
+
+    global _total_size
+    with _lock:
+        previous = _entries.pop(cache_key, None)
+        if previous:
+            _total_size -= previous[2]
+        _entries[cache_key] = (generation, value, size)
+        _total_size += size
+        _evict()
+    return value
+
+
+def discard(namespace, key):
+    """이 워커의 항목 하나를 제거합니다. (다른 워커는 세대 번호로 무효화됩니다)"""
+    global _total_size
+    with _lock:
+        entry = _entries.pop(f"{namespace}:{key}", None)
+        if entry:
+            _total_size -= entry[2]
+
+
+def clear():
+    global _total_size
+    with _lock:
+        _entries.clear()
+        _total_size = 0
+
+
+def stats():
+    """적중/실패/갱신 횟수와 현재 사용량을 반환합니다."""
+    with _lock:
+        return dict(_stats, entries=len(_entries), size_bytes=_total_size)
@@ -0,0 +1,387 @@
+# metrics.py
+"""
+가벼운 계측 계층: 카운터/히스토그램, Prometheus 형식 /metrics, 요청별 Server-Timing 헤더.
+METRICS_ENABLED=1일 때만 동작합니다. 꺼져 있으면 timer()는 아무 일도 하지 않는 공용 객체를 반환하고,
+timed()는 함수를 그대로 돌려주며, Redis 클라이언트와 Flask 훅도 설치되지 않으므로 비용이 없습니다.
+
+gunicorn 워커마다 값이 따로 쌓이므로 각 워커는 METRICS_FLUSH_SECONDS마다 자신의 값을 METRICS_DIR/{pid}-{시작 시각}.json에 쓰고,
+/metrics는 같은 호스트의 모든 워커 파일(cache_worker.py 포함)을 합산해 응답합니다.
+종료된 워커의 파일은 카운터/히스토그램 값을 누적 파일(_exited.json)에 더한 뒤 지우므로 값이 줄어들지 않고,
+파일 이름에 시작 시각이 있어 pid가 재사용되어도 이전 워커의 파일을 덮어쓰지 않습니다. 게이지는 살아 있는 워커의 값만 보여줍니다.
+
+이 모듈은 토큰화 프로세스 풀의 자식 프로세스에서도 import되므로 Flask, Redis를 import 시점에 가져오지 않습니다.
+"""
+import os
+import json
+import time
+import atexit
+import logging
+import tempfile
+import threading
+import contextvars
+from functools import wraps
+
+try:
+    import fcntl  # 종료된 워커 파일을 병합할 때 워커 간 잠금에 사용 (POSIX)
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '0') == '1'
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'earthguardian-metrics'))
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '10'))
+# 설정하면 /metrics 요청에 'Authorization: Bearer <토큰>'을 요구합니다.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+PREFIX = 'earthguardian_'
+# 종료된 워커들의 카운터/히스토그램 누적 파일과 병합 잠금 파일
+EXITED_FILE = '_exited.json'
+_MERGE_LOCK_FILE = '.merge.lock'
+# 초 단위 히스토그램 구간
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+HELP = {
+    'redis_command_seconds': 'Redis command latency (PIPELINE = one pipeline round trip).',
+    'redis_pipeline_commands': 'Commands sent in pipelines.',
+    'decode_seconds': 'Time spent decoding cached blobs and news items.',
+    'tokenize_seconds': 'Time spent tokenizing article text.',
+    'categorize_seconds': 'Time spent classifying articles.',
+    'template_render_seconds': 'Jinja template rendering time.',
+    'cache_job_seconds': 'Cache job duration.',
+    'cache_job_stage_seconds': 'Cache job stage duration.',
+    'cache_job_runs': 'Cache job runs by outcome.',
+    'http_request_seconds': 'HTTP request duration by endpoint.',
+}
+# 요청별 Server-Timing에 합산할 히스토그램과 헤더 이름
+SERVER_TIMING_NAMES = {
+    'redis_command_seconds': 'redis',
+    'decode_seconds': 'decode',
+    'template_render_seconds': 'render',
+    'tokenize_seconds': 'tokenize',
+    'categorize_seconds': 'categorize',
+}
+
+_lock = threading.Lock()
+_counters = {}    # (이름, 레이블 튜플) -> 값
+_histograms = {}  # (이름, 레이블 튜플) -> [구간별 개수..., +Inf 개수, 합계]
+_collectors = []  # 스크레이프/flush 시점에 (이름, 레이블 dict, 값) 게이지 목록을 반환하는 함수
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+_flusher = None
+# 같은 pid가 재사용되어도 파일이 겹치지 않도록 프로세스 시작 시각을 파일 이름에 넣습니다.
+_started_ms = int(time.time() * 1000)
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    if not METRICS_ENABLED: return
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+    _ensure_flusher()
+
+
+def observe(name, seconds, **labels):
+    """히스토그램에 값을 기록하고, 요청 처리 중이면 Server-Timing 합계에도 더합니다."""
+    if not METRICS_ENABLED: return
+    key = (name, _labels(labels))
+    index = next((i for i, bound in enumerate(BUCKETS) if seconds <= bound), len(BUCKETS))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * (len(BUCKETS) + 2)
+        hist[index] += 1
+        hist[-1] += seconds
+    timings = _request_timings.get()
+    if timings is not None and name in SERVER_TIMING_NAMES:
+        entry = timings.setdefault(SERVER_TIMING_NAMES[name], [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    _ensure_flusher()
+
+
+class _Timer:
+    __slots__ = ('name', 'labels', 'start')
+
+    def __init__(self, name, labels):
+        self.name, self.labels = name, labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name, **labels):
+    """with 블록의 실행 시간을 히스토그램에 기록합니다. 비활성화되어 있으면 공용 no-op 객체를 반환합니다."""
+    return _Timer(name, labels) if METRICS_ENABLED else _NULL_TIMER
+
+
+def timed(name, **labels):
+    """함수 실행 시간을 기록하는 데코레이터. 비활성화되어 있으면 함수를 그대로 반환합니다."""
+    def decorator(func):
+        if not METRICS_ENABLED:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(name, labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def register_collector(func):
+    """스크레이프 시점의 게이지 값을 제공하는 함수를 등록합니다. func() -> [(이름, 레이블 dict, 값), ...]"""
+    if METRICS_ENABLED:
+        _collectors.append(func)
+
+
+# --- 워커 간 합산 ---
+
+def _snapshot():
+    gauges = []
+    for collector in _collectors:
+        try:
+            gauges.extend([name, labels, value] for name, labels, value in collector())
+        except Exception as e:
+            logger.warning(f"METRICS: Collector failed: {e}")
+    with _lock:
+        return {
+            'pid': os.getpid(),
+            'started_ms': _started_ms,
+            'counters': [[name, dict(labels), value] for (name, labels), value in _counters.items()],
+            'histograms': [[name, dict(labels), list(hist)] for (name, labels), hist in _histograms.items()],
+            'gauges': gauges,
+        }
+
+
+def flush():
+    """이 워커의 값을 METRICS_DIR/{pid}-{시작 시각}.json에 씁니다."""
+    if not METRICS_ENABLED: return
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        _write_json(os.path.join(METRICS_DIR, f"{os.getpid()}-{_started_ms}.json"), _snapshot())
+    except OSError as e:
+        logger.warning(f"METRICS: Could not write metrics file: {e}")
+
+
+def _write_json(path, data):
+    """임시 파일에 쓴 뒤 교체하여 읽는 쪽이 쓰다 만 파일을 보지 않도록 합니다."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(METRICS_FLUSH_SECONDS)
+        flush()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None: return
+    with _lock:
+        if _flusher is not None: return
+        _flusher = threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True)
+    _flusher.start()
+    atexit.register(flush)
+    # 이전에 종료된 워커(재시작 전 워커 등)의 파일을 정리합니다.
+    merge_exited()
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _worker_files():
+    """워커 파일 이름 목록 (누적 파일과 임시 파일 제외)"""
+    try:
+        return [n for n in os.listdir(METRICS_DIR) if n.endswith('.json') and n != EXITED_FILE]
+    except OSError:
+        return []
+
+
+def _add_snapshot(counters, histograms, snapshot):
+    for name, labels, value in snapshot.get('counters', []):
+        key = (name, _labels(labels))
+        counters[key] = counters.get(key, 0) + value
+    for name, labels, hist in snapshot.get('histograms', []):
+        key = (name, _labels(labels))
+        total = histograms.setdefault(key, [0] * len(hist))
+        for i, value in enumerate(hist):
+            total[i] += value
+
+
+def _as_snapshot(counters, histograms):
+    return {
+        'counters': [[name, dict(labels), value] for (name, labels), value in counters.items()],
+        'histograms': [[name, dict(labels), hist] for (name, labels), hist in histograms.items()],
+    }
+
+
+def merge_exited():
+    """
+    종료된 워커의 파일을 누적 파일에 더한 뒤 지웁니다. 반환값: 병합한 파일 수
+    누적 파일에 병합한 파일 이름을 함께 기록하므로, 지우기 전에 중단되거나 읽는 쪽이 그 사이에 읽어도 두 번 합산되지 않습니다.
+    """
+    if not METRICS_ENABLED or fcntl is None: return 0
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        with open(os.path.join(METRICS_DIR, _MERGE_LOCK_FILE), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            exited_path = os.path.join(METRICS_DIR, EXITED_FILE)
+            exited = _read_json(exited_path) or {}
+            merged = set(exited.get('merged', []))
+            files = _worker_files()
+            dead = []
+            for file_name in files:
+                if file_name in merged: continue
+                snapshot = _read_json(os.path.join(METRICS_DIR, file_name))
+                if snapshot is not None and not _pid_alive(snapshot.get('pid', 0)):
+                    dead.append((file_name, snapshot))
+            if dead:
+                counters, histograms = {}, {}
+                _add_snapshot(counters, histograms, exited)
+                for _, snapshot in dead:
+                    _add_snapshot(counters, histograms, snapshot)
+                # 아직 지우지 못한 파일 이름만 남깁니다.
+                exited = dict(_as_snapshot(counters, histograms), merged=sorted((merged & set(files)) | {n for n, _ in dead}))
+                _write_json(exited_path, exited)
+            for file_name in set(exited.get('merged', [])) & set(files):
+                try:
+                    os.remove(os.path.join(METRICS_DIR, file_name))
+                except OSError:
+                    pass
+            return len(dead)
+    except OSError as e:
+        logger.warning(f"METRICS: Could not merge exited worker files: {e}")
+        return 0
+
+
+def _collect_all():
+    """모든 워커 파일, 종료된 워커의 누적값, 이 워커의 현재 값을 합산합니다."""
+    flush()
+    merge_exited()
+    counters, histograms, gauges = {}, {}, []
+    # 워커 파일을 먼저 읽고 누적 파일을 나중에 읽어야, 그 사이에 병합된 파일을 빠뜨리거나 두 번 더하지 않습니다.
+    snapshots = [(n, _read_json(os.path.join(METRICS_DIR, n))) for n in _worker_files()]
+    exited = _read_json(os.path.join(METRICS_DIR, EXITED_FILE)) or {}
+    merged = set(exited.get('merged', []))
+    _add_snapshot(counters, histograms, exited)
+    for file_name, snapshot in snapshots:
+        if snapshot is None or file_name in merged: continue
+        _add_snapshot(counters, histograms, snapshot)
+        if _pid_alive(snapshot.get('pid', 0)):
+            for name, labels, value in snapshot.get('gauges', []):
+                gauges.append((name, dict(labels, pid=str(snapshot['pid'])), value))
+    return counters, histograms, gauges
+
+
+def _format_labels(labels):
+    if not labels: return ''
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in labels)
+    return '{' + ','.join(escaped) + '}'
+
+
+def render_prometheus():
+    """Prometheus 텍스트 형식(0.0.4)으로 합산된 지표를 만듭니다."""
+    counters, histograms, gauges = _collect_all()
+    lines = []
+    for name in sorted({name for name, _ in counters}):
+        lines += [f"# HELP {PREFIX}{name}_total {HELP.get(name, name)}", f"# TYPE {PREFIX}{name}_total counter"]
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f"{PREFIX}{name}_total{_format_labels(labels)} {value}")
+    for name in sorted({name for name, _ in histograms}):
+        lines += [f"# HELP {PREFIX}{name} {HELP.get(name, name)}", f"# TYPE {PREFIX}{name} histogram"]
+        for (metric, labels), hist in sorted(histograms.items()):
+            if metric != name: continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ('+Inf',), hist[:-1]):
+                cumulative += count
+                lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {hist[-1]}")
+            lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {cumulative}")
+    for name in sorted({name for name, _, _ in gauges}):
+        lines.append(f"# TYPE {PREFIX}{name} gauge")
+        for metric, labels, value in gauges:
+            if metric == name:
+                lines.append(f"{PREFIX}{name}{_format_labels(_labels(labels))} {value}")
+    return '\n'.join(lines) + '\n'
+
+
+# --- Flask ---
+
+def init_app(app):
+    """요청 시간 측정, Server-Timing 헤더, 템플릿 렌더링 측정, /metrics 라우트를 설치합니다. 비활성화되어 있으면 아무것도 하지 않습니다."""
+    if not METRICS_ENABLED: return
+    from flask import Response, request
+    from jinja2 import Template
+
+    class TimedTemplate(Template):
+        def render(self, *args, **kwargs):
+            with _Timer('template_render_seconds', {'template': self.name or ''}):
+                return super().render(*args, **kwargs)
+
+    app.jinja_env.template_class = TimedTemplate
+
+    @app.before_request
+    def _start_request_timing():
+        request.environ['metrics.start'] = time.perf_counter()
+        request.environ['metrics.token'] = _request_timings.set({})
+
+    @app.after_request
+    def _finish_request_timing(response):
+        start = request.environ.get('metrics.start')
+        if start is None:
+            return response
+        total = time.perf_counter() - start
+        timings = _request_timings.get() or {}
+        _request_timings.reset(request.environ.pop('metrics.token'))
+        observe('http_request_seconds', total, endpoint=request.endpoint or 'unknown', method=request.method,
+                status=str(response.status_code))
+        parts = [f'{name};dur={seconds * 1000:.2f};desc="{count}"' for name, (seconds, count) in sorted(timings.items())]
+        parts.append(f'total;dur={total * 1000:.2f}')
+        response.headers.add('Server-Timing', ', '.join(parts))
+        return response
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        if METRICS_TOKEN and request.headers.get('Authorization') != f'Bearer {METRICS_TOKEN}':
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
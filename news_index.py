@@ -0,0 +1,196 @@
+# news_index.py
+"""
+뉴스 보조 인덱스: 원본 news-YYYYMMDD-NNN 키를 조건별 Sorted Set으로 찾을 수 있게 합니다.
+  idx:news:all                  전체 기사
+  idx:news:category:{cat_id}    카테고리별
+  idx:news:source:{source}      소스별
+  idx:news:country:{country}    국가별
+  member=원본 키, score=YYYYMMDD * 1000 + NNN (캐시의 최신순 정렬과 같은 순서)
+  idx:news:meta (hash)          원본 키 -> 색인된 'cat_id|source|country' (항목이 바뀌면 이전 인덱스에서 제거하기 위함)
+  idx:news:sources (set)        소스 목록
+
+/news/의 카테고리/소스 필터와 정렬은 ZINTERSTORE와 범위 조회로 처리되어 요청한 페이지의 키만 읽습니다.
+인덱스는 뉴스 캐시 작업이 갱신하며, `python cache_worker.py --rebuild-news-index`로 다시 만들 수 있습니다.
+"""
+import hashlib
+import logging
+from itertools import islice
+
+from extensions import redis_client
+
+logger = logging.getLogger(__name__)
+
+INDEX_PREFIX = 'idx:news:'
+ALL_KEY = 'idx:news:all'
+META_KEY = 'idx:news:meta'
+SOURCES_KEY = 'idx:news:sources'
+FACET_KEY = 'idx:news:{}:{}'
+QUERY_KEY = 'idx:news:query:{}'
+REBUILD_PREFIX = 'idx:rebuild:'
+FACETS = ('category', 'source', 'country')
+# 교집합 결과를 보관하는 시간(초). 같은 필터 조합의 다음 페이지 요청은 교집합을 다시 계산하지 않습니다.
+QUERY_TTL_SECONDS = 60
+_BATCH_SIZE = 1000
+
+
+def score_for_key(key):
+    """news-YYYYMMDD-NNN 키를 정렬 점수로 변환합니다."""
+    _, date_part, seq = key.split('-')
+    return int(date_part) * 1000 + int(seq)
+
+
+def _meta(entry):
+    return '|'.join(entry.get(facet) or '' for facet in FACETS)
+
+
+def _facet_keys(meta):
+    """'cat_id|source|country' 메타 문자열이 속하는 facet 인덱스 키 목록."""
+    return [FACET_KEY.format(facet, value) for facet, value in zip(FACETS, meta.split('|')) if value]
+
+
+def index_news(entries):
+    """
+    기사들을 인덱스에 추가하거나 갱신합니다.
+    entries: [{'key': 원본 키, 'category': cat_id, 'source': ..., 'country': ...}, ...]
+    """
+    entries = [e for e in entries if e.get('key')]
+    for start in range(0, len(entries), _BATCH_SIZE):
+        batch = entries[start:start + _BATCH_SIZE]
+        previous = redis_client.hmget(META_KEY, [e['key'] for e in batch])
+        pipe = redis_client.pipeline(transaction=False)
+        for entry, old_meta in zip(batch, previous):
+            key, meta = entry['key'], _meta(entry)
+            score = score_for_key(key)
+            if old_meta and old_meta != meta:
+                for old_key in set(_facet_keys(old_meta)) - set(_facet_keys(meta)):
+                    pipe.zrem(old_key, key)
+            pipe.zadd(ALL_KEY, {key: score})
+            for facet_key in _facet_keys(meta):
+                pipe.zadd(facet_key, {key: score})
+            pipe.hset(META_KEY, key, meta)
+            if entry.get('source'):
+                pipe.sadd(SOURCES_KEY, entry['source'])
+        pipe.execute()
+    return len(entries)
+
+
+def rebuild(entries):
+    """
+    전체 기사 목록으로 인덱스를 새로 만듭니다.
+    임시 키에 모두 쓴 뒤 하나의 트랜잭션에서 RENAME하고, 새 목록에 없는 이전 인덱스 키는 삭제합니다.
+    """
+    # 이전에 중단된 재구성의 임시 키가 남아 있으면 지웁니다.
+    for tmp_key in redis_client.scan_iter(match=f"{REBUILD_PREFIX}*", count=1000):
+        redis_client.delete(tmp_key)
+    staged = {}  # 최종 키 -> 임시 키
+    meta = {}
+    sources = set()
+    # entries는 제너레이터일 수 있으므로 목록으로 만들지 않고 _BATCH_SIZE개씩 읽어 씁니다.
+    entries = (e for e in entries if e.get('key'))
+    while batch := list(islice(entries, _BATCH_SIZE)):
+        pipe = redis_client.pipeline(transaction=False)
+        for entry in batch:
+            key, entry_meta = entry['key'], _meta(entry)
+            score = score_for_key(key)
+            for final_key in [ALL_KEY] + _facet_keys(entry_meta):
+                pipe.zadd(staged.setdefault(final_key, REBUILD_PREFIX + final_key), {key: score})
+            meta[key] = entry_meta
+            if entry.get('source'):
+                sources.add(entry['source'])
+        pipe.execute()
+
+    old_keys = set(redis_client.scan_iter(match=f"{INDEX_PREFIX}*", count=1000))
+    pipe = redis_client.pipeline(transaction=True)
+    for old_key in old_keys - set(staged):
+        pipe.delete(old_key)
+    for final_key, tmp_key in staged.items():
+        pipe.rename(tmp_key, final_key)
+    if meta:
+        pipe.hset(META_KEY, mapping=meta)
+    if sources:
+        pipe.sadd(SOURCES_KEY, *sources)
+    pipe.execute()
+    logger.info(f"NEWS_INDEX: Rebuilt index with {len(meta)} articles in {len(staged)} sorted sets.")
+    return len(meta)
+
+
+def is_built():
+    return bool(redis_client.exists(ALL_KEY))
+
+
+def sources():
+    """색인된 소스 목록(정렬됨)."""
+    return sorted(redis_client.smembers(SOURCES_KEY))
+
+
+def _filter_keys(category=None, source=None, country=None):
+    """필터 조합에 해당하는 Sorted Set 키 목록."""
+    keys = [FACET_KEY.format(facet, value) for facet, value in
+            (('category', category), ('source', source), ('country', country)) if value]
+    return keys or [ALL_KEY]
+
+
+def query(category=None, source=None, country=None, sort='newest', cursor=None, limit=20):
+    """
+    필터 조건에 맞는 기사 키를 정렬 순서대로 cursor 다음부터 limit개 반환합니다.
+    반환값: (키 목록, 다음 cursor 또는 None, 전체 개수)
+    조건이 두 개 이상이면 ZINTERSTORE로 교집합을 만들어 잠시 보관하고 그 범위만 읽습니다.
+    """
+    return query_many([{'category': category, 'source': source, 'country': country}], sort, cursor, limit)[0]
+
+
+def query_many(filters, sort='newest', cursor=None, limit=20):
+    """
+    여러 필터 조합(예: 카테고리별 목록)을 한 번의 파이프라인으로 조회합니다. 반환값: [(키 목록, 다음 cursor, 전체 개수), ...]
+    cursor는 마지막으로 받은 기사의 점수이므로, 그 사이 새 기사가 추가되어도 다음 페이지가 밀리거나 중복되지 않습니다.
+    보관된 교집합이 없는 조합만 두 번째 파이프라인에서 교집합을 만들어 다시 읽습니다.
+    """
+    targets = []
+    for f in filters:
+        keys = _filter_keys(f.get('category'), f.get('source'), f.get('country'))
+        if len(keys) == 1:
+            targets.append((keys[0], None))
+        else:
+            targets.append((QUERY_KEY.format(hashlib.sha1('\n'.join(keys).encode('utf-8')).hexdigest()), keys))
+
+    pipe = redis_client.pipeline(transaction=False)
+    for target, keys in targets:
+        if keys:
+            pipe.exists(target)
+        _queue_range(pipe, target, sort, cursor, limit)
+    results = iter(pipe.execute())
+
+    pages, missing = [], []
+    for i, (target, keys) in enumerate(targets):
+        exists = next(results) if keys else True
+        pages.append(_page(next(results), next(results), limit))
+        if not exists:
+            missing.append(i)
+
+    if missing:
+        pipe = redis_client.pipeline(transaction=False)
+        for i in missing:
+            target, keys = targets[i]
+            # 모든 인덱스의 점수가 같으므로 MAX로 합쳐도 점수가 유지됩니다.
+            pipe.zinterstore(target, keys, aggregate='MAX')
+            pipe.expire(target, QUERY_TTL_SECONDS)
+            _queue_range(pipe, target, sort, cursor, limit)
+        results = iter(pipe.execute())
+        for i in missing:
+            next(results), next(results)
+            pages[i] = _page(next(results), next(results), limit)
+    return pages
+
+
+def _queue_range(pipe, key, sort, cursor, limit):
+    # 다음 페이지가 있는지 알기 위해 하나 더 읽습니다.
+    if sort == 'oldest':
+        pipe.zrangebyscore(key, f'({cursor}' if cursor is not None else '-inf', '+inf', start=0, num=limit + 1, withscores=True)
+    else:
+        pipe.zrevrangebyscore(key, f'({cursor}' if cursor is not None else '+inf', '-inf', start=0, num=limit + 1, withscores=True)
+    pipe.zcard(key)
+
+
+def _page(rows, total, limit):
+    next_cursor = int(rows[limit - 1][1]) if len(rows) > limit else None
+    return [key for key, _ in rows[:limit]], next_cursor, total
@@ -0,0 +1,72 @@
+# profiler.py
+"""
+현재 프로세스의 샘플링 프로파일러.
+sample()을 호출한 동안만 별도 스레드 없이 sys._current_frames()로 모든 스레드(요청 스레드, APScheduler 작업 스레드 등)의
+스택을 주기적으로 읽어 모으고, 호출이 끝나면 아무것도 남기지 않으므로 평소에는 비용이 없습니다.
+결과는 flamegraph.pl, speedscope 등에서 읽을 수 있는 collapsed stack 형식입니다: "스레드;바깥 함수;...;안쪽 함수 샘플 수"
+"""
+import os
+import sys
+import time
+import threading
+from collections import Counter
+
+# 한 번에 프로파일링할 수 있는 최대 시간(초). gunicorn 워커 타임아웃(기본 30초)보다 짧아야 합니다.
+PROFILE_MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '20'))
+PROFILE_MIN_INTERVAL = 0.001
+
+_profile_lock = threading.Lock()
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _frame_name(frame, lines):
+    code = frame.f_code
+    filename = code.co_filename
+    # 이 저장소의 파일은 상대 경로로, 라이브러리는 파일 이름만 표시합니다.
+    filename = os.path.relpath(filename, _ROOT) if filename.startswith(_ROOT) else os.path.basename(filename)
+    location = f"{filename}:{frame.f_lineno}" if lines else filename
+    return f"{code.co_name} ({location})".replace(';', ':')
+
+
+def _stack(frame, lines):
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame, lines))
+        frame = frame.f_back
+    names.reverse()
+    return names
+
+
+def sample(seconds, interval=0.01, thread_filter=None, lines=False):
+    """
+    seconds초 동안 interval초마다 이 프로세스의 모든 스레드(호출한 스레드 제외) 스택을 수집합니다.
+    thread_filter가 주어지면 이름에 그 문자열이 포함된 스레드만 수집하고, lines=True이면 프레임에 줄 번호를 포함합니다.
+    반환값: (collapsed stack Counter, 샘플링 횟수). 다른 프로파일이 실행 중이면 None
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        seconds = min(max(seconds, 0.0), PROFILE_MAX_SECONDS)
+        # 샘플링 간격이 프로파일 시간보다 길면 잠든 동안 워커와 잠금을 붙잡게 되므로 seconds로 제한합니다.
+        interval = min(max(interval, PROFILE_MIN_INTERVAL), max(seconds, PROFILE_MIN_INTERVAL))
+        own_ident = threading.get_ident()
+        stacks = Counter()
+        ticks = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident: continue
+                thread_name = thread_names.get(ident, f"thread-{ident}")
+                if thread_filter and thread_filter not in thread_name: continue
+                stacks[';'.join([thread_name.replace(';', ':')] + _stack(frame, lines))] += 1
+            ticks += 1
+            time.sleep(interval)
+        return stacks, ticks
+    finally:
+        _profile_lock.release()
+
+
+def collapsed(stacks):
+    """Counter를 collapsed stack 텍스트로 만듭니다. (샘플이 많은 스택부터)"""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
@@ -0,0 +1,192 @@
+# redis_pool.py
+"""
+프로세스 공용 Redis 연결 풀과 클라이언트 팩토리.
+하나의 BlockingConnectionPool 위에 문자열 응답(decode_responses=True) 클라이언트와
+bytes 응답 클라이언트를 함께 만들어, 요청마다 새 TCP 연결을 여는 일이 없도록 합니다.
+
+- 풀 크기/대기 시간/소켓 타임아웃/유휴 연결 헬스 체크/재시도(지수 백오프 + 지터)는 환경 변수로 설정합니다.
+- pool_stats()로 사용 중 연결 수, 대기 횟수, 오류/재시도 횟수를 확인할 수 있습니다.
+- METRICS_ENABLED=1이면 명령별 지연 시간과 파이프라인 크기를 metrics에 기록하는 클라이언트를 만듭니다.
+"""
+import os
+import time
+import logging
+import threading
+
+import redis
+from redis.backoff import EqualJitterBackoff
+from redis.client import EMPTY_RESPONSE, Pipeline
+from redis.connection import BlockingConnectionPool
+from redis.retry import Retry
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+# 프로세스당 최대 연결 수. 모두 사용 중이면 REDIS_POOL_TIMEOUT초 동안 반납을 기다립니다.
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', '32'))
+REDIS_POOL_TIMEOUT = float(os.getenv('REDIS_POOL_TIMEOUT', '5'))
+REDIS_SOCKET_TIMEOUT = float(os.getenv('REDIS_SOCKET_TIMEOUT', '5'))
+REDIS_CONNECT_TIMEOUT = float(os.getenv('REDIS_CONNECT_TIMEOUT', '2'))
+# 이 시간(초) 이상 사용되지 않은 연결은 명령 전에 PING으로 확인합니다. 0이면 확인하지 않음
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', '30'))
+# 연결 오류/타임아웃 시 재시도 횟수와 백오프(초)
+REDIS_RETRIES = int(os.getenv('REDIS_RETRIES', '3'))
+REDIS_BACKOFF_BASE = float(os.getenv('REDIS_BACKOFF_BASE', '0.05'))
+REDIS_BACKOFF_CAP = float(os.getenv('REDIS_BACKOFF_CAP', '1.0'))
+
+_stats_lock = threading.Lock()
+_stats = {'checkouts': 0, 'waits': 0, 'wait_seconds': 0.0, 'checkout_errors': 0, 'command_errors': 0, 'retries': 0}
+
+
+def _count(**deltas):
+    with _stats_lock:
+        for name, delta in deltas.items():
+            _stats[name] += delta
+
+
+class MeteredConnectionPool(BlockingConnectionPool):
+    """연결 대여/대기/오류를 집계하는 BlockingConnectionPool."""
+
+    def get_connection(self, command_name, *keys, **options):
+        # 남은 슬롯이 없으면 다른 스레드의 반납을 기다리게 됩니다. (집계용이므로 경쟁 상태는 허용)
+        waited = self.pool.empty()
+        start = time.perf_counter()
+        try:
+            connection = super().get_connection(command_name, *keys, **options)
+        except Exception:
+            _count(checkout_errors=1, waits=int(waited), wait_seconds=time.perf_counter() - start)
+            raise
+        if waited:
+            _count(checkouts=1, waits=1, wait_seconds=time.perf_counter() - start)
+        else:
+            _count(checkouts=1)
+        return connection
+
+    def in_use(self):
+        """현재 대여 중인 연결 수."""
+        return self.max_connections - self.pool.qsize()
+
+
+class MeteredRetry(Retry):
+    """재시도와 최종 실패 횟수를 집계하는 Retry."""
+
+    def call_with_retry(self, do, fail):
+        def _fail(error):
+            _count(retries=1)
+            fail(error)
+        try:
+            return super().call_with_retry(do, _fail)
+        except self._supported_errors:
+            _count(command_errors=1)
+            raise
+
+
+def _parse_bytes_response(client, connection, command_name, **options):
+    """Redis.parse_response와 같지만 응답을 디코딩하지 않습니다."""
+    try:
+        response = connection.read_response(disable_decoding=True)
+    except redis.exceptions.ResponseError:
+        if EMPTY_RESPONSE in options:
+            return options[EMPTY_RESPONSE]
+        raise
+    if command_name in client.response_callbacks:
+        return client.response_callbacks[command_name](response, **options)
+    return response
+
+
+class BytesPipeline(Pipeline):
+    def parse_response(self, connection, command_name, **options):
+        result = _parse_bytes_response(self, connection, command_name, **options)
+        if command_name in self.UNWATCH_COMMANDS:
+            self.watching = False
+        elif command_name == 'WATCH':
+            self.watching = True
+        return result
+
+
+class BytesRedis(redis.Redis):
+    """
+    문자열 응답용 풀을 공유하면서 응답을 디코딩하지 않고 bytes로 돌려주는 클라이언트.
+    압축된 응답, 직렬화된 캐시 blob, pickle 리포트 등 바이너리 값을 읽을 때 사용합니다.
+    """
+
+    def parse_response(self, connection, command_name, **options):
+        return _parse_bytes_response(self, connection, command_name, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return BytesPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class _TimedCommands:
+    """명령 하나(= 왕복 한 번)의 지연 시간을 기록합니다."""
+
+    def execute_command(self, *args, **options):
+        with metrics.timer('redis_command_seconds', command=str(args[0]).upper()):
+            return super().execute_command(*args, **options)
+
+
+class _TimedPipelineExecute:
+    """파이프라인 전송(왕복 한 번)의 지연 시간과 명령 수를 기록합니다."""
+
+    def execute(self, raise_on_error=True):
+        metrics.inc('redis_pipeline_commands', len(self.command_stack))
+        with metrics.timer('redis_command_seconds', command='PIPELINE'):
+            return super().execute(raise_on_error)
+
+
+class TimedPipeline(_TimedPipelineExecute, Pipeline):
+    pass
+
+
+class TimedBytesPipeline(_TimedPipelineExecute, BytesPipeline):
+    pass
+
+
+class TimedRedis(_TimedCommands, redis.Redis):
+    def pipeline(self, transaction=True, shard_hint=None):
+        return TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class TimedBytesRedis(_TimedCommands, BytesRedis):
+    def pipeline(self, transaction=True, shard_hint=None):
+        return TimedBytesPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+def create_pool(url=None, **overrides):
+    """설정값으로 연결 풀을 만듭니다. overrides로 개별 설정을 덮어쓸 수 있습니다."""
+    options = dict(
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        socket_keepalive=True,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        retry_on_timeout=True,
+        retry_on_error=[redis.exceptions.ConnectionError],
+        retry=MeteredRetry(EqualJitterBackoff(cap=REDIS_BACKOFF_CAP, base=REDIS_BACKOFF_BASE), REDIS_RETRIES),
+        decode_responses=True,
+    )
+    options.update(overrides)
+    return MeteredConnectionPool.from_url(url or REDIS_URL, **options)
+
+
+def create_clients(pool):
+    """같은 풀을 공유하는 (문자열 클라이언트, bytes 클라이언트)를 반환합니다. 계측이 꺼져 있으면 기본 클라이언트를 그대로 씁니다."""
+    if metrics.METRICS_ENABLED:
+        return TimedRedis(connection_pool=pool), TimedBytesRedis(connection_pool=pool)
+    return redis.Redis(connection_pool=pool), BytesRedis(connection_pool=pool)
+
+
+def pool_stats(pool):
+    """풀 설정과 누적 지표를 반환합니다."""
+    with _stats_lock:
+        stats = dict(_stats)
+    if pool is not None:
+        stats.update(
+            max_connections=pool.max_connections,
+            in_use=pool.in_use(),
+            created=len(pool._connections),
+        )
+    return stats
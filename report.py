@@ -1,9 +1,5 @@
 # report.py
 
-import os
-import redis
-import pickle
-import re # 정규표현식 모듈 추가
 import datetime
 from flask import Blueprint, render_template, request, jsonify
 import logging
@@ -13,76 +9,24 @@ from datetime import timezone
 # 공용 redis_client와 scheduler를 import합니다.
 from extensions import redis_client, scheduler
 from services import get_cached_reports_data
+from responses import cached_response, store_report_response
+import report_catalog
+import report_render
 
 reports_bp = Blueprint('reports', __name__, url_prefix='/reports')
 logger = logging.getLogger(__name__)
 
 
 def get_redis_client():
-    redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
-    return redis.StrictRedis.from_url(redis_url, decode_responses=True)
-
-def linkify(text):
-    """
-    텍스트 내의 URL을 찾아서 <a> 태그로 변환하고, 줄바꿈을 <br>로 변경합니다.
-    괄호나 마침표가 URL 끝에 붙어 있으면 링크 밖으로 분리합니다.
-    """
-    if not isinstance(text, str):
-        return text
-
-    # URL 정규표현식 (괄호나 마침표는 URL에 포함되지 않도록 함)
-    url_pattern = re.compile(r'(https?://[^\s<>()]+)([).,!?]?)')
-
-    def replace_url(match):
-        url = match.group(1)
-        punctuation = match.group(2)
-        # URL을 링크로 변환하고, 붙어있던 문장 부호는 링크 바깥으로 둠
-        return f'<a href="{url}" class="text-blue-500 hover:text-blue-700">{url}</a>{punctuation}'
-
-    # URL 변환
-    linked_text = url_pattern.sub(replace_url, text)
-
-    # 줄바꿈 <br> 처리
-    return linked_text.replace('\n', '<br>')
-
-
+    """공용 연결 풀을 사용하는 문자열 클라이언트를 반환합니다. (요청마다 새 연결을 만들지 않음)"""
+    return redis_client
 
 def load_report_from_redis(key_name):
     """
-    Redis에서 저장된 리포트를 읽어 옵니다.
-    - pickle 직렬화된 경우: pickle.loads 후 linkify 처리
-    - JSON 형태일 경우: json.loads 후 linkify 처리
-    - 그 외 단순 텍스트라면 linkify 처리
+    렌더링된 리포트(URL 링크 변환, 줄바꿈 처리)를 반환합니다.
+    pickle/JSON/텍스트 형식 판별과 링크 변환은 report_render가 리포트마다 한 번만 수행하여 저장해 둡니다.
     """
-    client = get_redis_client()
-    raw = client.get(key_name)
-    if not raw:
-        return None
-
-    try:
-        text = raw.decode() if isinstance(raw, bytes) else raw
-    except Exception:
-        return None
-
-    # 1) pickle 시도
-    try:
-        data = pickle.loads(raw)
-        # pickle로 로드된 데이터가 문자열인 경우에만 linkify 적용
-        return linkify(data) if isinstance(data, str) else data
-    except Exception:
-        pass
-
-    # 2) JSON 시도
-    try:
-        import json
-        data = json.loads(text)
-        # JSON으로 로드된 데이터가 문자열인 경우에만 linkify 적용
-        return linkify(data) if isinstance(data, str) else data
-    except Exception:
-        pass
-
-    # 3) 단순 텍스트: linkify를 사용하여 URL 변환 및 줄바꿈 처리
-    return linkify(text)
+    return report_render.get(key_name)
 
 
 @reports_bp.route('/')
@@ -94,48 +38,40 @@ def reports_index():
     daily_page = request.args.get('daily_page', 1, type=int)
     weekly_page = request.args.get('weekly_page', 1, type=int)
     monthly_page = request.args.get('monthly_page', 1, type=int)
-    weekly_date = request.args.get('weekly_date')
     per_page = 20
 
     (
-        all_daily_dates, all_weekly_dates, all_monthly_dates,
+        _, _, _,
         latest_daily_report, latest_weekly_report, latest_monthly_report
     ) = get_cached_reports_data()
-    
-    if all_daily_dates is None: all_daily_dates = []
-    if all_weekly_dates is None: all_weekly_dates = []
-    if all_monthly_dates is None: all_monthly_dates = []
-
-    # 최신 리포트 데이터에 링크 변환 적용
-    if latest_daily_report and isinstance(latest_daily_report, str):
-        latest_daily_report = linkify(latest_daily_report)
-    if latest_weekly_report and isinstance(latest_weekly_report, str):
-        latest_weekly_report = linkify(latest_weekly_report)
-    if latest_monthly_report and isinstance(latest_monthly_report, str):
-        latest_monthly_report = linkify(latest_monthly_report)
-
-    # 페이지네이션 처리
-    daily_start = (daily_page - 1) * per_page
-    daily_end = daily_start + per_page
-    daily_dates_paginated = all_daily_dates[daily_start:daily_end]
-    daily_total_pages = (len(all_daily_dates) + per_page - 1) // per_page
-
-    weekly_start = (weekly_page - 1) * per_page
-    weekly_end = weekly_start + per_page
-    weekly_dates_paginated = all_weekly_dates[weekly_start:weekly_end]
-    weekly_total_pages = (len(all_weekly_dates) + per_page - 1) // per_page
-
-    monthly_start = (monthly_page - 1) * per_page
-    monthly_end = monthly_start + per_page
-    monthly_dates_paginated = all_monthly_dates[monthly_start:monthly_end]
-    monthly_total_pages = (len(all_monthly_dates) + per_page - 1) // per_page
-
-    # 만약 weekly_date 파라미터가 있으면 해당 날짜의 weekly report를 보여줌
-    selected_weekly_report = None
-    if weekly_date:
-        key_date = weekly_date.replace('-', '')
-        redis_key = f"weeklyreport-{key_date}"
-        selected_weekly_report = load_report_from_redis(redis_key)
+
+    # 최신 리포트는 리포트 작업이 렌더링(링크 변환)해 둔 결과이므로 그대로 사용합니다.
+
+    # 페이지네이션 처리: 카탈로그(Sorted Set)에서 각 종류의 해당 페이지와 전체 개수를 한 번에 조회
+    catalog_pages = {'daily': ([], 0), 'weekly': ([], 0), 'monthly': ([], 0)}
+    if redis_client:
+        try:
+            catalog_pages = report_catalog.pages(
+                {'daily': daily_page, 'weekly': weekly_page, 'monthly': monthly_page}, per_page)
+        except Exception as e:
+            logger.error(f"Error reading report catalog: {e}")
+
+    daily_dates_paginated, daily_total = catalog_pages['daily']
+    daily_total_pages = (daily_total + per_page - 1) // per_page
+
+    weekly_dates_paginated, weekly_total = catalog_pages['weekly']
+    weekly_total_pages = (weekly_total + per_page - 1) // per_page
+
+    monthly_dates_paginated, monthly_total = catalog_pages['monthly']
+    monthly_total_pages = (monthly_total + per_page - 1) // per_page
+
+    # daily_date/weekly_date/monthly_date 파라미터가 있으면 해당 날짜의 리포트를 보여줌 (검색 결과 링크 등)
+    selected_report = None
+    for report_type in report_catalog.REPORT_TYPES:
+        selected_date = request.args.get(f'{report_type}_date')
+        if selected_date:
+            selected_report = load_report_from_redis(f"{report_type}report-{selected_date.replace('-', '')}")
+            break
 
     return render_template(
         'reports.html',
@@ -149,8 +85,9 @@ def reports_index():
         monthly_page=monthly_page,
         monthly_total_pages=monthly_total_pages,
         daily_latest_report=latest_daily_report,
-        weekly_latest_report=selected_weekly_report if selected_weekly_report else latest_weekly_report,
-        monthly_latest_report=latest_monthly_report
+        weekly_latest_report=latest_weekly_report,
+        monthly_latest_report=latest_monthly_report,
+        selected_report=selected_report
     )
 
 
@@ -169,9 +106,15 @@ def get_report_api(report_type):
     key_date = date_str.replace('-', '')  # "YYYYMMDD"
     redis_key = f"{report_type}report-{key_date}"
 
+    # 리포트는 작성 후 변경되지 않으므로 미리 직렬화된 응답을 그대로 전송합니다.
+    cached = cached_response('reports', f'reports:{report_type}:{key_date}')
+    if cached is not None:
+        return cached
+
     content = load_report_from_redis(redis_key)
     if not content:
         msg = f"<p class='text-gray-500'>No {report_type} report available for {date_str}.</p>"
         return jsonify({'content': msg})
 
-    return jsonify({'content': content})
+    store_report_response(report_type, key_date, content)
+    return cached_response('reports', f'reports:{report_type}:{key_date}') or jsonify({'content': content})
@@ -0,0 +1,168 @@
+# report_catalog.py
+"""
+리포트 카탈로그: 리포트 종류별로 존재하는 날짜를 Sorted Set에 보관합니다.
+  catalog:reports:{daily|weekly|monthly}  member='YYYYMMDD', score=YYYYMMDD(정수)
+
+KEYS로 전체 키 공간을 훑는 대신 날짜 목록, 최신 리포트, /reports/ 페이지네이션을 ZREVRANGE/ZCARD로 처리합니다.
+리포트는 외부 작업이 Redis에 직접 쓰므로 reconcile()이 주기적으로 카탈로그를 실제 키와 맞춥니다.
+  - 전체 동기화: 처음(백필) 또는 REPORT_CATALOG_FULL_HOURS마다 SCAN으로 점진적으로 훑어 재구성
+  - 그 사이: 최근 REPORT_CATALOG_PROBE_DAYS일의 키 존재 여부만 EXISTS 파이프라인으로 확인해 추가/삭제
+리포트를 쓰는 쪽에서 add()를 호출하거나 변경 이벤트(cache_events)를 발행하면 다음 동기화를 기다리지 않고 바로 반영됩니다.
+"""
+import os
+import logging
+from datetime import datetime, timedelta, timezone
+
+from extensions import redis_client
+
+logger = logging.getLogger(__name__)
+
+REPORT_TYPES = ('daily', 'weekly', 'monthly')
+CATALOG_KEY = 'catalog:reports:{}'
+CATALOG_STATE_KEY = 'catalog:reports:state'
+REPORT_KEY = '{}report-{}'
+
+REPORT_CATALOG_FULL_HOURS = int(os.getenv('REPORT_CATALOG_FULL_HOURS', '24'))
+REPORT_CATALOG_PROBE_DAYS = int(os.getenv('REPORT_CATALOG_PROBE_DAYS', '45'))
+REPORT_CATALOG_SCAN_COUNT = int(os.getenv('REPORT_CATALOG_SCAN_COUNT', '1000'))
+
+
+def _key_date(value):
+    """'YYYY-MM-DD' 또는 'YYYYMMDD'를 'YYYYMMDD'로 바꿉니다. 형식이 맞지 않으면 None."""
+    value = value.replace('-', '')
+    return value if len(value) == 8 and value.isdigit() else None
+
+
+def _display_date(key_date):
+    return f"{key_date[0:4]}-{key_date[4:6]}-{key_date[6:8]}"
+
+
+def add(report_type, date):
+    """리포트 하나를 카탈로그에 추가합니다."""
+    key_date = _key_date(date)
+    if key_date and report_type in REPORT_TYPES:
+        redis_client.zadd(CATALOG_KEY.format(report_type), {key_date: int(key_date)})
+
+
+def apply_changes(report_keys):
+    """
+    변경 이벤트로 받은 리포트 키들을 카탈로그에 반영합니다. 키가 있으면 추가하고, 삭제되었으면 제거합니다.
+    """
+    parsed = []
+    for key in report_keys:
+        report_type, _, date = key.partition('report-')
+        key_date = _key_date(date)
+        if report_type in REPORT_TYPES and key_date:
+            parsed.append((key, report_type, key_date))
+    if not parsed: return
+    pipe = redis_client.pipeline(transaction=False)
+    for key, _, _ in parsed:
+        pipe.exists(key)
+    results = pipe.execute()
+
+    pipe = redis_client.pipeline(transaction=False)
+    for (_, report_type, key_date), exists in zip(parsed, results):
+        if exists:
+            pipe.zadd(CATALOG_KEY.format(report_type), {key_date: int(key_date)})
+        else:
+            pipe.zrem(CATALOG_KEY.format(report_type), key_date)
+    pipe.execute()
+
+
+def scan_report_dates(report_type):
+    """SCAN으로 해당 종류의 리포트 키를 점진적으로 훑어 'YYYYMMDD' 집합을 반환합니다."""
+    prefix = REPORT_KEY.format(report_type, '')
+    dates = set()
+    for key in redis_client.scan_iter(match=f"{prefix}*", count=REPORT_CATALOG_SCAN_COUNT):
+        key_date = _key_date(key[len(prefix):])
+        if key_date:
+            dates.add(key_date)
+    return dates
+
+
+def _rebuild(report_type):
+    """SCAN 결과로 카탈로그를 새로 만들어 RENAME으로 교체합니다."""
+    dates = scan_report_dates(report_type)
+    key = CATALOG_KEY.format(report_type)
+    if not dates:
+        redis_client.delete(key)
+        return 0
+    tmp_key = f"{key}:tmp"
+    pipe = redis_client.pipeline()
+    pipe.delete(tmp_key)
+    pipe.zadd(tmp_key, {d: int(d) for d in dates})
+    pipe.rename(tmp_key, key)
+    pipe.execute()
+    return len(dates)
+
+
+def _probe_recent(days, today):
+    """최근 날짜들의 리포트 키 존재 여부를 한 번의 파이프라인으로 확인해 카탈로그에 반영합니다."""
+    key_dates = [(today - timedelta(days=i)).strftime('%Y%m%d') for i in range(-1, days)]
+    pipe = redis_client.pipeline(transaction=False)
+    for report_type in REPORT_TYPES:
+        for key_date in key_dates:
+            pipe.exists(REPORT_KEY.format(report_type, key_date))
+    results = iter(pipe.execute())
+
+    pipe = redis_client.pipeline(transaction=False)
+    added = 0
+    for report_type in REPORT_TYPES:
+        present = {d: int(d) for d, exists in zip(key_dates, results) if exists}
+        missing = [d for d in key_dates if d not in present]
+        if present:
+            pipe.zadd(CATALOG_KEY.format(report_type), present)
+            added += len(present)
+        if missing:
+            pipe.zrem(CATALOG_KEY.format(report_type), *missing)
+    pipe.execute()
+    return added
+
+
+def reconcile(full=False):
+    """
+    카탈로그를 실제 리포트 키와 맞춥니다. 반환값: 전체 동기화를 수행했는지 여부
+    전체 동기화 중 새로 쓰인 리포트가 RENAME으로 덮여 빠지더라도 다음 최근 날짜 확인에서 다시 추가됩니다.
+    """
+    now = datetime.now(timezone.utc)
+    last_full = redis_client.hget(CATALOG_STATE_KEY, 'last_full')
+    if not full and last_full:
+        try:
+            full = now - datetime.fromisoformat(last_full) >= timedelta(hours=REPORT_CATALOG_FULL_HOURS)
+        except ValueError:
+            full = True
+    elif not last_full:
+        full = True
+
+    if full:
+        counts = {report_type: _rebuild(report_type) for report_type in REPORT_TYPES}
+        redis_client.hset(CATALOG_STATE_KEY, 'last_full', now.isoformat())
+        logger.info(f"REPORT_CATALOG: Rebuilt catalog via SCAN: {counts}")
+    else:
+        _probe_recent(REPORT_CATALOG_PROBE_DAYS, now.date())
+    return full
+
+
+def latest_dates(report_type, count):
+    """최신순 날짜('YYYY-MM-DD') 최대 count개를 반환합니다. count가 None이면 전체를 반환합니다."""
+    end = -1 if count is None else count - 1
+    return [_display_date(d) for d in redis_client.zrevrange(CATALOG_KEY.format(report_type), 0, end)]
+
+
+def pages(page_by_type, per_page):
+    """
+    여러 종류의 날짜 페이지와 전체 개수를 한 번의 왕복으로 가져옵니다.
+    page_by_type: {report_type: 1부터 시작하는 페이지 번호}
+    반환값: {report_type: (날짜 목록, 전체 개수)}
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    for report_type, page in page_by_type.items():
+        start = (max(page, 1) - 1) * per_page
+        key = CATALOG_KEY.format(report_type)
+        pipe.zrevrange(key, start, start + per_page - 1)
+        pipe.zcard(key)
+    results = pipe.execute()
+    return {
+        report_type: ([_display_date(d) for d in results[i * 2]], results[i * 2 + 1])
+        for i, report_type in enumerate(page_by_type)
+    }
@@ -0,0 +1,172 @@
+# report_render.py
+"""
+리포트 렌더링 결과 캐시.
+  cache:report:rendered:{report_key}  Hash  sha1(원본 값의 해시), html(링크 변환 결과), markdown(선택), rendered_at
+원본 리포트는 pickle/JSON/텍스트 중 하나로 저장되어 있어 읽을 때마다 형식을 판별하고 URL을 링크로 바꿔야 했습니다.
+리포트 작업(또는 변경 이벤트)이 원본 값의 해시가 바뀐 리포트만 다시 렌더링해 저장하고,
+요청 처리 시에는 저장된 결과만 읽습니다. (없으면 한 번 렌더링해 저장)
+
+REPORT_RENDER_MARKDOWN=1이고 markdown 패키지가 있으면 텍스트 리포트를 Markdown으로도 렌더링해 그 결과를 제공합니다.
+"""
+import os
+import re
+import json
+import pickle
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+
+from extensions import redis_bytes_client
+import serialization
+import local_cache
+
+try:
+    import markdown  # 선택 의존성: 텍스트 리포트의 Markdown 렌더링
+except ImportError:
+    markdown = None
+
+logger = logging.getLogger(__name__)
+
+RENDERED_KEY = 'cache:report:rendered:{}'
+REPORT_RENDER_MARKDOWN = os.getenv('REPORT_RENDER_MARKDOWN', '0') == '1' and markdown is not None
+# 렌더링 결과 보관 기간. 오래된 리포트는 만료 후 다시 요청되면 한 번 더 렌더링됩니다.
+REPORT_RENDER_TTL = timedelta(days=int(os.getenv('REPORT_RENDER_TTL_DAYS', '30')))
+
+# URL 정규표현식 (괄호나 마침표는 URL에 포함되지 않도록 함)
+_URL_PATTERN = re.compile(r'(https?://[^\s<>()]+)([).,!?]?)')
+# Markdown 링크/HTML 속성 안에 있지 않은 URL
+_BARE_URL_PATTERN = re.compile(r'(?<![(<"\'=])(https?://[^\s<>()]+)([).,!?]?)')
+# 렌더링 결과에서 텍스트만 남길 때 줄바꿈으로 바꿀 태그와 지울 태그
+_BREAK_TAG_PATTERN = re.compile(r'<br\s*/?>|</p>', re.IGNORECASE)
+_TAG_PATTERN = re.compile(r'<[^>]*>')
+
+
+def _replace_url(match):
+    url, punctuation = match.group(1), match.group(2)
+    # URL을 링크로 변환하고, 붙어있던 문장 부호는 링크 바깥으로 둠
+    return f'<a href="{url}" class="text-blue-500 hover:text-blue-700">{url}</a>{punctuation}'
+
+
+def linkify(text):
+    """
+    텍스트 내의 URL을 찾아서 <a> 태그로 변환하고, 줄바꿈을 <br>로 변경합니다.
+    괄호나 마침표가 URL 끝에 붙어 있으면 링크 밖으로 분리합니다.
+    """
+    if not isinstance(text, str):
+        return text
+    return _URL_PATTERN.sub(_replace_url, text).replace('\n', '<br>')
+
+
+def plain_text(html):
+    """렌더링 결과(HTML)에서 태그를 지우고 줄바꿈만 남깁니다. 엔티티(&amp; 등)는 그대로 둡니다."""
+    return _TAG_PATTERN.sub('', _BREAK_TAG_PATTERN.sub('\n', html))
+
+
+def render_markdown(text):
+    """텍스트 리포트를 Markdown으로 렌더링합니다. 맨 URL은 자동 링크로 바꿉니다."""
+    return markdown.markdown(_BARE_URL_PATTERN.sub(r'<\1>\2', text), extensions=['extra', 'sane_lists'])
+
+
+def decode_report(raw):
+    """원본 리포트 값(bytes)을 pickle -> JSON -> 텍스트 순서로 해석합니다. 해석할 수 없으면 None."""
+    # pickle 프로토콜 2 이상은 b'\x80'으로 시작하므로, 텍스트를 pickle로 잘못 해석하지 않도록 먼저 확인합니다.
+    if raw[:1] == b'\x80':
+        try:
+            return pickle.loads(raw)
+        except Exception:
+            pass
+    try:
+        text = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def content_hash(raw):
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _render_fields(raw):
+    """원본 값을 렌더링하여 저장할 필드를 만듭니다. 문자열이 아닌 값(dict 등)은 변환 없이 보관합니다."""
+    value = decode_report(raw)
+    if value is None:
+        return None
+    fields = {
+        b'sha1': content_hash(raw).encode('ascii'),
+        b'html': serialization.dumps(linkify(value)),
+        b'rendered_at': datetime.now(timezone.utc).isoformat().encode('ascii'),
+    }
+    if REPORT_RENDER_MARKDOWN and isinstance(value, str):
+        fields[b'markdown'] = serialization.dumps(render_markdown(value))
+    return fields
+
+
+def _served(fields):
+    """렌더링 필드 중 요청에 제공할 결과."""
+    if REPORT_RENDER_MARKDOWN and fields.get(b'markdown'):
+        return serialization.loads(fields[b'markdown'])
+    return serialization.loads(fields[b'html'])
+
+
+def _store(pipe, report_key, fields):
+    key = RENDERED_KEY.format(report_key)
+    pipe.delete(key)
+    pipe.hset(key, mapping=fields)
+    pipe.expire(key, REPORT_RENDER_TTL)
+
+
+def render_reports(report_keys):
+    """
+    리포트들을 원본 값의 해시와 비교하여 바뀐 것만 다시 렌더링해 저장합니다. 리포트 작업과 변경 이벤트에서 호출합니다.
+    반환값: {리포트 키: 제공할 렌더링 결과} (원본이 없는 키는 제외)
+    """
+    report_keys = list(dict.fromkeys(report_keys))
+    if not report_keys: return {}
+    pipe = redis_bytes_client.pipeline(transaction=False)
+    for report_key in report_keys:
+        pipe.get(report_key)
+        pipe.hgetall(RENDERED_KEY.format(report_key))
+    results = pipe.execute()
+
+    rendered, rerendered = {}, []
+    pipe = redis_bytes_client.pipeline(transaction=False)
+    for report_key, raw, fields in zip(report_keys, results[0::2], results[1::2]):
+        if not raw: continue
+        if fields.get(b'sha1', b'').decode('ascii') != content_hash(raw):
+            fields = _render_fields(raw)
+            if fields is None: continue
+            _store(pipe, report_key, fields)
+            rerendered.append(report_key)
+        rendered[report_key] = _served(fields)
+    pipe.execute()
+    # 이 프로세스의 로컬 캐시에 이전 결과가 남아 있지 않도록 합니다. (다른 워커는 작업이 끝날 때 세대 번호로 무효화)
+    for report_key in rerendered:
+        local_cache.discard('reports', f'rendered:{report_key}')
+    if rerendered:
+        logger.info(f"REPORT_RENDER: Rendered {len(rerendered)} reports.")
+    return rendered
+
+
+def _load(report_key):
+    fields = redis_bytes_client.hgetall(RENDERED_KEY.format(report_key))
+    if not fields:
+        raw = redis_bytes_client.get(report_key)
+        if not raw: return None, 0
+        fields = _render_fields(raw)
+        if fields is None: return None, 0
+        pipe = redis_bytes_client.pipeline(transaction=False)
+        _store(pipe, report_key, fields)
+        pipe.execute()
+    return _served(fields), sum(len(v) for v in fields.values())
+
+
+def get(report_key):
+    """
+    렌더링된 리포트를 반환합니다. 저장된 결과가 없으면 원본을 읽어 한 번 렌더링하고 저장합니다. 원본이 없으면 None.
+    반환된 객체는 워커 내에서 공유되므로 수정하면 안 됩니다.
+    """
+    if not redis_bytes_client: return None
+    return local_cache.get('reports', f'rendered:{report_key}', lambda: _load(report_key))
@@ -0,0 +1,95 @@
+# responses.py
+"""
+캐시 작업이 미리 직렬화해 둔 JSON 응답(원본, gzip, brotli)과 ETag를 저장하고,
+요청 시 디코딩/재직렬화 없이 그대로 전송합니다.
+"""
+import gzip
+import json
+import hashlib
+import logging
+from datetime import timedelta
+
+from flask import Response, request
+
+from extensions import redis_bytes_client
+import local_cache
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성입니다.
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_KEY = 'cache:response:{}'
+
+
+def build_response_variants(payload):
+    """payload를 JSON으로 직렬화하고 압축본과 강한 ETag를 만듭니다."""
+    body = json.dumps(payload, default=str, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    variants = {
+        b'body': body,
+        b'gzip': gzip.compress(body, compresslevel=9),
+        b'etag': f'"{hashlib.sha1(body).hexdigest()}"'.encode('ascii'),
+    }
+    if brotli:
+        variants[b'br'] = brotli.compress(body)
+    return variants
+
+
+def store_response(name, payload, ttl=None):
+    """미리 직렬화한 응답을 Redis에 저장합니다. ttl(timedelta)이 주어지면 만료시간을 설정합니다."""
+    if not redis_bytes_client: return
+    key = RESPONSE_KEY.format(name)
+    pipe = redis_bytes_client.pipeline()
+    pipe.delete(key)
+    pipe.hset(key, mapping=build_response_variants(payload))
+    if ttl:
+        pipe.expire(key, ttl)
+    pipe.execute()
+
+
+def has_response(names):
+    """각 이름에 대해 미리 직렬화된 응답이 있는지 여부 목록을 반환합니다."""
+    pipe = redis_bytes_client.pipeline()
+    for name in names: pipe.exists(RESPONSE_KEY.format(name))
+    return [bool(exists) for exists in pipe.execute()]
+
+
+def _load_variants(name):
+    variants = redis_bytes_client.hgetall(RESPONSE_KEY.format(name))
+    if not variants or b'body' not in variants: return None, 0
+    return variants, sum(len(v) for v in variants.values())
+
+
+def cached_response(namespace, name):
+    """
+    미리 직렬화된 응답을 반환합니다. 없으면 None을 반환하므로 호출하는 쪽에서 대체 응답을 만들어야 합니다.
+    If-None-Match가 ETag와 (약한 비교로) 일치하면 304, 아니면 Accept-Encoding의 q값에 맞는 압축본을 보냅니다.
+    """
+    if not redis_bytes_client: return None
+    variants = local_cache.get(namespace, f'response:{name}', lambda: _load_variants(name))
+    if not variants: return None
+
+    etag = variants[b'etag'].decode('ascii')
+    headers = {'ETag': etag, 'Vary': 'Accept-Encoding'}
+    # If-None-Match는 약한 비교를 합니다. (W/ 접두사와 '*' 허용)
+    if request.if_none_match.contains_weak(etag.strip('"')):
+        return Response(status=304, headers=headers)
+
+    # q=0으로 거부한 인코딩은 보내지 않고, q값이 같으면 brotli를 우선합니다.
+    accept_encodings = request.accept_encodings
+    br_quality = accept_encodings.quality('br') if b'br' in variants else 0
+    gzip_quality = accept_encodings.quality('gzip')
+    if br_quality > 0 and br_quality >= gzip_quality:
+        body, headers['Content-Encoding'] = variants[b'br'], 'br'
+    elif gzip_quality > 0:
+        body, headers['Content-Encoding'] = variants[b'gzip'], 'gzip'
+    else:
+        body = variants[b'body']
+    return Response(body, mimetype='application/json', headers=headers)
+
+
+def store_report_response(report_type, key_date, content, ttl=timedelta(days=7)):
+    """/reports/api/<report_type> 응답을 미리 직렬화하여 저장합니다."""
+    store_response(f'reports:{report_type}:{key_date}', {'content': content}, ttl=ttl)
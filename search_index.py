@@ -0,0 +1,183 @@
+# search_index.py
+"""
+기사와 리포트의 전문 검색용 역색인(Redis).
+  search:term:{term}   Sorted Set  문서 id -> BM25의 단어 빈도 부분 점수 tf*(k1+1) / (tf + k1*(1-b+b*dl/avgdl))
+  search:doc_terms     Hash        문서 id -> "문서 길이 단어1 단어2 ..." (갱신/삭제 시 이전 posting을 지우기 위함)
+  search:stats         Hash        docs(문서 수), total_length(전체 토큰 수)
+  search:report_meta   Hash        리포트 문서 id -> 결과 표시용 JSON(제목, 요약)
+
+문서 id는 기사의 원본 키(news-YYYYMMDD-NNN) 또는 리포트 키({type}report-YYYYMMDD)입니다.
+질의 시 단어별 idf를 ZCARD(문서 빈도)와 문서 수로 계산하고, 이를 가중치로 ZINTERSTORE(모든 단어 포함)하여
+BM25 점수 순으로 요청한 페이지만 읽습니다. 모든 단어를 포함하는 문서가 없으면 ZUNIONSTORE(일부 단어 포함)로 다시 찾습니다.
+평균 문서 길이(avgdl)는 색인 시점의 값을 사용하므로 오래된 posting의 점수는 약간 다를 수 있으며, 재색인 때 맞춰집니다.
+"""
+import os
+import re
+import json
+import math
+import uuid
+import logging
+from collections import Counter
+
+from extensions import redis_client
+from keywords import tokenize, tokenize_many
+
+logger = logging.getLogger(__name__)
+
+TERM_KEY = 'search:term:{}'
+DOC_TERMS_KEY = 'search:doc_terms'
+STATS_KEY = 'search:stats'
+REPORT_META_KEY = 'search:report_meta'
+QUERY_KEY = 'search:query:{}'
+
+BM25_K1 = float(os.getenv('SEARCH_BM25_K1', '1.2'))
+BM25_B = float(os.getenv('SEARCH_BM25_B', '0.75'))
+# 질의에서 사용하는 최대 단어 수
+SEARCH_MAX_TERMS = int(os.getenv('SEARCH_MAX_TERMS', '8'))
+_BATCH_SIZE = 500
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def strip_html(text):
+    """리포트 HTML에서 태그를 제거합니다."""
+    return _TAG_PATTERN.sub(' ', text)
+
+
+def _read_stats():
+    docs, total_length = redis_client.hmget(STATS_KEY, ['docs', 'total_length'])
+    return int(docs or 0), int(total_length or 0)
+
+
+def is_built():
+    return bool(redis_client.exists(STATS_KEY))
+
+
+def _term_weights(tokens, avgdl):
+    dl = len(tokens)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * dl / avgdl) if avgdl else BM25_K1
+    return {term: tf * (BM25_K1 + 1) / (tf + norm) for term, tf in Counter(tokens).items()}
+
+
+def index_documents(docs, tokens_list=None, report_meta=None):
+    """
+    문서들을 색인하거나 다시 색인합니다.
+    docs: [(문서 id, 텍스트), ...], tokens_list: 미리 토큰화한 결과(같은 순서, 없으면 여기서 토큰화)
+    report_meta: {리포트 문서 id: 결과 표시용 dict}
+    반환값: 색인한 문서 수
+    """
+    docs = list(docs)
+    if tokens_list is None:
+        tokens_list = tokenize_many(text for _, text in docs)
+
+    n_docs, total_length = _read_stats()
+    for start in range(0, len(docs), _BATCH_SIZE):
+        batch = list(zip(docs[start:start + _BATCH_SIZE], tokens_list[start:start + _BATCH_SIZE]))
+        previous = redis_client.hmget(DOC_TERMS_KEY, [doc_id for (doc_id, _), _ in batch])
+        # 이 묶음을 반영한 평균 문서 길이로 점수를 계산합니다.
+        new_docs = sum(1 for old in previous if not old)
+        batch_length = sum(len(tokens) for _, tokens in batch) - sum(int(old.split(' ', 1)[0]) for old in previous if old)
+        avgdl = (total_length + batch_length) / max(n_docs + new_docs, 1)
+
+        pipe = redis_client.pipeline(transaction=False)
+        for ((doc_id, _), tokens), old in zip(batch, previous):
+            weights = _term_weights(tokens, avgdl)
+            if old:
+                for term in set(old.split(' ')[1:]) - set(weights):
+                    pipe.zrem(TERM_KEY.format(term), doc_id)
+            for term, weight in weights.items():
+                pipe.zadd(TERM_KEY.format(term), {doc_id: weight})
+            pipe.hset(DOC_TERMS_KEY, doc_id, ' '.join([str(len(tokens))] + list(weights)))
+        pipe.hincrby(STATS_KEY, 'docs', new_docs)
+        pipe.hincrby(STATS_KEY, 'total_length', batch_length)
+        if report_meta:
+            meta = {doc_id: json.dumps(report_meta[doc_id]) for (doc_id, _), _ in batch if doc_id in report_meta}
+            if meta:
+                pipe.hset(REPORT_META_KEY, mapping=meta)
+        pipe.execute()
+        n_docs, total_length = n_docs + new_docs, total_length + batch_length
+    return len(docs)
+
+
+def remove_documents(doc_ids):
+    """문서들을 색인에서 제거합니다."""
+    doc_ids = list(doc_ids)
+    for start in range(0, len(doc_ids), _BATCH_SIZE):
+        batch = doc_ids[start:start + _BATCH_SIZE]
+        previous = redis_client.hmget(DOC_TERMS_KEY, batch)
+        pipe = redis_client.pipeline(transaction=False)
+        removed = removed_length = 0
+        for doc_id, old in zip(batch, previous):
+            if not old: continue
+            length, *terms = old.split(' ')
+            for term in terms:
+                pipe.zrem(TERM_KEY.format(term), doc_id)
+            removed += 1
+            removed_length += int(length)
+        pipe.hdel(DOC_TERMS_KEY, *batch)
+        pipe.hdel(REPORT_META_KEY, *batch)
+        pipe.hincrby(STATS_KEY, 'docs', -removed)
+        pipe.hincrby(STATS_KEY, 'total_length', -removed_length)
+        pipe.execute()
+
+
+def indexed_ids(prefix=''):
+    """색인된 문서 id 중 prefix로 시작하는 것들의 집합."""
+    return {doc_id for doc_id, _ in redis_client.hscan_iter(DOC_TERMS_KEY, match=f"{prefix}*", count=1000)}
+
+
+def indexed_report_ids():
+    """색인된 리포트 문서 id 집합."""
+    return set(redis_client.hkeys(REPORT_META_KEY))
+
+
+def clear():
+    """검색 색인 전체를 삭제합니다."""
+    for key in redis_client.scan_iter(match='search:*', count=1000):
+        redis_client.delete(key)
+
+
+def _idf(df, n_docs):
+    return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+
+def search(query, page=1, per_page=10):
+    """
+    질의를 검색하여 (결과 [(문서 id, 점수), ...], 전체 결과 수)를 반환합니다.
+    모든 단어를 포함하는 문서를 우선 찾고, 없으면 하나 이상 포함하는 문서를 찾습니다.
+    """
+    terms = list(dict.fromkeys(tokenize(query or '')))[:SEARCH_MAX_TERMS]
+    if not terms:
+        return [], 0
+
+    pipe = redis_client.pipeline(transaction=False)
+    for term in terms:
+        pipe.zcard(TERM_KEY.format(term))
+    pipe.hget(STATS_KEY, 'docs')
+    *dfs, n_docs = pipe.execute()
+    n_docs = int(n_docs or 0)
+    weights = {TERM_KEY.format(term): _idf(df, n_docs) for term, df in zip(terms, dfs) if df}
+    if not weights:
+        return [], 0
+
+    start = (max(page, 1) - 1) * per_page
+    end = start + per_page - 1
+    if len(weights) == 1:
+        (key, idf), = weights.items()
+        rows = redis_client.zrevrange(key, start, end, withscores=True)
+        return [(doc_id, score * idf) for doc_id, score in rows], max(dfs)
+
+    results, total = [], 0
+    # 일부 단어가 어느 문서에도 없으면 교집합은 비어 있으므로 바로 합집합으로 찾습니다.
+    combine_modes = ('zinterstore', 'zunionstore') if len(weights) == len(terms) else ('zunionstore',)
+    for combine in combine_modes:
+        target = QUERY_KEY.format(uuid.uuid4().hex)
+        pipe = redis_client.pipeline(transaction=False)
+        getattr(pipe, combine)(target, weights, aggregate='SUM')
+        pipe.zrevrange(target, start, end, withscores=True)
+        pipe.zcard(target)
+        pipe.delete(target)
+        _, results, total, _ = pipe.execute()
+        if total:
+            break
+    return results, total
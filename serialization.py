@@ -0,0 +1,96 @@
+# serialization.py
+"""
+캐시 blob(cache:homepage, cache:trends:*, cache:reports_page)의 직렬화 계층.
+값 앞에 형식 헤더를 붙여 저장하므로 읽는 쪽은 설정과 관계없이 형식을 판별할 수 있습니다.
+
+헤더(6바이트): b'EGC' + 버전(b'1') + 형식(b'j' JSON, b'm' msgpack) + 압축(b'n' 없음, b'z' zlib, b's' zstd)
+헤더가 없는 값은 이전 방식(json.dumps(..., default=str))으로 저장된 JSON으로 간주합니다.
+"""
+import os
+import json
+import zlib
+
+import metrics
+
+try:
+    import msgpack  # 선택 의존성: 작고 빠른 바이너리 형식, datetime을 타임스탬프로 그대로 보존
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard  # 선택 의존성: zlib보다 빠른 압축/해제
+except ImportError:
+    zstandard = None
+
+MAGIC = b'EGC'
+VERSION = b'1'
+HEADER_SIZE = len(MAGIC) + 3
+
+FORMATS = {'json': b'j', 'msgpack': b'm'}
+COMPRESSIONS = {'none': b'n', 'zlib': b'z', 'zstd': b's'}
+
+# 쓰기 형식 설정. 선택 의존성이 없으면 JSON/무압축으로 대체합니다.
+CACHE_SERIALIZER = os.getenv('CACHE_SERIALIZER', 'msgpack' if msgpack else 'json')
+CACHE_COMPRESSION = os.getenv('CACHE_COMPRESSION', 'zlib')
+CACHE_COMPRESSION_LEVEL = int(os.getenv('CACHE_COMPRESSION_LEVEL', '3'))
+
+
+def _resolve(serializer, compression):
+    if serializer not in FORMATS or (serializer == 'msgpack' and not msgpack):
+        serializer = 'json'
+    if compression not in COMPRESSIONS or (compression == 'zstd' and not zstandard):
+        compression = 'zlib' if compression == 'zstd' else 'none'
+    return serializer, compression
+
+
+def _encode_json(obj):
+    return json.dumps(obj, default=str, separators=(',', ':')).encode('utf-8')
+
+
+def _encode_msgpack(obj):
+    # tz-aware datetime은 msgpack Timestamp로 저장되고, 그 외 알 수 없는 타입은 JSON과 같이 문자열로 변환합니다.
+    return msgpack.packb(obj, datetime=True, default=str, use_bin_type=True)
+
+
+def dumps(obj, serializer=None, compression=None, level=None):
+    """객체를 헤더가 붙은 bytes로 직렬화합니다."""
+    serializer, compression = _resolve(serializer or CACHE_SERIALIZER, compression or CACHE_COMPRESSION)
+    payload = _encode_msgpack(obj) if serializer == 'msgpack' else _encode_json(obj)
+
+    level = CACHE_COMPRESSION_LEVEL if level is None else level
+    if compression == 'zlib':
+        payload = zlib.compress(payload, level)
+    elif compression == 'zstd':
+        payload = zstandard.ZstdCompressor(level=level).compress(payload)
+    return MAGIC + VERSION + FORMATS[serializer] + COMPRESSIONS[compression] + payload
+
+
+@metrics.timed('decode_seconds', kind='cache')
+def loads(data):
+    """dumps로 만든 값 또는 헤더가 없는 이전 JSON 값을 역직렬화합니다."""
+    if data is None:
+        return None
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if not data.startswith(MAGIC):
+        return json.loads(data)
+    if len(data) < HEADER_SIZE or data[3:4] != VERSION:
+        raise ValueError(f"Unsupported cache serialization header: {data[:HEADER_SIZE]!r}")
+
+    fmt, compression, payload = data[4:5], data[5:6], data[HEADER_SIZE:]
+    if compression == COMPRESSIONS['zlib']:
+        payload = zlib.decompress(payload)
+    elif compression == COMPRESSIONS['zstd']:
+        if not zstandard:
+            raise ValueError("Cache value is zstd-compressed but zstandard is not installed.")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    elif compression != COMPRESSIONS['none']:
+        raise ValueError(f"Unknown cache compression: {compression!r}")
+
+    if fmt == FORMATS['msgpack']:
+        if not msgpack:
+            raise ValueError("Cache value is msgpack-encoded but msgpack is not installed.")
+        return msgpack.unpackb(payload, raw=False, timestamp=3, strict_map_key=False)
+    if fmt == FORMATS['json']:
+        return json.loads(payload)
+    raise ValueError(f"Unknown cache serialization format: {fmt!r}")
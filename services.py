@@ -5,28 +5,32 @@ import re
 import logging
 from datetime import datetime, timedelta, timezone
 from collections import Counter
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-import nltk
+from itertools import islice
+from email.utils import parsedate_to_datetime
 import redis
 import os
-import pickle
 
-from extensions import redis_client
+try:
+    import ahocorasick  # pyahocorasick: 카테고리 키워드를 한 번의 스캔으로 찾기 위한 선택 의존성
+except ImportError:
+    ahocorasick = None
+
+from extensions import redis_client, redis_bytes_client
+import serialization
+import local_cache
+from keywords import keyword_counts_by_group, news_text, TOKENIZE_PARALLEL_MIN_ITEMS
+import responses
+import report_catalog
+import news_index
+import search_index
+import cache_refresh
+import report_render
+import metrics
+from articles import Article, day_ordinal, day_string
+import article_store
 
 logger = logging.getLogger(__name__)
 
-# NLTK 데이터가 로드되었는지 확인하고, 없으면 다운로드
-try:
-    nltk.data.find('corpora/stopwords')
-    nltk.data.find('tokenizers/punkt')
-    stop_words = set(stopwords.words('english'))
-except Exception:
-    logger.info("Downloading NLTK data (stopwords, punkt)...")
-    nltk.download('stopwords')
-    nltk.download('punkt')
-    stop_words = set(stopwords.words('english'))
-
 # 카테고리 정의
 CATEGORIES = {
     'sustainability': { 'name': 'Sustainability', 'keywords': ['sustainability', 'sustainable', 'circular economy', 'green economy', 'esg', 'csr', 'corporate social responsibility', 'sustainable development goals', 'sdg', 'eco-friendly', 'resource efficiency', 'reuse', 'reduce', 'recycle', 'zero waste', 'waste management', 'green business', 'green building', 'low carbon', 'carbon neutral', 'green bond', 'sustainable finance', 'responsible sourcing', 'life cycle assessment', 'agriculture', 'farming', 'regenerative agriculture', 'organic farming', 'sustainable food', 'supply chain', 'fair trade', 'eco-tourism', 'green tourism', 'sustainable packaging', 'circular fashion'] },
@@ -47,285 +51,931 @@ COUNTRY_LIST = [
     'us', 'u.s.', 'states', 'america', 'eu', 'european union'
 ]
 
+def _keyword_ranks(groups):
+    """[(그룹 순위, 키워드 목록), ...]에서 키워드 -> 가장 앞선 그룹 순위 dict를 만듭니다."""
+    ranks = {}
+    for rank, keywords in groups:
+        for keyword in keywords:
+            ranks.setdefault(keyword, rank)
+    return ranks
+
+# 카테고리 키워드 전체를 CATEGORIES 순서대로 하나의 매처로 만듭니다. (부분 문자열 일치)
+_CATEGORY_IDS = [cat_id for cat_id in CATEGORIES if cat_id != 'others']
+_CATEGORY_ID_BY_NAME = {info['name']: cat_id for cat_id, info in CATEGORIES.items()}
+_CATEGORY_RANKS = _keyword_ranks((rank, CATEGORIES[cat_id]['keywords']) for rank, cat_id in enumerate(_CATEGORY_IDS))
+_CATEGORY_AUTOMATON = None
+if ahocorasick:
+    _CATEGORY_AUTOMATON = ahocorasick.Automaton()
+    for _keyword, _rank in _CATEGORY_RANKS.items():
+        _CATEGORY_AUTOMATON.add_word(_keyword, _rank)
+    _CATEGORY_AUTOMATON.make_automaton()
+
+# 국가 목록을 하나의 정규식으로 컴파일합니다. 단어 경계를 확인하여 'us'가 'russia'의 일부로 인식되는 것을 방지합니다.
+# lookahead로 모든 위치를 검사하므로 겹치는 항목도 빠짐없이 찾고, 같은 위치에서는 목록 앞쪽 항목이 먼저 선택됩니다.
+_COUNTRY_RANKS = _keyword_ranks((rank, [country]) for rank, country in enumerate(COUNTRY_LIST))
+_COUNTRY_MATCHER = re.compile(r'(?=\b(' + '|'.join(re.escape(c) for c in COUNTRY_LIST) + r')\b)')
+
+def _min_rank(ranks):
+    """일치한 키워드 순위 중 가장 앞선 것을 반환합니다. 없으면 None."""
+    best = None
+    for rank in ranks:
+        if best is None or rank < best:
+            best = rank
+            if best == 0: break
+    return best
+
+def _normalize_country(country):
+    """국가 표기를 표준 이름으로 변환합니다."""
+    if country in ['us', 'u.s.', 'states', 'america']: return 'United States'
+    if country in ['uk', 'u.k.', 'britain', 'united kingdom']: return 'United Kingdom'
+    if country in ['south korea']: return 'Korea'
+    return country.capitalize()
+
+def _news_text(news_item):
+    return f"{news_item.title or ''} {news_item.summary or ''}".lower()
+
+def _category_for_text(text):
+    if _CATEGORY_AUTOMATON is not None:
+        rank = _min_rank(r for _, r in _CATEGORY_AUTOMATON.iter(text))
+        return CATEGORIES[_CATEGORY_IDS[rank]]['name'] if rank is not None else CATEGORIES['others']['name']
+    # pyahocorasick이 없으면 키워드별 부분 문자열 검사로 처리합니다. (정규식 alternation보다 빠름)
+    for cat_id in _CATEGORY_IDS:
+        for keyword in CATEGORIES[cat_id]['keywords']:
+            if keyword in text: return CATEGORIES[cat_id]['name']
+    return CATEGORIES['others']['name']
+
+def _country_for_text(text):
+    rank = _min_rank(_COUNTRY_RANKS[m.group(1)] for m in _COUNTRY_MATCHER.finditer(text))
+    return _normalize_country(COUNTRY_LIST[rank]) if rank is not None else None
+
 def infer_country(news_item):
-    """뉴스 제목과 요약에서 국가를 추론합니다."""
-    text = (news_item.get('title', '') + ' ' + news_item.get('summary', '')).lower()
-    for country in COUNTRY_LIST:
-        # 단어 경계를 확인하여 'us'가 'russia'의 일부로 인식되는 것을 방지
-        if re.search(r'\b' + re.escape(country) + r'\b', text):
-            # 표준 이름으로 변환
-            if country in ['us', 'u.s.', 'states', 'america']: return 'United States'
-            if country in ['uk', 'u.k.', 'britain', 'united kingdom']: return 'United Kingdom'
-            if country in ['south korea']: return 'Korea'
-            return country.capitalize()
-    return None
+    """뉴스(Article) 제목과 요약에서 국가를 추론합니다. COUNTRY_LIST에서 가장 앞선 일치 항목을 사용합니다."""
+    return _country_for_text(_news_text(news_item))
 
+@metrics.timed('categorize_seconds')
 def categorize_news(news_item):
-    title_lower = news_item.get('title', '').lower()
-    summary_lower = news_item.get('summary', '').lower()
-    combined_text = title_lower + " " + summary_lower
-    for category_id, category_info in CATEGORIES.items():
-        if category_id == 'others': continue
-        for keyword in category_info['keywords']:
-            if keyword in combined_text: return category_info['name']
-    return CATEGORIES['others']['name']
-
-def fetch_all_news_from_redis():
-    if not redis_client: return []
-    news_pattern = re.compile(r'^news-(\d{8})-(\d{3})$')
-    keys = [key for key in redis_client.scan_iter('news-*') if news_pattern.match(key)]
-    if not keys: return []
-    
-    pipe = redis_client.pipeline()
-    for key in keys: pipe.get(key)
-    values = pipe.execute()
-    
-    news_list = []
+    """뉴스(Article) 제목과 요약에 포함된 키워드로 카테고리를 결정합니다. CATEGORIES 순서상 처음 일치하는 카테고리를 사용합니다."""
+    return _category_for_text(_news_text(news_item))
+
+@metrics.timed('categorize_seconds')
+def classify_news(news_item):
+    """카테고리와 국가를 한 번에 판별합니다. 반환값: (카테고리 이름, 국가 또는 None)"""
+    text = _news_text(news_item)
+    return _category_for_text(text), _country_for_text(text)
+
+# 뉴스 키 형식: news-YYYYMMDD-NNN (NNN은 하루 안의 일련번호)
+NEWS_KEY_PATTERN = re.compile(r'^news-(\d{8})-(\d{3})$')
+NEWS_KEYS_PER_DAY = 1000
+
+# 증분 업데이트 상태(high-water mark 등)를 저장하는 키
+NEWS_CACHE_STATE_KEY = 'cache:news:state'
+# 전체 재구성 주기(시간). 과거 날짜로 뒤늦게 추가/수정된 키는 전체 재구성 때 반영됩니다.
+NEWS_FULL_REBUILD_HOURS = int(os.getenv('NEWS_FULL_REBUILD_HOURS', '24'))
+# 전체 기사를 읽을 때 한 번의 MGET으로 가져올 키 수와 SCAN 한 번에 훑을 키 수.
+# 원본 값은 이 묶음 단위로만 메모리에 머뭅니다.
+NEWS_FETCH_BATCH = int(os.getenv('NEWS_FETCH_BATCH', '500'))
+NEWS_SCAN_COUNT = int(os.getenv('NEWS_SCAN_COUNT', '1000'))
+
+def _news_key_date(key):
+    """뉴스 키에서 게시 날짜(UTC 자정)를 추출합니다."""
+    m = NEWS_KEY_PATTERN.match(key or '')
+    if m:
+        return datetime.strptime(m.group(1), "%Y%m%d").replace(tzinfo=timezone.utc)
+    return datetime.min.replace(tzinfo=timezone.utc)
+
+def _news_sort_key(news):
+    return (news.day, news.key)
+
+def _decode_news_item(key, value):
+    """Redis에 저장된 원본 뉴스 값을 캐시에서 사용하는 Article로 변환합니다."""
+    with metrics.timer('decode_seconds', kind='news'):
+        news_item = json.loads(value)
+    news = Article.from_value(key, news_item.get('value', {}))
+
+    if news.category not in _CATEGORY_ID_BY_NAME:
+        # 카테고리를 다시 판별해야 하면 같은 텍스트로 국가도 함께 추론합니다.
+        category, inferred_country = classify_news(news)
+        news.category = category
+        news.country = news.country or inferred_country
+    elif not news.country:
+        # 국가 정보가 없는 경우 제목/요약에서 추론하여 채워 넣습니다. (저장소의 레코드가 항상 같은 값을 갖도록 디코딩 시점에 처리)
+        news.country = infer_country(news)
+    return news
+
+def _decode_news_values(keys, values):
+    """MGET 결과를 디코딩한 기사로 하나씩 내보냅니다. 없어진 키와 해석할 수 없는 값은 건너뜁니다."""
     for key, value in zip(keys, values):
         if not value: continue
         try:
-            news_item = json.loads(value)
-            news_data = news_item.get('value', {})
-            news_data['redis_key'] = key
-            
-            # category와 country 필드를 news_data에 확실하게 포함시킵니다.
-            news_data['country'] = news_item.get('value', {}).get('country')
-            redis_category = news_data.get('category')
-            is_valid = any(redis_category == cat_info['name'] for cat_info in CATEGORIES.values())
-            news_data['category'] = redis_category if is_valid else categorize_news(news_data)
-
-            m = news_pattern.match(key)
-            if m:
-                news_data['_parsed_published_date'] = datetime.strptime(m.group(1), "%Y%m%d").replace(tzinfo=timezone.utc)
-            else:
-                news_data['_parsed_published_date'] = datetime.min.replace(tzinfo=timezone.utc)
-            news_list.append(news_data)
+            yield _decode_news_item(key, value)
         except Exception as e:
             logger.error(f"Error processing key {key}: {e}")
 
-    news_list.sort(key=lambda x: x.get('_parsed_published_date', datetime.min.replace(tzinfo=timezone.utc)), reverse=True)
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def _scan_news_keys():
+    return (key for key in redis_client.scan_iter('news-*', count=NEWS_SCAN_COUNT) if NEWS_KEY_PATTERN.match(key))
+
+def _news_keys_newest_first():
+    """
+    뉴스 키를 최신 날짜부터, 같은 날짜 안에서는 일련번호 역순으로 만듭니다. (_news_sort_key 역순과 같은 순서)
+    SCAN으로는 날짜별 최대 일련번호만 모으므로 키 목록 전체를 메모리에 두지 않습니다. 비어 있는 번호는 MGET에서 None으로 건너뜁니다.
+    """
+    max_seq = {}
+    for key in _scan_news_keys():
+        day, seq = key[5:13], int(key[14:17])
+        if seq > max_seq.get(day, -1):
+            max_seq[day] = seq
+    for day in sorted(max_seq, reverse=True):
+        for seq in range(max_seq[day], -1, -1):
+            yield f"news-{day}-{seq:03d}"
+
+def iter_news_from_redis(newest_first=True, batch_size=None):
+    """
+    원본 뉴스를 batch_size개씩 MGET으로 읽어 디코딩한 기사를 하나씩 내보냅니다.
+    newest_first=True이면 최신 기사부터(fetch_all_news_from_redis와 같은 순서), False이면 SCAN 순서로 내보내며
+    SCAN을 한 번만 하므로 순서가 필요 없는 집계에 더 가볍습니다. 원본 값은 한 묶음 분량만 메모리에 유지됩니다.
+    """
+    if not redis_client: return
+    keys = _news_keys_newest_first() if newest_first else _scan_news_keys()
+    for batch in _batched(keys, batch_size or NEWS_FETCH_BATCH):
+        yield from _decode_news_values(batch, redis_client.mget(batch))
+
+def fetch_all_news_from_redis():
+    """모든 원본 뉴스를 최신순 목록으로 반환합니다. 목록이 필요 없으면 iter_news_from_redis()를 사용하세요."""
+    return list(iter_news_from_redis())
+
+def _last_fetch_day(now):
+    """증분 갱신이 읽는 마지막 날짜. 생산자의 시간대 차이를 고려하여 오늘(UTC)의 다음 날까지 확인합니다."""
+    return now.date() + timedelta(days=1)
+
+def _news_high_water_mark(all_news, now):
+    """
+    다음 증분 갱신의 시작점이 될 high-water mark 키를 구합니다.
+    미래 날짜의 키 하나가 mark를 앞당겨 실제 새 기사를 건너뛰지 않도록 증분 갱신이 읽는 날짜 이후의 키는 무시합니다.
+    """
+    last_date = _last_fetch_day(now).strftime("%Y%m%d")
+    return max((n.key for n in all_news if n.key and n.key[5:13] <= last_date), default=f"news-{now.strftime('%Y%m%d')}-000")
+
+def fetch_news_since(hwm_key):
+    """
+    high-water mark 키의 날짜부터 오늘(UTC)까지의 뉴스만 가져옵니다.
+    전체 키 공간을 SCAN하지 않고, 날짜별 news-YYYYMMDD-000..999 키를 MGET으로 직접 조회합니다.
+    high-water mark가 속한 날짜는 같은 날 추가/수정된 항목을 반영하기 위해 다시 읽습니다.
+    """
+    if not redis_client: return []
+    day = _news_key_date(hwm_key).date()
+    last_day = _last_fetch_day(datetime.now(timezone.utc))
+
+    news_list = []
+    while day <= last_day:
+        date_part = day.strftime("%Y%m%d")
+        keys = [f"news-{date_part}-{n:03d}" for n in range(NEWS_KEYS_PER_DAY)]
+        news_list.extend(_decode_news_values(keys, redis_client.mget(keys)))
+        day += timedelta(days=1)
     return news_list
 
-def update_news_cache():
+def _merge_news(previous_news, new_news):
+    """
+    이전 캐시의 뉴스 목록에 새로 읽은 뉴스를 병합합니다.
+    반환값: (병합된 전체 뉴스 목록, 새로 추가되거나 변경된 뉴스 목록)
+    """
+    merged = {news.key: news for news in previous_news if news.key}
+
+    changed = []
+    for news in new_news:
+        previous = merged.get(news.key)
+        if previous is None or news.to_row() != previous.to_row():
+            changed.append(news)
+        merged[news.key] = news
+
+    all_news = sorted(merged.values(), key=_news_sort_key, reverse=True)
+    return all_news, changed
+
+def _load_news_cache_state():
+    state = redis_client.hgetall(NEWS_CACHE_STATE_KEY)
+    if not state or not NEWS_KEY_PATTERN.match(state.get('hwm', '')):
+        return None
+    # 이전 버전이 미래 날짜 키로 기록한 high-water mark는 버리고 전체 재구성합니다.
+    if state['hwm'][5:13] > _last_fetch_day(datetime.now(timezone.utc)).strftime("%Y%m%d"):
+        return None
+    return state
+
+def _full_rebuild_due(state, now):
+    try:
+        last_full = datetime.fromisoformat(state['last_full_rebuild'])
+    except (KeyError, ValueError):
+        return True
+    return now - last_full >= timedelta(hours=NEWS_FULL_REBUILD_HOURS)
+
+def _category_id(news):
+    """기사의 카테고리 이름을 CATEGORIES의 id로 변환합니다. 알 수 없으면 'others'."""
+    return _CATEGORY_ID_BY_NAME.get(news.category or 'Others', 'others')
+
+def _write_homepage_cache(all_news, changed_news=None):
+    """
+    기사 저장소와 메인 페이지(최신순 기사 키 목록, 소스 목록) 캐시를 저장합니다.
+    전체 재구성이거나 저장소가 없으면 저장소를 다시 만들고, 아니면 추가/변경된 기사만 저장합니다.
+    """
+    if changed_news is None or not article_store.is_built():
+        article_store.replace_all(all_news)
+    elif changed_news:
+        article_store.put(changed_news)
+
+    sorted_sources = sorted({n.source for n in all_news if n.source})
+    # 기사 본문은 저장소에만 두고 여기에는 순서만 저장합니다. 이전 형식의 필드는 지워 두 형식이 함께 남지 않도록 합니다.
+    pipe = redis_bytes_client.pipeline()
+    pipe.hset('cache:homepage', mapping={
+        'article_ids': serialization.dumps([n.key for n in all_news]),
+        'sorted_sources_json': serialization.dumps(sorted_sources)
+    })
+    pipe.hdel('cache:homepage', 'articles', 'categorized_news_json')
+    pipe.execute()
+
+# 트렌드 기간 정의(일 수)와 일별 집계(shard) 설정
+TREND_PERIODS = {'weekly': 7, 'monthly': 30}
+# days= 파라미터로 요청할 수 있는 최대 기간이자 일별 shard 보관 기간
+TREND_MAX_DAYS = int(os.getenv('TREND_MAX_DAYS', '90'))
+TREND_SHARD_KEY = 'cache:trends:day:{}'
+# 트렌드 드릴다운용 인덱스: 기간별 facet(키워드/소스/카테고리/국가) -> 기사 id 목록, 기사 id -> 요약 레코드
+TREND_FACETS = ('all', 'keyword', 'source', 'category', 'country')
+# facet마다 기사 id를 List로 저장하여 한 페이지만 LRANGE로 읽습니다. 현재 facet 이름 목록은 Set으로 관리합니다.
+TREND_FACET_KEY = 'cache:trends:{}:facet:{}'
+TREND_FACET_NAMES_KEY = 'cache:trends:{}:facet_names'
+# 이전 버전이 facet 전체를 JSON으로 한 해시에 저장하던 키 (전체 재구성 시 삭제)
+LEGACY_TREND_FACETS_KEY = 'cache:trends:{}:facets'
+# 이전 버전이 facet 기사 레코드를 따로 저장하던 키 (전체 재구성 시 삭제)
+LEGACY_TREND_NEWS_KEY = 'cache:trends:news'
+TREND_NEWS_FIELDS = ('title', 'link', 'source', 'published', 'category', 'country')
+
+def build_trend_shard(day_news, keyword_counts=None):
+    """
+    하루치 뉴스에 대한 키워드/소스/카테고리/국가 집계를 만듭니다.
+    keyword_counts가 주어지면(미리 병렬로 계산한 경우) 토큰화를 다시 하지 않습니다.
+    """
+    if keyword_counts is None:
+        keyword_counts = keyword_counts_by_group(((None, news_text(news)) for news in day_news), workers=0).get(None, Counter())
+    sources, categories, countries = Counter(), Counter(), Counter()
+    for news in day_news:
+        # 국가 정보가 없는 경우, 제목/요약에서 추론하여 채워넣기
+        if not news.country:
+            news.country = infer_country(news)
+        if news.source: sources[news.source] += 1
+        categories[news.category or 'Others'] += 1
+        if news.country: countries[news.country] += 1
+    return {'article_count': len(day_news), 'keywords': keyword_counts, 'sources': sources, 'categories': categories, 'countries': countries}
+
+def _trend_window_days(days, today):
+    """오늘(UTC)을 포함한 최근 days일의 날짜 문자열(YYYYMMDD) 목록. 미래 날짜 키를 위해 내일도 포함합니다."""
+    return [(today - timedelta(days=offset)).strftime("%Y%m%d") for offset in range(-1, days)]
+
+def _write_trend_shards(all_news, day_strs):
+    """지정된 날짜들의 일별 shard를 다시 계산하여 저장합니다. 뉴스가 없는 날도 빈 shard로 기록합니다."""
+    by_day = {day: [] for day in day_strs}
+    day_by_ordinal = {day_ordinal(f"news-{day}"): day for day in day_strs}
+    for news in all_news:
+        day = day_by_ordinal.get(news.day)
+        if day is not None:
+            by_day[day].append(news)
+
+    # 토큰화는 날짜를 그룹으로 하여 한 번에(기사가 많으면 프로세스 풀에서) 계산합니다.
+    keyword_counts = keyword_counts_by_group((day, news_text(news)) for day, day_news in by_day.items() for news in day_news)
+
+    pipe = redis_client.pipeline()
+    for day, day_news in by_day.items():
+        shard = build_trend_shard(day_news, keyword_counts.get(day, Counter()))
+        pipe.set(TREND_SHARD_KEY.format(day), json.dumps(shard), ex=timedelta(days=TREND_MAX_DAYS + 2))
+    pipe.execute()
+
+def _missing_trend_shard_days(day_strs):
+    pipe = redis_client.pipeline()
+    for day in day_strs: pipe.exists(TREND_SHARD_KEY.format(day))
+    return [day for day, exists in zip(day_strs, pipe.execute()) if not exists]
+
+def merge_trend_shards(days, today=None):
+    """최근 days일의 일별 shard를 합산합니다. 토큰화 없이 Counter 합산만 수행합니다."""
+    today = today or datetime.now(timezone.utc).date()
+    keys = [TREND_SHARD_KEY.format(day) for day in _trend_window_days(days, today)]
+    merged = {'article_count': 0, 'keywords': Counter(), 'sources': Counter(), 'categories': Counter(), 'countries': Counter()}
+    for raw in redis_client.mget(keys):
+        if not raw: continue
+        shard = json.loads(raw)
+        merged['article_count'] += shard.get('article_count', 0)
+        for field in ('keywords', 'sources', 'categories', 'countries'):
+            merged[field].update(shard.get(field, {}))
+    return merged
+
+def _trends_from_shards(merged):
+    return {
+        'top_keywords': [{'keyword': k, 'count': c} for k, c in merged['keywords'].most_common(20)],
+        'source_distribution': [{'source': s, 'count': c} for s, c in merged['sources'].most_common(10)],
+        'category_distribution': [{'category': cat, 'count': c} for cat, c in merged['categories'].most_common()],
+        'country_distribution': [{'country': country, 'count': count} for country, count in merged['countries'].most_common(10)],
+    }
+
+def get_trends_for_days(days):
+    """임의의 기간(days일)에 대한 트렌드 집계를 일별 shard 합산으로 계산합니다."""
+    if not redis_client: return None
+    return local_cache.get('news', f'trends:days:{days}', lambda: (_trends_from_shards(merge_trend_shards(days)), 0))
+
+def _write_trends_cache(all_news, changed_news=None):
+    """
+    일별 shard를 갱신한 뒤, 주간/월간 트렌드를 shard 합산으로 계산하여 저장합니다.
+    changed_news가 주어지면(증분 모드) 해당 뉴스의 날짜와 shard가 없는 날짜만 다시 토큰화합니다.
+    드릴다운 API를 위한 기간별 facet 인덱스(기사 키 목록)도 함께 저장합니다. 기사 레코드는 article_store에서 읽습니다.
+    """
+    today = datetime.now(timezone.utc).date()
+    window = _trend_window_days(TREND_MAX_DAYS, today)
+    if changed_news is None:
+        shard_days = window
+    else:
+        window_set = set(window)
+        changed_days = {day_string(n.day) for n in changed_news}
+        shard_days = sorted((changed_days & window_set) | set(_missing_trend_shard_days(window)))
+    if shard_days:
+        _write_trend_shards(all_news, shard_days)
+        logger.info(f"CACHE_UPDATE_JOB: Rebuilt {len(shard_days)} daily trend shards.")
+
+    for period, days in TREND_PERIODS.items():
+        # 키의 날짜(UTC 자정)가 지금부터 days일 전 시각 이후인 기사
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        cutoff_day = cutoff.toordinal() + (cutoff.time() != datetime.min.time())
+        recent_news = [item for item in all_news if item.day >= cutoff_day]
+        
+        trends_data = { 'top_keywords': [], 'source_distribution': [], 'category_distribution': [], 'country_distribution': [] }
+        facets = {}
+        if recent_news:
+            trends_data.update(_trends_from_shards(merge_trend_shards(days, today)))
+            facets = _build_trend_facets(recent_news, trends_data)
+
+        # 기사 목록은 /api/trends/news에서 페이지 단위로 제공하므로 집계 데이터만 저장합니다.
+        redis_bytes_client.set(f'cache:trends:{period}', serialization.dumps(trends_data))
+        responses.store_response(f'trends:{period}', trends_data)
+        _replace_facet_lists(period, facets)
+
+    if changed_news is None:
+        redis_client.delete(LEGACY_TREND_NEWS_KEY, *(LEGACY_TREND_FACETS_KEY.format(period) for period in TREND_PERIODS))
+
+def _trend_facet_field(facet, value=None):
+    return facet if facet == 'all' else f"{facet}:{value}"
+
+def _build_trend_facets(recent_news, trends_data):
+    """
+    차트 항목(키워드/소스/카테고리/국가)별 기사 id 목록을 미리 계산합니다.
+    키워드는 기존 클라이언트 필터와 같이 제목+요약에 포함되는지로 판단합니다.
+    """
+    facets = {_trend_facet_field('all'): [n.key for n in recent_news]}
+    texts = [(n.key, ((n.title or '') + (n.summary or '')).lower()) for n in recent_news]
+    for item in trends_data['top_keywords']:
+        keyword = item['keyword'].lower()
+        facets[_trend_facet_field('keyword', item['keyword'])] = [key for key, text in texts if keyword in text]
+    for facet, dist_field, news_field in (('source', 'source_distribution', 'source'), ('category', 'category_distribution', 'category'), ('country', 'country_distribution', 'country')):
+        for item in trends_data[dist_field]:
+            value = item[news_field]
+            facets[_trend_facet_field(facet, value)] = [n.key for n in recent_news if getattr(n, news_field) == value]
+    return facets
+
+def _replace_facet_lists(period, facets):
+    """
+    기간의 facet 목록들을 교체합니다. 사라진 facet의 목록도 지우며,
+    MULTI/EXEC 트랜잭션으로 실행하므로 읽는 쪽이 부분적으로 갱신된 데이터를 보지 않습니다.
+    """
+    names_key = TREND_FACET_NAMES_KEY.format(period)
+    stale = redis_client.smembers(names_key) - set(facets)
+    pipe = redis_client.pipeline()
+    for field in stale:
+        pipe.delete(TREND_FACET_KEY.format(period, field))
+    pipe.delete(names_key)
+    for field, ids in facets.items():
+        key = TREND_FACET_KEY.format(period, field)
+        pipe.delete(key)
+        if ids:
+            pipe.rpush(key, *ids)
+    if facets:
+        pipe.sadd(names_key, *facets)
+    pipe.execute()
+
+def get_trend_news_page(period, facet, value=None, cursor=0, limit=20):
+    """
+    트렌드 차트 항목에 해당하는 기사 목록을 페이지 단위로 반환합니다.
+    반환값: {'items': [...], 'next_cursor': 다음 페이지 커서 또는 None, 'total': 전체 개수}
+    """
+    if not redis_client: return None
+    key = TREND_FACET_KEY.format(period, _trend_facet_field(facet, value))
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.lrange(key, cursor, cursor + limit - 1)
+    pipe.llen(key)
+    page_ids, total = pipe.execute()
+    items = [news.to_dict(TREND_NEWS_FIELDS) for news in _hydrate_news(page_ids)]
+    next_cursor = cursor + limit if cursor + limit < total else None
+    return {'items': items, 'next_cursor': next_cursor, 'total': total}
+
+def update_news_cache(full=False, changed_keys=None):
+    """
+    뉴스 캐시(메인 페이지, 트렌드)를 갱신합니다.
+    기본적으로 high-water mark 이후의 키만 읽어 이전 캐시에 병합하는 증분 모드로 동작하며,
+    상태가 없거나 full=True이거나 NEWS_FULL_REBUILD_HOURS가 지나면 전체 키를 다시 읽습니다.
+    changed_keys(변경 이벤트로 받은 키 목록)가 주어지면 high-water mark보다 이전 날짜의 키도 함께 읽어 병합합니다.
+    """
     if not redis_client:
         logger.error("CACHE_UPDATE_JOB: Redis client not available.")
         return
 
-    logger.info("CACHE_UPDATE_JOB: Starting news cache update.")
-    all_news = fetch_all_news_from_redis()
+    now = datetime.now(timezone.utc)
+    today = now.strftime("%Y%m%d")
+    state = None if full else _load_news_cache_state()
+    # 이전 캐시의 기사 목록에 새 기사를 병합합니다.
+    previous = _load_homepage_data() if state and not _full_rebuild_due(state, now) else None
+    if previous and not previous['complete']:
+        logger.warning("CACHE_UPDATE_JOB: Article store is missing cached articles. Falling back to full rebuild.")
+        previous = None
+
+    if previous:
+        logger.info(f"CACHE_UPDATE_JOB: Starting incremental news cache update from {state['hwm']}.")
+        with metrics.timer('cache_job_stage_seconds', job='update_news_cache', stage='fetch'):
+            new_news = fetch_news_since(state['hwm'])
+            if changed_keys:
+                hwm_date = state['hwm'][5:13]
+                new_news += get_news_by_keys([k for k in changed_keys if NEWS_KEY_PATTERN.match(k) and k[5:13] < hwm_date])
+        with metrics.timer('cache_job_stage_seconds', job='update_news_cache', stage='merge'):
+            all_news, changed = _merge_news(previous['articles'], new_news)
+        # 변경된 뉴스가 없고 날짜도 바뀌지 않았다면 트렌드 기간도 그대로이므로 다시 쓸 필요가 없습니다.
+        # (단, 일부 캐시 키나 보조 인덱스가 사라졌거나 홈페이지 캐시가 이전 형식이면 다시 씁니다.)
+        output_keys = CACHE_JOB_KEYS['update_news_cache']
+        if (not changed and state.get('trend_day') == today and not previous['legacy_format']
+                and redis_client.exists(*output_keys) == len(output_keys) and news_index.is_built()):
+            logger.info("CACHE_UPDATE_JOB: No new or changed news items. Cache is up to date.")
+            cache_refresh.record_build('update_news_cache', changed=False)
+            return
+        logger.info(f"CACHE_UPDATE_JOB: Merged {len(changed)} new or changed news items.")
+        last_full_rebuild = state['last_full_rebuild']
+    else:
+        changed = None
+        logger.info("CACHE_UPDATE_JOB: Starting full news cache rebuild.")
+        with metrics.timer('cache_job_stage_seconds', job='update_news_cache', stage='fetch'):
+            all_news = fetch_all_news_from_redis()
+        last_full_rebuild = now.isoformat()
+
     if not all_news:
         logger.warning("CACHE_UPDATE_JOB: No news items to update.")
         return
 
-    # 메인 페이지 데이터
-    categorized_news = {cat_id: [] for cat_id in CATEGORIES.keys()}
-    for news in all_news:
-        cat_name = news.get('category', 'Others')
-        matched_id = next((cid for cid, info in CATEGORIES.items() if info['name'] == cat_name), 'others')
-        categorized_news[matched_id].append(news)
-    
-    sorted_sources = sorted({n['source'] for n in all_news if n.get('source')})
-    
-    homepage_data = {
-        'categorized_news_json': json.dumps(categorized_news, default=str),
-        'sorted_sources_json': json.dumps(sorted_sources)
-    }
-    redis_client.hmset('cache:homepage', homepage_data)
-    
-    # 트렌드 데이터
-    for period in ['weekly', 'monthly']:
-        cutoff = datetime.now(timezone.utc) - timedelta(days=7 if period == 'weekly' else 30)
-        recent_news = [item for item in all_news if item.get('_parsed_published_date', datetime.min.replace(tzinfo=timezone.utc)) >= cutoff]
-        
-        trends_data = { 'top_keywords': [], 'source_distribution': [], 'category_distribution': [], 'country_distribution': [], 'sample_news': [] }
-        if recent_news:
-            # 국가 정보가 없는 경우, 제목/요약에서 추론하여 채워넣기
-            for news in recent_news:
-                if not news.get('country'):
-                    news['country'] = infer_country(news)
-
-            all_words = []
-            for news in recent_news:
-                combined = f"{news.get('title','')} {news.get('summary','')}".lower()
-                cleaned = re.sub(r'[^a-zA-Z\s]', '', combined)
-                tokens = [w for w in word_tokenize(cleaned) if w.isalnum() and w not in stop_words and len(w) > 2]
-                all_words.extend(tokens)
-            
-            common_exclude = {'news','report','world','global','issue','new','says','company','government','country','state','million','billion','week','year','time','people','climate','energy','environmental'}
-            keyword_counts = Counter(w for w in all_words if w not in common_exclude)
-            
-            # 데이터 계산
-            trends_data['top_keywords'] = [{'keyword': k, 'count': c} for k, c in keyword_counts.most_common(20)]
-            trends_data['source_distribution'] = [{'source': s, 'count': c} for s, c in Counter(n['source'] for n in recent_news if 'source' in n).most_common(10)]
-            trends_data['category_distribution'] = [{'category': cat, 'count': c} for cat, c in Counter(n.get('category', 'Others') for n in recent_news).items()]
-            
-            # 국가 분포 계산 로직 추가
-            country_counts = Counter(n['country'] for n in recent_news if n.get('country'))
-            trends_data['country_distribution'] = [{'country': country, 'count': count} for country, count in country_counts.most_common(10)]
-
-            # 샘플 뉴스 제한을 제거하고, 기간 내 모든 뉴스를 전송하여 필터링 정확도 보장
-            trends_data['sample_news'] = recent_news
-
-        redis_client.set(f'cache:trends:{period}', json.dumps(trends_data, default=str))
+    with metrics.timer('cache_job_stage_seconds', job='update_news_cache', stage='homepage'):
+        _write_homepage_cache(all_news, changed)
+    with metrics.timer('cache_job_stage_seconds', job='update_news_cache', stage='trends'):
+        _write_trends_cache(all_news, changed)
+    with metrics.timer('cache_job_stage_seconds', job='update_news_cache', stage='news_index'):
+        _write_news_index(all_news, changed)
+    with metrics.timer('cache_job_stage_seconds', job='update_news_cache', stage='search_index'):
+        _write_search_index(all_news, changed)
+    with metrics.timer('cache_job_stage_seconds', job='update_news_cache', stage='latest_news'):
+        _write_home_latest_news(all_news)
+
+    redis_client.hmset(NEWS_CACHE_STATE_KEY, {
+        'hwm': _news_high_water_mark(all_news, now),
+        'last_full_rebuild': last_full_rebuild,
+        'trend_day': today,
+        'updated_at': now.isoformat()
+    })
+    local_cache.bump_generation('news', 'home')
+    cache_refresh.record_build('update_news_cache')
     logger.info("CACHE_UPDATE_JOB: Finished news cache update.")
 
-def get_cached_homepage_data():
-    """캐시된 홈페이지 데이터를 가져옵니다."""
-    if not redis_client: return None
-    cached_data = redis_client.hgetall('cache:homepage')
-    if not cached_data: return None
-    
+def _news_index_entry(news):
+    return {'key': news.key, 'category': _category_id(news), 'source': news.source, 'country': news.country}
+
+def _write_news_index(all_news, changed_news=None):
+    """뉴스 보조 인덱스를 갱신합니다. 전체 재구성이거나 인덱스가 없으면 다시 만들고, 아니면 변경된 항목만 반영합니다."""
+    if changed_news is None or not news_index.is_built():
+        news_index.rebuild(_news_index_entry(n) for n in all_news)
+    elif changed_news:
+        news_index.index_news(_news_index_entry(n) for n in changed_news)
+
+def rebuild_news_index():
+    """원본 뉴스 키를 모두 읽어 보조 인덱스를 다시 만듭니다. 반환값: 색인된 기사 수"""
+    return news_index.rebuild(_news_index_entry(n) for n in iter_news_from_redis(newest_first=False))
+
+def _write_search_index(all_news, changed_news=None):
+    """
+    기사 검색 색인을 갱신합니다.
+    증분 갱신이면 변경된 기사만, 전체 재구성이면 아직 색인되지 않은 기사를 색인하고 사라진 기사를 제거합니다.
+    """
+    if changed_news is None or not search_index.is_built():
+        indexed = search_index.indexed_ids('news-')
+        current = {n.key for n in all_news if n.key}
+        if indexed - current:
+            search_index.remove_documents(indexed - current)
+        targets = [n for n in all_news if n.key and n.key not in indexed]
+    else:
+        targets = changed_news
+    if targets:
+        count = search_index.index_documents((n.key, news_text(n)) for n in targets)
+        logger.info(f"CACHE_UPDATE_JOB: Indexed {count} news items for search.")
+
+def _write_report_search_index(reindex_all=False, changed_ids=()):
+    """
+    리포트 검색 색인을 갱신합니다. 아직 색인되지 않은 리포트와 종류별 최신 리포트(당일 갱신될 수 있음),
+    변경 이벤트로 받은 리포트(changed_ids)를 색인합니다.
+    """
+    # report.py가 services를 import하므로 순환 import를 피하기 위해 함수 안에서 가져옵니다.
+    from report import load_report_from_redis
+
+    indexed = set() if reindex_all else search_index.indexed_report_ids()
+    current, docs, meta = set(), [], {}
+    for report_type in report_catalog.REPORT_TYPES:
+        for i, date in enumerate(report_catalog.latest_dates(report_type, None)):
+            doc_id = f"{report_type}report-{date.replace('-', '')}"
+            current.add(doc_id)
+            if doc_id in indexed and i > 0 and doc_id not in changed_ids: continue
+            content = load_report_from_redis(doc_id)
+            if not content or not isinstance(content, str): continue
+            text = search_index.strip_html(content)
+            docs.append((doc_id, text))
+            meta[doc_id] = {'title': f"{report_type.capitalize()} Environmental Report {date}", 'snippet': ' '.join(text.split())[:200],
+                            'report_type': report_type, 'date': date}
+    if indexed - current:
+        search_index.remove_documents(indexed - current)
+    if docs:
+        search_index.index_documents(docs, report_meta=meta)
+    logger.info(f"CACHE_REPORTS_JOB: Indexed {len(docs)} reports for search.")
+
+def rebuild_search_index():
+    """검색 색인을 지우고 모든 기사와 리포트를 다시 색인합니다. 반환값: 색인된 문서 수"""
+    search_index.clear()
+    # 기사 전체를 목록으로 만들지 않고 묶음 단위로 토큰화하여 색인합니다. (묶음이 커야 프로세스 풀 병렬 처리가 적용됨)
+    for batch in _batched(iter_news_from_redis(newest_first=False), max(TOKENIZE_PARALLEL_MIN_ITEMS, NEWS_FETCH_BATCH)):
+        search_index.index_documents((n.key, news_text(n)) for n in batch)
+    _write_report_search_index(reindex_all=True)
+    return int(redis_client.hget(search_index.STATS_KEY, 'docs') or 0)
+
+def search_documents(query, page=1, per_page=10):
+    """
+    기사와 리포트를 검색하여 결과 페이지를 반환합니다.
+    반환값: (결과 dict 목록, 전체 결과 수). 기사는 원본 키에서, 리포트는 색인 시 저장한 요약에서 표시 정보를 가져옵니다.
+    """
+    if not redis_client: return [], 0
+    rows, total = search_index.search(query, page, per_page)
+    news_ids = [doc_id for doc_id, _ in rows if doc_id.startswith('news-')]
+    report_ids = [doc_id for doc_id, _ in rows if not doc_id.startswith('news-')]
+    news_by_key = {n.key: n for n in _hydrate_news(news_ids)}
+    report_meta = dict(zip(report_ids, redis_client.hmget(search_index.REPORT_META_KEY, report_ids))) if report_ids else {}
+
+    results = []
+    for doc_id, score in rows:
+        if doc_id in news_by_key:
+            news = news_by_key[doc_id]
+            results.append({'id': doc_id, 'type': 'news', 'score': score, 'title': news.title, 'link': news.link,
+                            'source': news.source, 'published': news.published,
+                            'snippet': (news.summary or '')[:200]})
+        elif report_meta.get(doc_id):
+            meta = json.loads(report_meta[doc_id])
+            results.append({'id': doc_id, 'type': 'report', 'score': score, 'title': meta['title'],
+                            'link': f"/reports/?{meta['report_type']}_date={meta['date']}", 'source': None,
+                            'published': meta['date'], 'snippet': meta['snippet']})
+    return results, total
+
+def get_news_by_keys(keys):
+    """원본 뉴스 키 목록을 한 번의 MGET으로 읽어 같은 순서의 기사 목록으로 반환합니다. 없어진 키는 건너뜁니다."""
+    if not keys: return []
+    return list(_decode_news_values(keys, redis_client.mget(keys)))
+
+def _hydrate_news(keys):
+    """
+    기사 키 목록을 같은 순서의 Article 목록으로 만듭니다. 없어진 키는 건너뜁니다.
+    분류까지 끝난 기사 저장소에서 읽고, 저장소에 없는 키(저장소가 아직 없거나 방금 추가된 기사)만 원본 키에서 읽습니다.
+    """
+    if not keys: return []
+    by_key = {n.key: n for n in article_store.hydrate(keys)}
+    missing = [key for key in keys if key not in by_key]
+    if missing:
+        by_key.update((n.key, n) for n in get_news_by_keys(missing))
+    return [by_key[key] for key in keys if key in by_key]
+
+def query_news_by_category(category_ids, source=None, sort='newest', cursor=None, limit=20):
+    """
+    카테고리별로 소스 필터와 정렬을 적용한 기사 한 페이지씩을 인덱스에서 조회합니다.
+    반환값: {cat_id: (기사 목록, 다음 cursor 또는 None, 조건에 맞는 전체 개수)}
+    """
+    if not redis_client: return {cat_id: ([], None, 0) for cat_id in category_ids}
+    filters = [{'category': cat_id, 'source': source} for cat_id in category_ids]
+    pages = news_index.query_many(filters, sort, cursor, limit)
+    # 인덱스가 사라졌으면(Redis flush 등) 뉴스 캐시 작업을 요청 시점에 실행하고 잠시 기다립니다.
+    if cursor is None and not any(total for _, _, total in pages) and not news_index.is_built():
+        if cache_refresh.ensure('update_news_cache', missing=True):
+            pages = news_index.query_many(filters, sort, cursor, limit)
+    news_by_key = {n.key: n for n in _hydrate_news([key for keys, _, _ in pages for key in keys])}
     return {
-        'categorized_news': json.loads(cached_data['categorized_news_json']),
-        'sorted_sources': json.loads(cached_data['sorted_sources_json'])
+        cat_id: ([news_by_key[key] for key in keys if key in news_by_key], next_cursor, total)
+        for cat_id, (keys, next_cursor, total) in zip(category_ids, pages)
     }
 
-def get_cached_trends_data(period='weekly'):
-    """캐시된 트렌드 데이터를 가져옵니다."""
-    if not redis_client: return None
-    cached_trends = redis_client.get(f'cache:trends:{period}')
-    if not cached_trends: return None
-    
-    return json.loads(cached_trends)
+def get_latest_news(limit=5):
+    """전체 기사 중 최신 limit개를 반환합니다."""
+    if not redis_client: return []
+    keys, _, _ = news_index.query(limit=limit)
+    return _hydrate_news(keys)
 
-def _get_dedicated_redis_client():
-    """리포트 로딩을 위한 전용 Redis 클라이언트를 생성합니다."""
-    try:
-        # report.py의 load_report_from_redis와 호환되도록 decode_responses=False로 설정
-        return redis.StrictRedis.from_url(os.getenv('REDIS_URL'), decode_responses=False)
-    except Exception as e:
-        logger.error(f"Error creating dedicated Redis client for reports: {e}")
+def get_news_sources():
+    """색인된 뉴스 소스 목록(정렬됨)."""
+    if not redis_client: return []
+
+    def _load():
+        sources = news_index.sources()
+        return sources, sum(len(s) for s in sources)
+
+    return local_cache.get('news', 'sources', _load)
+
+# 홈(/) 화면 데이터 묶음: 최신 기사 피드와 최신 일간/주간 리포트 요약을 한 해시에 두어 한 번에 읽습니다.
+HOME_BUNDLE_KEY = 'cache:home'
+LATEST_NEWS_COUNT = int(os.getenv('LATEST_NEWS_COUNT', '20'))
+LATEST_NEWS_FIELDS = ('title', 'link', 'source', 'published', 'category', 'redis_key')
+HOME_REPORT_EXCERPT_CHARS = 200
+
+def _parsed_published(news):
+    """published 문자열(RFC 2822 또는 ISO 8601)을 UTC datetime으로 변환합니다. 실패하면 키의 날짜를 사용합니다."""
+    published = news.published
+    if published:
+        for parse in (parsedate_to_datetime, datetime.fromisoformat):
+            try:
+                parsed = parse(published)
+                return parsed.astimezone(timezone.utc) if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+            except (TypeError, ValueError, OverflowError):
+                continue
+    return _news_key_date(news.key)
+
+def build_latest_news(all_news, count=None):
+    """
+    최신순 목록(키의 날짜 기준)에서 게시 시각 순으로 정렬한 최신 count개를 만듭니다.
+    count번째 기사의 날짜 이후 기사만 게시 시각을 파싱하므로 전체 기사를 파싱하지 않습니다.
+    """
+    count = count or LATEST_NEWS_COUNT
+    if not all_news: return []
+    cutoff = all_news[min(count, len(all_news)) - 1].day
+    candidates = [n for n in all_news if n.day >= cutoff]
+    candidates.sort(key=lambda n: (_parsed_published(n), n.key), reverse=True)
+    return candidates[:count]
+
+def _write_home_latest_news(all_news):
+    # 기사 레코드는 기사 저장소에서 읽으므로 키 목록만 저장하고, 이전 형식(기사 dict 목록) 필드는 지웁니다.
+    pipe = redis_bytes_client.pipeline()
+    pipe.hset(HOME_BUNDLE_KEY, 'latest_news_ids', serialization.dumps([n.key for n in build_latest_news(all_news)]))
+    pipe.hdel(HOME_BUNDLE_KEY, 'latest_news')
+    pipe.execute()
+
+def build_report_summary(dates, content):
+    """
+    홈 화면에 표시할 리포트 날짜와 앞부분(HTML)만 남깁니다.
+    렌더링된 HTML을 자르면 링크 태그가 닫히지 않을 수 있으므로, 텍스트만 남겨 자른 뒤 다시 링크로 변환합니다.
+    """
+    if not dates or not content or not isinstance(content, str):
         return None
+    text = report_render.plain_text(content)
+    truncated = len(text) > HOME_REPORT_EXCERPT_CHARS
+    excerpt = text[:HOME_REPORT_EXCERPT_CHARS]
+    if truncated:
+        # 중간에 잘린 URL은 잘못된 링크가 되고, 잘린 엔티티(&am 등)는 그대로 보이므로 빼 둡니다.
+        last_word_start = max(excerpt.rfind(' '), excerpt.rfind('\n')) + 1
+        if not text[HOME_REPORT_EXCERPT_CHARS].isspace() and excerpt[last_word_start:].startswith(('http://', 'https://')):
+            excerpt = excerpt[:last_word_start]
+        if excerpt.rfind('&') > excerpt.rfind(';'):
+            excerpt = excerpt[:excerpt.rfind('&')]
+    return {
+        'date': dates[0],
+        'excerpt': report_render.linkify(excerpt),
+        'truncated': truncated,
+    }
+
+def _write_home_reports(daily_dates, latest_daily_report, weekly_dates, latest_weekly_report):
+    redis_bytes_client.hset(HOME_BUNDLE_KEY, 'reports', serialization.dumps({
+        'daily': build_report_summary(daily_dates, latest_daily_report),
+        'weekly': build_report_summary(weekly_dates, latest_weekly_report),
+    }))
+
+def _load_home_bundle():
+    cached_data = redis_bytes_client.hgetall(HOME_BUNDLE_KEY)
+    if not cached_data: return None, 0
+    reports = serialization.loads(cached_data.get(b'reports', b'null')) or {}
+    size = sum(len(v) for v in cached_data.values())
+    if b'latest_news_ids' in cached_data:
+        # 기사 저장소가 사라졌어도 빈 목록이 워커 캐시에 남지 않도록 원본 키에서 읽는 _hydrate_news를 사용합니다.
+        latest_news = _hydrate_news(serialization.loads(cached_data[b'latest_news_ids']))
+    else:
+        # 이전 형식(LATEST_NEWS_FIELDS dict 목록). 다음 뉴스 작업이 키 목록으로 다시 씁니다.
+        latest_news = serialization.loads(cached_data.get(b'latest_news', b'[]'))
+    data = {
+        'latest_news': latest_news,
+        'daily_report': reports.get('daily'),
+        'weekly_report': reports.get('weekly'),
+    }
+    return data, size
 
-def _load_report_from_redis_compat(client, key_name):
+def get_home_bundle():
     """
-    report.py의 load_report_from_redis와 호환되는 로직.
-    다양한 포맷(pickle, json, text)을 처리합니다.
+    홈 화면 데이터({'latest_news', 'daily_report', 'weekly_report'})를 한 번의 HGETALL로 읽습니다.
+    워커 내에 캐시되며 뉴스/리포트 작업이 갱신하면 무효화됩니다. 반환된 객체는 수정하면 안 됩니다.
     """
-    if not client: return None
-    raw = client.get(key_name)
-    if not raw: return None
+    if not redis_client: return None
+    return _read_with_refresh('update_news_cache', lambda: local_cache.get('home', 'bundle', _load_home_bundle))
 
-    # 1) pickle 시도
-    try:
-        # pickle은 bytes 객체를 필요로 하므로 raw를 그대로 사용
-        return pickle.loads(raw)
-    except Exception:
-        pass
+def _load_homepage_data():
+    """
+    증분 갱신에 사용할 이전 홈페이지 캐시의 기사 목록(최신순)을 읽습니다. 캐시가 없으면 None.
+    반환값: {'articles', 'legacy_format'(이전 형식 여부), 'complete'(저장소에 모든 기사가 있는지)}
+    """
+    cached_data = redis_bytes_client.hgetall('cache:homepage')
+    if not cached_data: return None
 
-    # decode는 pickle 시도 후 한 번만 수행
-    try:
-        text = raw.decode('utf-8')
-    except UnicodeDecodeError:
-        logger.warning(f"Could not decode key {key_name} as utf-8. Skipping JSON/text parsing.")
-        return None # 또는 다른 대체 텍스트
+    legacy_format = b'article_ids' not in cached_data
+    complete = True
+    if not legacy_format:
+        article_ids = serialization.loads(cached_data[b'article_ids'])
+        articles = article_store.hydrate(article_ids)
+        # 저장소가 사라졌거나(Redis flush 등) 일부 기사가 빠졌으면 다음 뉴스 작업이 전체를 다시 만듭니다.
+        complete = len(articles) == len(article_ids)
+    elif b'articles' in cached_data:
+        # 이전 형식(Article 행 목록). 다음 뉴스 작업이 새 형식으로 다시 씁니다.
+        articles = [Article.from_row(row) for row in serialization.loads(cached_data[b'articles'])]
+    else:
+        # 이전 형식(카테고리별 dict 목록). 다음 뉴스 작업이 새 형식으로 다시 씁니다.
+        articles = [Article.from_value(news['redis_key'], news)
+                    for news_list in serialization.loads(cached_data[b'categorized_news_json']).values()
+                    for news in news_list if news.get('redis_key')]
+        articles.sort(key=_news_sort_key, reverse=True)
+    return {'articles': articles, 'legacy_format': legacy_format, 'complete': complete}
 
-    # 2) JSON 시도
-    try:
-        import json
-        return json.loads(text)
-    except Exception:
-        pass
+def get_cached_trends_data(period='weekly'):
+    """캐시된 트렌드 데이터를 가져옵니다."""
+    if not redis_client: return None
+
+    def _load():
+        cached_trends = redis_bytes_client.get(f'cache:trends:{period}')
+        if not cached_trends: return None, 0
+        return serialization.loads(cached_trends), len(cached_trends)
 
-    # 3) 단순 텍스트: 줄바꿈을 <br>로 변환하여 반환
-    return text.replace('\n', '<br>')
+    return _read_with_refresh('update_news_cache', lambda: local_cache.get('news', f'trends:{period}', _load))
 
-def update_reports_cache():
-    """Reports 페이지에 필요한 데이터를 미리 계산하여 캐시에 저장합니다."""
+def update_reports_cache(changed_keys=None):
+    """
+    Reports 페이지에 필요한 데이터를 미리 계산하여 캐시에 저장합니다.
+    changed_keys(변경 이벤트로 받은 리포트 키 목록)가 주어지면 카탈로그에 바로 반영하고, 해당 리포트의 응답과 검색 색인을 다시 만듭니다.
+    """
     if not redis_client:
         logger.error("CACHE_REPORTS_JOB: Redis client not available.")
         return
 
     logger.info("CACHE_REPORTS_JOB: Starting reports cache update.")
     
-    report_client = _get_dedicated_redis_client()
-    if not report_client:
-        logger.error("CACHE_REPORTS_JOB: Could not create dedicated redis client for reports.")
-        return
-
-    def _get_all_dates_from_redis(prefix):
-        """지정된 prefix를 가진 모든 키에서 날짜를 추출합니다."""
-        # report_client는 bytes를 반환하므로 decode가 필요합니다.
-        keys = sorted(report_client.keys(f"{prefix}*"), reverse=True)
-        logger.info(f"CACHE_REPORTS_JOB: Found {len(keys)} keys for prefix '{prefix}'. Sample: {[k.decode('utf-8') for k in keys[:3]]}")
-        dates = []
-        for k in keys:
-            date_part = k.decode('utf-8')[len(prefix):]
-            if len(date_part) == 8 and date_part.isdigit():
-                dates.append(f"{date_part[0:4]}-{date_part[4:6]}-{date_part[6:8]}")
-        return dates
-
-    daily_dates = _get_all_dates_from_redis("dailyreport-")
-    weekly_dates = _get_all_dates_from_redis("weeklyreport-")
-    monthly_dates = _get_all_dates_from_redis("monthlyreport-")
-
-    latest_daily_report = None
-    if daily_dates:
-        # 키 이름은 utf-8 문자열이어야 합니다.
-        key_name = f"dailyreport-{daily_dates[0].replace('-', '')}"
-        latest_daily_report = _load_report_from_redis_compat(report_client, key_name)
-        logger.info(f"CACHE_REPORTS_JOB: Loaded daily report for key '{key_name}'. Type: {type(latest_daily_report)}, Length: {len(latest_daily_report) if latest_daily_report is not None else 0}")
-
-    latest_weekly_report = None
-    if weekly_dates:
-        key_name = f"weeklyreport-{weekly_dates[0].replace('-', '')}"
-        latest_weekly_report = _load_report_from_redis_compat(report_client, key_name)
-        logger.info(f"CACHE_REPORTS_JOB: Loaded weekly report for key '{key_name}'. Type: {type(latest_weekly_report)}, Length: {len(latest_weekly_report) if latest_weekly_report is not None else 0}")
-
-    latest_monthly_report = None
-    if monthly_dates:
-        key_name = f"monthlyreport-{monthly_dates[0].replace('-', '')}"
-        latest_monthly_report = _load_report_from_redis_compat(report_client, key_name)
-        logger.info(f"CACHE_REPORTS_JOB: Loaded monthly report for key '{key_name}'. Type: {type(latest_monthly_report)}, Length: {len(latest_monthly_report) if latest_monthly_report is not None else 0}")
+    # KEYS 대신 카탈로그(Sorted Set)를 실제 키와 맞춘 뒤 최신 날짜만 범위 조회합니다.
+    # 캐시에는 첫 페이지 분량만 저장하며, 이후 페이지는 /reports/에서 카탈로그를 직접 조회합니다.
+    changed = set(changed_keys or ())
+    with metrics.timer('cache_job_stage_seconds', job='update_reports_cache', stage='catalog'):
+        if changed:
+            report_catalog.apply_changes(changed)
+        report_catalog.reconcile()
+    daily_dates = report_catalog.latest_dates('daily', REPORT_PRERENDER_COUNT)
+    weekly_dates = report_catalog.latest_dates('weekly', REPORT_PRERENDER_COUNT)
+    monthly_dates = report_catalog.latest_dates('monthly', REPORT_PRERENDER_COUNT)
+    logger.info(f"CACHE_REPORTS_JOB: Latest dates from catalog. daily: {daily_dates[:3]}, weekly: {weekly_dates[:3]}, monthly: {monthly_dates[:3]}")
+
+    # 최신 리포트와 변경된 리포트 중 원본이 바뀐 것만 다시 렌더링(형식 판별, 링크 변환)하여 저장합니다.
+    latest_keys = {report_type: f"{report_type}report-{dates[0].replace('-', '')}"
+                   for report_type, dates in (('daily', daily_dates), ('weekly', weekly_dates), ('monthly', monthly_dates)) if dates}
+    with metrics.timer('cache_job_stage_seconds', job='update_reports_cache', stage='render'):
+        rendered = report_render.render_reports(list(latest_keys.values()) + sorted(changed))
+    latest_daily_report = rendered.get(latest_keys.get('daily'))
+    latest_weekly_report = rendered.get(latest_keys.get('weekly'))
+    latest_monthly_report = rendered.get(latest_keys.get('monthly'))
+    for report_type, key_name in latest_keys.items():
+        content = rendered.get(key_name)
+        logger.info(f"CACHE_REPORTS_JOB: Loaded {report_type} report for key '{key_name}'. Type: {type(content)}, Length: {len(content) if content is not None else 0}")
 
     reports_page_data = {
-        # json.dumps는 python 객체를 string으로 직렬화합니다.
-        "daily_dates": json.dumps(daily_dates),
-        "weekly_dates": json.dumps(weekly_dates),
-        "monthly_dates": json.dumps(monthly_dates),
-        "latest_daily_report": json.dumps(latest_daily_report, default=str),
-        "latest_weekly_report": json.dumps(latest_weekly_report, default=str),
-        "latest_monthly_report": json.dumps(latest_monthly_report, default=str)
+        # serialization.dumps는 python 객체를 헤더가 붙은 bytes로 직렬화합니다.
+        "daily_dates": serialization.dumps(daily_dates),
+        "weekly_dates": serialization.dumps(weekly_dates),
+        "monthly_dates": serialization.dumps(monthly_dates),
+        "latest_daily_report": serialization.dumps(latest_daily_report),
+        "latest_weekly_report": serialization.dumps(latest_weekly_report),
+        "latest_monthly_report": serialization.dumps(latest_monthly_report)
     }
     
-    # hmset을 사용할 때는 value가 string이어야 합니다.
-    redis_client.hmset('cache:reports_page', reports_page_data)
+    with metrics.timer('cache_job_stage_seconds', job='update_reports_cache', stage='reports_page'):
+        redis_bytes_client.hset('cache:reports_page', mapping=reports_page_data)
+        _write_home_reports(daily_dates, latest_daily_report, weekly_dates, latest_weekly_report)
+    with metrics.timer('cache_job_stage_seconds', job='update_reports_cache', stage='responses'):
+        _prerender_report_responses({'daily': daily_dates, 'weekly': weekly_dates, 'monthly': monthly_dates}, changed)
+    with metrics.timer('cache_job_stage_seconds', job='update_reports_cache', stage='search_index'):
+        _write_report_search_index(changed_ids=changed)
+    local_cache.bump_generation('reports', 'home')
+    cache_refresh.record_build('update_reports_cache')
     logger.info("CACHE_REPORTS_JOB: Finished reports cache update.")
 
-def get_cached_reports_data():
-    """캐시된 Reports 페이지 데이터를 가져옵니다."""
-    if not redis_client: return (None,) * 6
-    
+def _load_reports_data():
+    """Redis에서 Reports 페이지 캐시를 읽어 디코딩합니다. 반환값: (6개 항목 튜플 또는 None, 원본 크기)"""
     try:
-        cached_data = redis_client.hgetall('cache:reports_page')
+        cached_data = redis_bytes_client.hgetall('cache:reports_page')
         logger.info(f"GET_CACHED_REPORTS: Fetched raw cache data. Is None: {cached_data is None}")
     except redis.exceptions.ResponseError as e:
         if "WRONGTYPE" in str(e):
             logger.warning(
                 "Deleting 'cache:reports_page' key due to WRONGTYPE error. "
-                "The key will be regenerated by the next cache update."
+                "It will be restored from the last-known-good snapshot or rebuilt on demand."
             )
             redis_client.delete('cache:reports_page')
-            return (None,) * 6
+            return None, 0
         else:
             logger.error(f"An unexpected Redis error occurred in get_cached_reports_data: {e}")
             raise
 
     if not cached_data: 
         logger.warning("GET_CACHED_REPORTS: No cached data found, returning empty tuple.")
-        return (None,) * 6
+        return None, 0
 
     try:
-        daily_dates = json.loads(cached_data.get('daily_dates', b'[]'))
-        weekly_dates = json.loads(cached_data.get('weekly_dates', b'[]'))
-        monthly_dates = json.loads(cached_data.get('monthly_dates', b'[]'))
-        latest_daily_report = json.loads(cached_data.get('latest_daily_report', b'null'))
-        latest_weekly_report = json.loads(cached_data.get('latest_weekly_report', b'null'))
-        latest_monthly_report = json.loads(cached_data.get('latest_monthly_report', b'null'))
+        daily_dates = serialization.loads(cached_data.get(b'daily_dates', b'[]'))
+        weekly_dates = serialization.loads(cached_data.get(b'weekly_dates', b'[]'))
+        monthly_dates = serialization.loads(cached_data.get(b'monthly_dates', b'[]'))
+        latest_daily_report = serialization.loads(cached_data.get(b'latest_daily_report', b'null'))
+        latest_weekly_report = serialization.loads(cached_data.get(b'latest_weekly_report', b'null'))
+        latest_monthly_report = serialization.loads(cached_data.get(b'latest_monthly_report', b'null'))
         
         logger.info(f"GET_CACHED_REPORTS: Parsed data. Daily dates count: {len(daily_dates) if daily_dates is not None else 'None'}. Latest daily is None: {latest_daily_report is None}. Latest weekly is None: {latest_weekly_report is None}. Latest monthly is None: {latest_monthly_report is None}")
 
-        return daily_dates, weekly_dates, monthly_dates, latest_daily_report, latest_weekly_report, latest_monthly_report
-    except (json.JSONDecodeError, TypeError) as e:
+        data = (daily_dates, weekly_dates, monthly_dates, latest_daily_report, latest_weekly_report, latest_monthly_report)
+        return data, sum(len(v) for v in cached_data.values())
+    except (ValueError, TypeError) as e:
         logger.error(f"GET_CACHED_REPORTS: Error decoding cached reports data: {e}")
-        return (None,) * 6 
\ No newline at end of file
+        return None, 0
+
+# 리포트 API 응답을 미리 만들어 둘 최근 날짜 수 (reports 페이지의 한 페이지 분량)
+REPORT_PRERENDER_COUNT = 20
+
+def _prerender_report_responses(dates_by_type, changed_keys=()):
+    """
+    최근 리포트들의 /reports/api 응답을 미리 직렬화해 둡니다.
+    가장 최신 리포트와 변경 이벤트로 받은 리포트(changed_keys)는 항상 다시 만들고, 나머지는 없을 때만 만듭니다.
+    """
+    # report.py가 services를 import하므로 순환 import를 피하기 위해 함수 안에서 가져옵니다.
+    from report import load_report_from_redis
+
+    rendered = 0
+    for report_type, dates in dates_by_type.items():
+        key_dates = [d.replace('-', '') for d in dates[:REPORT_PRERENDER_COUNT]]
+        if not key_dates: continue
+        exists = responses.has_response([f'reports:{report_type}:{d}' for d in key_dates])
+        for i, (key_date, already) in enumerate(zip(key_dates, exists)):
+            report_key = f"{report_type}report-{key_date}"
+            if already and i > 0 and report_key not in changed_keys: continue
+            content = load_report_from_redis(report_key)
+            if content:
+                responses.store_report_response(report_type, key_date, content)
+                rendered += 1
+    # 미리 만드는 범위 밖의 리포트가 수정되었으면 요청 시 저장된 이전 응답을 덮어씁니다.
+    window = {f"{report_type}report-{d.replace('-', '')}" for report_type, dates in dates_by_type.items() for d in dates[:REPORT_PRERENDER_COUNT]}
+    for report_key in sorted(set(changed_keys) - window):
+        report_type, key_date = report_key.split('report-', 1)
+        content = load_report_from_redis(report_key)
+        if content and responses.has_response([f'reports:{report_type}:{key_date}'])[0]:
+            responses.store_report_response(report_type, key_date, content)
+            rendered += 1
+    logger.info(f"CACHE_REPORTS_JOB: Pre-rendered {rendered} report API responses.")
+
+def get_cached_reports_data():
+    """캐시된 Reports 페이지 데이터를 가져옵니다. 반환된 객체는 워커 내에서 공유되므로 수정하면 안 됩니다."""
+    if not redis_client: return (None,) * 6
+    return _read_with_refresh('update_reports_cache', lambda: local_cache.get('reports', 'reports_page', _load_reports_data)) or (None,) * 6
+
+# 스케줄러에 등록되는 캐시 작업 정의: (작업 ID, 함수, 결과 캐시 키, 이름)
+CACHE_JOBS = [
+    ('update_news_cache', update_news_cache, 'cache:homepage', 'Periodic News Cache Update'),
+    ('update_reports_cache', update_reports_cache, 'cache:reports_page', 'Periodic Reports Cache Update'),
+]
+CACHE_JOB_INTERVAL = timedelta(minutes=30)
+# 원본 키 변경 이벤트의 종류별로 실행할 작업 (cache_events 참고). 작업 함수는 changed_keys 인자를 받습니다.
+CACHE_EVENT_JOBS = {
+    'news': ('update_news_cache', update_news_cache),
+    'reports': ('update_reports_cache', update_reports_cache),
+}
+# 작업별로 만드는 캐시 키. 요청 시 없으면 마지막 정상본에서 복원하고 작업을 다시 실행합니다. (cache_refresh 참고)
+# 키마다 스냅샷을 저장하는 작업은 하나여야 합니다. 홈 화면 묶음의 'reports' 필드는 리포트 작업도 쓰지만,
+# 묶음을 읽는 get_home_bundle()이 뉴스 작업으로 복구하므로 뉴스 작업에만 둡니다.
+CACHE_JOB_KEYS = {
+    'update_news_cache': ('cache:homepage', article_store.ARTICLES_KEY, 'cache:trends:weekly', 'cache:trends:monthly', HOME_BUNDLE_KEY,
+                          responses.RESPONSE_KEY.format('trends:weekly'), responses.RESPONSE_KEY.format('trends:monthly')),
+    'update_reports_cache': ('cache:reports_page',),
+}
+for _job_id, _func, _, _ in CACHE_JOBS:
+    cache_refresh.register(_job_id, _func, CACHE_JOB_KEYS[_job_id], CACHE_JOB_INTERVAL)
+
+def _read_with_refresh(job_id, read):
+    """
+    캐시를 읽고, 없거나 만료되었으면 cache_refresh로 복원/재실행을 요청한 뒤 한 번 더 읽습니다.
+    soft 만료된 데이터는 그대로 반환하며 갱신은 백그라운드에서 진행됩니다.
+    """
+    value = read()
+    if cache_refresh.ensure(job_id, missing=value is None):
+        value = read()
+    return value
@@ -0,0 +1,79 @@
+from flask import Blueprint, Response, request, jsonify, abort
+import hmac
+import logging
+import math
+import os
+
+from extensions import redis_client
+import leader
+import profiler
+import report_catalog
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
+logger = logging.getLogger(__name__)
+
+# 관리자 라우트 인증 토큰. 설정하지 않으면 관리자 라우트 전체가 404를 반환합니다.
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
+@admin_bp.before_request
+def require_admin_token():
+    """'Authorization: Bearer <ADMIN_TOKEN>' 헤더가 없으면 요청을 거부합니다."""
+    if not ADMIN_TOKEN:
+        abort(404)
+    supplied = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(supplied.encode('utf-8'), f'Bearer {ADMIN_TOKEN}'.encode('utf-8')):
+        logger.warning(f"ADMIN: Rejected unauthorized request to {request.path} from {request.remote_addr}")
+        abort(401)
+
+@admin_bp.route('/profile')
+def profile():
+    """
+    이 요청을 받은 워커 프로세스를 샘플링 프로파일링합니다.
+    /admin/profile?seconds=10&interval_ms=10&thread=<스레드 이름 일부>&lines=1
+    요청은 seconds초(최대 PROFILE_MAX_SECONDS) 동안 대기한 뒤 collapsed stack 텍스트를 반환합니다.
+    캐시 작업은 리더 워커의 스케줄러 스레드에서 실행되므로 X-Profile-Leader 헤더로 리더 여부를 확인하세요.
+    """
+    seconds = request.args.get('seconds', 10, type=float)
+    interval = request.args.get('interval_ms', 10, type=float) / 1000
+    thread_filter = request.args.get('thread') or None
+    lines = request.args.get('lines') == '1'
+    if not (math.isfinite(seconds) and math.isfinite(interval)):
+        return jsonify({'error': 'seconds and interval_ms must be finite numbers.'}), 400
+
+    logger.info(f"ADMIN: Profiling pid {os.getpid()} for {seconds}s (interval {interval}s, thread filter {thread_filter!r}).")
+    result = profiler.sample(seconds, interval, thread_filter, lines)
+    if result is None:
+        return jsonify({'error': 'Another profile is already running in this worker.'}), 409
+
+    stacks, ticks = result
+    response = Response(profiler.collapsed(stacks), mimetype='text/plain')
+    response.headers['X-Profile-Pid'] = str(os.getpid())
+    response.headers['X-Profile-Samples'] = str(ticks)
+    response.headers['X-Profile-Leader'] = 'true' if leader.is_leader() else 'false'
+    return response
+
+@admin_bp.route('/redis-reports')
+def redis_reports():
+    """리포트 카탈로그의 유형별 개수와 최신 키 20개를 반환합니다. (Redis 연결 진단용)"""
+    if not redis_client:
+        return jsonify({"error": "Redis client not available."}), 500
+    try:
+        redis_client.ping()
+    except Exception as e:
+        logger.error(f"ADMIN: Could not connect to Redis: {e}")
+        return jsonify({"error": f"Could not connect to Redis: {e}"}), 500
+
+    try:
+        # KEYS 대신 리포트 카탈로그에서 개수와 최신 키를 조회
+        catalog_pages = report_catalog.pages({t: 1 for t in report_catalog.REPORT_TYPES}, 20)
+        found_keys = {
+            f"{report_type}report-": {
+                "count": count,
+                "keys": [f"{report_type}report-{d.replace('-', '')}" for d in dates]
+            }
+            for report_type, (dates, count) in catalog_pages.items()
+        }
+        return jsonify(found_keys)
+    except Exception as e:
+        logger.error(f"ADMIN: Error while reading report catalog: {e}")
+        return jsonify({"error": f"Error while reading report catalog: {e}"}), 500
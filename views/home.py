@@ -1,36 +1,29 @@
 from flask import Blueprint, render_template
-from services import get_cached_reports_data, get_cached_homepage_data
+from services import get_home_bundle, get_cached_reports_data, get_latest_news, build_report_summary
 
 home_bp = Blueprint('home', __name__)
 
 @home_bp.route('/')
 def home():
-    # Get latest reports
-    (
-        all_daily_dates, all_weekly_dates, all_monthly_dates,
-        latest_daily_report, latest_weekly_report, latest_monthly_report
-    ) = get_cached_reports_data()
-
-    latest_daily_date = all_daily_dates[0] if all_daily_dates else None
-    latest_daily_report_content = latest_daily_report if latest_daily_report else None
-    latest_weekly_date = all_weekly_dates[0] if all_weekly_dates else None
-    latest_weekly_report_content = latest_weekly_report if latest_weekly_report else None
-
-    # Get latest news (for featured reports)
-    homepage_data = get_cached_homepage_data()
-    latest_news = []
-    if homepage_data:
-        all_news = []
-        for news_list in homepage_data['categorized_news'].values():
-            all_news.extend(news_list)
-        all_news.sort(key=lambda n: n.get('published', ''), reverse=True)
-        latest_news = all_news[:5]
+    # 뉴스/리포트 작업이 미리 만들어 둔 홈 화면 묶음(최신 기사 + 최신 리포트 요약)을 한 번에 읽음
+    bundle = get_home_bundle()
+    if bundle:
+        latest_news = bundle['latest_news'][:5]
+        daily_report = bundle['daily_report']
+        weekly_report = bundle['weekly_report']
+    else:
+        # 묶음이 아직 없으면(첫 캐시 작업 전) 개별 캐시에서 만듦
+        (
+            all_daily_dates, all_weekly_dates, _,
+            latest_daily_report, latest_weekly_report, _
+        ) = get_cached_reports_data()
+        daily_report = build_report_summary(all_daily_dates, latest_daily_report)
+        weekly_report = build_report_summary(all_weekly_dates, latest_weekly_report)
+        latest_news = get_latest_news(5)
 
     return render_template(
         'home.html',
-        latest_daily_date=latest_daily_date,
-        latest_daily_report=latest_daily_report_content,
-        latest_weekly_date=latest_weekly_date,
-        latest_weekly_report=latest_weekly_report_content,
+        daily_report=daily_report,
+        weekly_report=weekly_report,
         latest_news=latest_news
-    ) 
\ No newline at end of file
+    )
@@ -1,51 +1,42 @@
-from flask import Blueprint, render_template, request
+from flask import Blueprint, render_template, request, jsonify
 import logging
-import json
+import os
 
-from services import get_cached_homepage_data, CATEGORIES
+from services import query_news_by_category, get_news_sources, CATEGORIES
 
 main_bp = Blueprint('main', __name__, url_prefix='/news')
 logger = logging.getLogger(__name__)
 
+# 첫 화면에 카테고리별로 렌더링하는 기사 수 (3개는 바로 보이고 나머지는 펼치면 표시)
+NEWS_INITIAL_PER_CATEGORY = int(os.getenv('NEWS_INITIAL_PER_CATEGORY', '9'))
+# "더 불러오기" 한 번에 가져오는 기사 수
+NEWS_PAGE_SIZE = int(os.getenv('NEWS_PAGE_SIZE', '30'))
+NEWS_PAGE_MAX = 100
+NEWS_CARD_FIELDS = ('title', 'link', 'source', 'published', 'image_url')
+
+def _news_card(news):
+    """더 불러오기 응답용으로 카드 렌더링에 필요한 필드만 남깁니다."""
+    card = news.to_dict(NEWS_CARD_FIELDS)
+    card['summary'] = (news.summary or 'No summary available')[:150]
+    return card
+
 @main_bp.route('/')
 def index():
     """
-    뉴스 페이지를 렌더링합니다. 캐시된 데이터를 사용하고, 요청된 필터링/정렬을 적용합니다.
+    뉴스 페이지를 렌더링합니다. 보조 인덱스를 사용하여 요청된 필터링/정렬을 적용합니다.
     """
     try:
         current_category = request.args.get('category', '')
         current_source = request.args.get('source', '')
         current_sort = request.args.get('sort', 'newest')
 
-        cached_data = get_cached_homepage_data()
-        
-        if cached_data:
-            logger.info("Serving homepage from cache.")
-            categorized_news = cached_data['categorized_news']
-            sorted_sources = cached_data['sorted_sources']
-            
-            # 필터링 로직 (카테고리)
-            if current_category and current_category in categorized_news:
-                 categorized_news = {current_category: categorized_news[current_category]}
-
-            # 필터링 로직 (소스)
-            if current_source:
-                filtered_by_source = {}
-                for cat_id, news_list in categorized_news.items():
-                    filtered_list = [news for news in news_list if news.get('source') == current_source]
-                    if filtered_list:
-                        filtered_by_source[cat_id] = filtered_list
-                categorized_news = filtered_by_source
-            
-            # 정렬 로직
-            if current_sort == 'oldest':
-                for cat_id in categorized_news:
-                    categorized_news[cat_id].reverse() # 이미 최신순이므로 reverse()만 하면 됨
-
-        else:
-            logger.warning("Homepage cache is empty. Falling back to empty data.")
-            categorized_news = {cat_id: [] for cat_id in CATEGORIES.keys()}
-            sorted_sources = []
+        # 카테고리/소스 필터와 정렬은 보조 인덱스(Sorted Set)에서 처리하고, 각 카테고리의 첫 페이지만 읽습니다.
+        # 이후 기사는 /news/api로 cursor를 넘겨 가져옵니다.
+        category_ids = [current_category] if current_category in CATEGORIES else list(CATEGORIES.keys())
+        pages = query_news_by_category(category_ids, source=current_source or None, sort=current_sort, limit=NEWS_INITIAL_PER_CATEGORY)
+        categorized_news = {cat_id: news_list for cat_id, (news_list, _, _) in pages.items()}
+        next_cursors = {cat_id: next_cursor for cat_id, (_, next_cursor, _) in pages.items() if next_cursor}
+        sorted_sources = get_news_sources()
 
         category_names = {cat_id: info['name'] for cat_id, info in CATEGORIES.items()}
         
@@ -53,10 +44,32 @@ def index():
                                categorized_news=categorized_news,
                                categories=category_names,
                                sorted_sources=sorted_sources,
+                               next_cursors=next_cursors,
                                current_category=current_category,
                                current_source=current_source,
                                current_sort=current_sort)
     except Exception as e:
         logger.error(f"Error rendering main page: {e}", exc_info=True)
         # 프로덕션에서는 더 사용자 친화적인 에러 페이지를 보여줘야 합니다.
-        return "An error occurred while loading the page.", 500 
\ No newline at end of file
+        return "An error occurred while loading the page.", 500 
+
+@main_bp.route('/api')
+def news_api():
+    """
+    더 불러오기용 JSON: /news/api?category=<cat_id>&source=&sort=newest|oldest&cursor=&limit=
+    반환값: {'items': [...], 'next_cursor': 다음 요청에 넘길 값 또는 null, 'total': 조건에 맞는 전체 기사 수}
+    """
+    category = request.args.get('category', '')
+    if category not in CATEGORIES:
+        return jsonify({'error': 'Invalid category'}), 400
+    source = request.args.get('source') or None
+    sort = 'oldest' if request.args.get('sort') == 'oldest' else 'newest'
+    cursor = request.args.get('cursor', type=int)
+    limit = min(max(request.args.get('limit', NEWS_PAGE_SIZE, type=int), 1), NEWS_PAGE_MAX)
+
+    news_list, next_cursor, total = query_news_by_category([category], source=source, sort=sort, cursor=cursor, limit=limit)[category]
+    return jsonify({
+        'items': [_news_card(news) for news in news_list],
+        'next_cursor': str(next_cursor) if next_cursor else None,
+        'total': total,
+    })
@@ -0,0 +1,37 @@
+from flask import Blueprint, request, jsonify
+import logging
+import time
+
+from services import search_documents
+
+search_bp = Blueprint('search', __name__)
+logger = logging.getLogger(__name__)
+
+SEARCH_PER_PAGE_MAX = 50
+
+@search_bp.route('/api/search')
+def search_api():
+    """
+    기사/리포트 전문 검색: /api/search?q=<검색어>&page=1&per_page=10
+    BM25 점수 순으로 정렬된 결과 한 페이지를 반환합니다.
+    """
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 10, type=int), 1), SEARCH_PER_PAGE_MAX)
+    if not query:
+        return jsonify({'error': 'Missing query parameter q'}), 400
+
+    start = time.perf_counter()
+    try:
+        results, total = search_documents(query, page, per_page)
+    except Exception as e:
+        logger.error(f"Error searching for '{query}': {e}", exc_info=True)
+        return jsonify({'error': 'Search failed'}), 500
+    return jsonify({
+        'query': query,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'results': results,
+        'took_ms': round((time.perf_counter() - start) * 1000, 2),
+    })
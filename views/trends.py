@@ -2,7 +2,8 @@
 from flask import Blueprint, render_template, jsonify, request
 import logging
 
-from services import get_cached_trends_data
+from responses import cached_response
+from services import get_cached_trends_data, get_trends_for_days, get_trend_news_page, TREND_MAX_DAYS, TREND_PERIODS, TREND_FACETS
 
 trends_bp = Blueprint('trends', __name__)
 logger = logging.getLogger(__name__)
@@ -19,12 +20,31 @@ def get_trends():
     """
     캐시된 트렌드 데이터를 API 형태로 제공합니다.
     주간(weekly) 또는 월간(monthly) 데이터를 선택할 수 있습니다.
+    days 파라미터를 주면 일별 집계를 합산하여 임의의 기간(최대 TREND_MAX_DAYS일)의 집계를 반환합니다.
     """
+    days = request.args.get('days', type=int)
+    if days is not None:
+        if not 1 <= days <= TREND_MAX_DAYS:
+            return jsonify({"error": f"Invalid days specified. Use a value between 1 and {TREND_MAX_DAYS}."}), 400
+        try:
+            trends_data = get_trends_for_days(days)
+            if trends_data is None:
+                return jsonify({"error": "Trends data is not available."}), 503
+            return jsonify(dict(trends_data, days=days))
+        except Exception as e:
+            logger.error(f"Error computing {days}-day trends data: {e}", exc_info=True)
+            return jsonify({"error": "An internal error occurred while fetching trends data."}), 500
+
     period = request.args.get('period', 'weekly')
     if period not in ['weekly', 'monthly']:
         return jsonify({"error": "Invalid period specified. Use 'weekly' or 'monthly'."}), 400
         
     try:
+        # 캐시 작업이 미리 직렬화해 둔 응답이 있으면 그대로 전송합니다.
+        cached = cached_response('news', f'trends:{period}')
+        if cached is not None:
+            return cached
+
         trends_data = get_cached_trends_data(period)
         if trends_data:
             logger.info(f"Serving {period} trends from cache.")
@@ -36,9 +56,37 @@ def get_trends():
                 "top_keywords": [],
                 "source_distribution": [],
                 "category_distribution": [],
-                "country_distribution": [],
-                "sample_news": []
+                "country_distribution": []
             })
     except Exception as e:
         logger.error(f"Error fetching {period} trends data: {e}", exc_info=True)
-        return jsonify({"error": "An internal error occurred while fetching trends data."}), 500 
\ No newline at end of file
+        return jsonify({"error": "An internal error occurred while fetching trends data."}), 500
+
+@trends_bp.route('/api/trends/news')
+def get_trend_news():
+    """
+    트렌드 차트 항목에 해당하는 기사 목록을 페이지 단위로 제공합니다.
+    /api/trends/news?period=weekly&facet=keyword&value=solar&cursor=0&limit=20
+    - facet: 'all', 'keyword', 'source', 'category', 'country' ('all'은 value 불필요)
+    - cursor: 이전 응답의 next_cursor 값 (첫 페이지는 0)
+    """
+    period = request.args.get('period', 'weekly')
+    if period not in TREND_PERIODS:
+        return jsonify({"error": "Invalid period specified. Use 'weekly' or 'monthly'."}), 400
+    facet = request.args.get('facet', 'all')
+    value = request.args.get('value')
+    if facet not in TREND_FACETS or (facet != 'all' and not value):
+        return jsonify({"error": f"Invalid facet specified. Use one of {', '.join(TREND_FACETS)} with a value."}), 400
+    cursor = request.args.get('cursor', 0, type=int)
+    limit = request.args.get('limit', 20, type=int)
+    if cursor < 0 or not 1 <= limit <= 100:
+        return jsonify({"error": "Invalid cursor or limit specified."}), 400
+
+    try:
+        page = get_trend_news_page(period, facet, value, cursor, limit)
+        if page is None:
+            return jsonify({"items": [], "next_cursor": None, "total": 0})
+        return jsonify(page)
+    except Exception as e:
+        logger.error(f"Error fetching {period} trend news for {facet}={value}: {e}", exc_info=True)
+        return jsonify({"error": "An internal error occurred while fetching trend news."}), 500